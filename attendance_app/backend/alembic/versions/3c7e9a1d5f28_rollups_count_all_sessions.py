@@ -0,0 +1,37 @@
+"""attendance_rollups.total_sessions counts every session of the course
+
+Revision ID: 3c7e9a1d5f28
+Revises: 8e4f0b2d6a17
+Create Date: 2026-10-18 23:42:17.290514
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c7e9a1d5f28'
+down_revision: Union[str, None] = '8e4f0b2d6a17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _recount(where: str) -> None:
+    op.execute(f"""
+        UPDATE attendance_rollups r
+        SET total_sessions = (
+            SELECT count(*) FROM attendance_sessions s
+            WHERE s.school_id = r.school_id AND s.course_code = r.course_code {where}
+        )
+    """)
+
+
+def upgrade() -> None:
+    # Same definition as crud.rebuild_attendance_rollups: open, closed and expired sessions
+    _recount("")
+
+
+def downgrade() -> None:
+    _recount("AND s.is_active IS false")
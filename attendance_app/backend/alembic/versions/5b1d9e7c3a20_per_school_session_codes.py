@@ -0,0 +1,44 @@
+"""session codes unique per school, numbered by a per-school counter
+
+Revision ID: 5b1d9e7c3a20
+Revises: d2f6b8a3c1e7
+Create Date: 2026-10-18 21:04:17.532981
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1d9e7c3a20'
+down_revision: Union[str, None] = 'd2f6b8a3c1e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Counters start at 0 for every school: new codes (app/core/session_codes.py)
+    # have a different shape from the existing "S-" codes, so they cannot clash
+    op.add_column(
+        'schools',
+        sa.Column('session_code_seq', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    )
+    # Existing codes are globally unique, hence unique per school as well
+    op.create_index(
+        'uq_attendance_sessions_school_code',
+        'attendance_sessions',
+        ['school_id', 'session_code'],
+        unique=True,
+    )
+    op.drop_index('ix_attendance_sessions_school_code', table_name='attendance_sessions')
+    op.drop_constraint('attendance_sessions_session_code_key', 'attendance_sessions', type_='unique')
+
+
+def downgrade() -> None:
+    # Fails once two schools have issued the same code
+    op.create_unique_constraint('attendance_sessions_session_code_key', 'attendance_sessions', ['session_code'])
+    op.create_index('ix_attendance_sessions_school_code', 'attendance_sessions', ['school_id', 'session_code'])
+    op.drop_index('uq_attendance_sessions_school_code', table_name='attendance_sessions')
+    op.drop_column('schools', 'session_code_seq')
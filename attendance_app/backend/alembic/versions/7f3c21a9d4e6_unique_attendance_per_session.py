@@ -0,0 +1,42 @@
+"""unique attendance per student and session
+
+Revision ID: 7f3c21a9d4e6
+Revises: 2d3b605fdf3b
+Create Date: 2026-10-18 09:12:44.118203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7f3c21a9d4e6'
+down_revision: Union[str, None] = '2d3b605fdf3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Remove duplicates left behind by the old check-then-insert race,
+    # keeping the earliest mark for each (student_id, session_id).
+    op.execute(
+        """
+        DELETE FROM attendance a
+        USING attendance b
+        WHERE a.student_id = b.student_id
+          AND a.session_id = b.session_id
+          AND (a.created_at, a.id) > (b.created_at, b.id)
+        """
+    )
+    op.create_index(
+        'uq_attendance_student_session',
+        'attendance',
+        ['student_id', 'session_id'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_attendance_student_session', table_name='attendance')
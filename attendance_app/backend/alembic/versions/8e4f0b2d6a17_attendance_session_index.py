@@ -0,0 +1,26 @@
+"""attendance by session index for the live stream snapshot
+
+Revision ID: 8e4f0b2d6a17
+Revises: 5b1d9e7c3a20
+Create Date: 2026-10-18 22:31:09.804126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4f0b2d6a17'
+down_revision: Union[str, None] = '5b1d9e7c3a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_attendance_session_created', 'attendance', ['session_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attendance_session_created', table_name='attendance')
@@ -0,0 +1,59 @@
+"""normalized emails, unique on lower(email)
+
+Revision ID: 9a2c4e6f8b13
+Revises: 3c7e9a1d5f28
+Create Date: 2026-10-19 00:26:53.671042
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a2c4e6f8b13'
+down_revision: Union[str, None] = '3c7e9a1d5f28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, index expression); text_pattern_ops as in a4d8e1c6f3b0
+TABLES = (
+    ('admins', 'lower(email)'),
+    ('lecturers', 'lower(email) text_pattern_ops'),
+    ('students', 'lower(email) text_pattern_ops'),
+)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+
+    # Accounts whose emails differ only in case are distinct rows with their own
+    # passwords and attendance; which one to keep is an operator's call, so stop
+    # before changing anything and list them.
+    duplicates = []
+    for table, _ in TABLES:
+        rows = conn.execute(sa.text(f"""
+            SELECT lower(trim(email)), string_agg(email, ', ' ORDER BY created_at)
+            FROM {table}
+            GROUP BY lower(trim(email))
+            HAVING count(*) > 1
+        """)).all()
+        duplicates += [f"{table}: {emails}" for _, emails in rows]
+    if duplicates:
+        raise RuntimeError(
+            "Emails differing only in case or surrounding spaces; merge or rename these accounts, then re-run:\n  "
+            + "\n  ".join(duplicates)
+        )
+
+    for table, expression in TABLES:
+        # Stored as crud writes them from now on (utils.helpers.normalize_email)
+        op.execute(f"UPDATE {table} SET email = lower(trim(email)) WHERE email <> lower(trim(email))")
+        op.drop_index(f'ix_{table}_email_lower', table_name=table)
+        op.create_index(f'ix_{table}_email_lower', table, [sa.text(expression)], unique=True)
+
+
+def downgrade() -> None:
+    for table, expression in reversed(TABLES):
+        op.drop_index(f'ix_{table}_email_lower', table_name=table)
+        op.create_index(f'ix_{table}_email_lower', table, [sa.text(expression)], unique=False)
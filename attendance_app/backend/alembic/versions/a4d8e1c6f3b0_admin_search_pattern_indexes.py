@@ -0,0 +1,34 @@
+"""text_pattern_ops lower(email) / lower(full_name) indexes for the admin search
+
+Revision ID: a4d8e1c6f3b0
+Revises: f1c9a2b7e5d4
+Create Date: 2026-10-18 17:05:41.228310
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4d8e1c6f3b0'
+down_revision: Union[str, None] = 'f1c9a2b7e5d4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # text_pattern_ops serves both the login equality match and the
+    # LIKE 'prefix%' search of crud.get_admin_user_page under any collation
+    for table in ('lecturers', 'students'):
+        op.drop_index(f'ix_{table}_email_lower', table_name=table)
+        op.create_index(f'ix_{table}_email_lower', table, [sa.text('lower(email) text_pattern_ops')], unique=False)
+        op.create_index(f'ix_{table}_name_lower', table, [sa.text('lower(full_name) text_pattern_ops')], unique=False)
+
+
+def downgrade() -> None:
+    for table in ('students', 'lecturers'):
+        op.drop_index(f'ix_{table}_name_lower', table_name=table)
+        op.drop_index(f'ix_{table}_email_lower', table_name=table)
+        op.create_index(f'ix_{table}_email_lower', table, [sa.text('lower(email)')], unique=False)
@@ -0,0 +1,31 @@
+"""lower(email) indexes for login
+
+Revision ID: b5e09d4c7a21
+Revises: 7f3c21a9d4e6
+Create Date: 2026-10-18 11:40:02.513978
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e09d4c7a21'
+down_revision: Union[str, None] = '7f3c21a9d4e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Login matches on lower(email) (crud.get_user_for_login)
+    op.create_index('ix_admins_email_lower', 'admins', [sa.text('lower(email)')], unique=False)
+    op.create_index('ix_lecturers_email_lower', 'lecturers', [sa.text('lower(email)')], unique=False)
+    op.create_index('ix_students_email_lower', 'students', [sa.text('lower(email)')], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_students_email_lower', table_name='students')
+    op.drop_index('ix_lecturers_email_lower', table_name='lecturers')
+    op.drop_index('ix_admins_email_lower', table_name='admins')
@@ -0,0 +1,44 @@
+"""created_at on students/lecturers and keyset pagination indexes
+
+Revision ID: c8a41f2e6b93
+Revises: b5e09d4c7a21
+Create Date: 2026-10-18 13:05:47.220614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8a41f2e6b93'
+down_revision: Union[str, None] = 'b5e09d4c7a21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows get now(); listings are ordered on (created_at, id) so ties are still stable
+    op.add_column('students', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+    op.add_column('lecturers', sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True))
+
+    op.create_index('ix_attendance_lecturer_school_created', 'attendance', ['lecturer_id', 'school_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_attendance_student_school_created', 'attendance', ['student_id', 'school_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_attendance_sessions_lecturer_created', 'attendance_sessions', ['lecturer_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_students_school_created', 'students', ['school_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_students_created', 'students', ['created_at', 'id'], unique=False)
+    op.create_index('ix_lecturers_school_created', 'lecturers', ['school_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_lecturers_created', 'lecturers', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_lecturers_created', table_name='lecturers')
+    op.drop_index('ix_lecturers_school_created', table_name='lecturers')
+    op.drop_index('ix_students_created', table_name='students')
+    op.drop_index('ix_students_school_created', table_name='students')
+    op.drop_index('ix_attendance_sessions_lecturer_created', table_name='attendance_sessions')
+    op.drop_index('ix_attendance_student_school_created', table_name='attendance')
+    op.drop_index('ix_attendance_lecturer_school_created', table_name='attendance')
+    op.drop_column('lecturers', 'created_at')
+    op.drop_column('students', 'created_at')
@@ -0,0 +1,35 @@
+"""profile image thumbnail urls on students and lecturers
+
+Revision ID: d2f6b8a3c1e7
+Revises: a4d8e1c6f3b0
+Create Date: 2026-10-18 18:12:30.447192
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f6b8a3c1e7'
+down_revision: Union[str, None] = 'a4d8e1c6f3b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLES = ('students', 'lecturers')
+THUMBNAIL_COLUMNS = ('profile_thumb_64', 'profile_thumb_256')
+
+
+def upgrade() -> None:
+    # Filled on the next upload; until then the roster falls back to profile_image
+    for table in TABLES:
+        for column in THUMBNAIL_COLUMNS:
+            op.add_column(table, sa.Column(column, sa.String(length=225), nullable=True))
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        for column in reversed(THUMBNAIL_COLUMNS):
+            op.drop_column(table, column)
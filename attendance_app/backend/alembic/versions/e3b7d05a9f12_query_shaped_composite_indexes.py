@@ -0,0 +1,67 @@
+"""composite indexes for the crud query shapes, drop redundant single-column indexes
+
+Revision ID: e3b7d05a9f12
+Revises: c8a41f2e6b93
+Create Date: 2026-10-18 14:22:09.604113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b7d05a9f12'
+down_revision: Union[str, None] = 'c8a41f2e6b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (name, table, columns) for every index this revision creates
+COMPOSITE_INDEXES = [
+    # crud.get_attendance_for_lecturer (date / course_code filters)
+    ('ix_attendance_lecturer_school_date_course', 'attendance', ['lecturer_id', 'school_id', 'date', 'course_code']),
+    # crud.get_attendance_by_student_with_filter
+    ('ix_attendance_student_school_date_course', 'attendance', ['student_id', 'school_id', 'date', 'course_code']),
+    # /admin/export, ordered on (created_at, id)
+    ('ix_attendance_school_created', 'attendance', ['school_id', 'created_at', 'id']),
+    # crud.get_session_by_code
+    ('ix_attendance_sessions_school_code', 'attendance_sessions', ['school_id', 'session_code']),
+]
+
+# Primary keys are already indexed, and each foreign-key index below is the
+# leading column of a composite (the FK cascades still get an index to use).
+REDUNDANT_INDEXES = [
+    ('ix_admins_id', 'admins', ['id']),
+    ('ix_schools_id', 'schools', ['id']),
+    ('ix_lecturers_id', 'lecturers', ['id']),
+    ('ix_students_id', 'students', ['id']),
+    ('ix_courses_id', 'courses', ['id']),
+    ('ix_attendance_sessions_id', 'attendance_sessions', ['id']),
+    ('ix_attendance_id', 'attendance', ['id']),
+    ('ix_lecturers_school_id', 'lecturers', ['school_id']),
+    ('ix_students_school_id', 'students', ['school_id']),
+    ('ix_attendance_sessions_lecturer_id', 'attendance_sessions', ['lecturer_id']),
+    ('ix_attendance_sessions_school_id', 'attendance_sessions', ['school_id']),
+    ('ix_attendance_lecturer_id', 'attendance', ['lecturer_id']),
+    ('ix_attendance_student_id', 'attendance', ['student_id']),
+    ('ix_attendance_school_id', 'attendance', ['school_id']),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in COMPOSITE_INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+    # IF EXISTS: databases built before the initial revision may not have all of them
+    for name, table, columns in REDUNDANT_INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, columns in reversed(REDUNDANT_INDEXES):
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+    for name, table, columns in reversed(COMPOSITE_INDEXES):
+        op.drop_index(name, table_name=table)
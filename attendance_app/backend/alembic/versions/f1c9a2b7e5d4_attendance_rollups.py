@@ -0,0 +1,59 @@
+"""attendance_rollups table
+
+Revision ID: f1c9a2b7e5d4
+Revises: e3b7d05a9f12
+Create Date: 2026-10-18 15:48:31.117502
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c9a2b7e5d4'
+down_revision: Union[str, None] = 'e3b7d05a9f12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('attendance_rollups',
+    sa.Column('school_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('course_code', sa.String(length=225), nullable=False),
+    sa.Column('student_id', postgresql.UUID(as_uuid=True), nullable=False),
+    sa.Column('student_name', sa.String(length=225), nullable=False),
+    sa.Column('course_title', sa.String(length=225), nullable=False),
+    sa.Column('attended', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('total_sessions', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['school_id'], ['schools.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('school_id', 'course_code', 'student_id')
+    )
+    op.create_index('ix_attendance_rollups_student_school', 'attendance_rollups', ['student_id', 'school_id'], unique=False)
+    op.create_index('ix_attendance_sessions_school_course', 'attendance_sessions', ['school_id', 'course_code'], unique=False)
+
+    # Backfill; same definition as crud.rebuild_attendance_rollups
+    op.execute("""
+        INSERT INTO attendance_rollups
+            (school_id, course_code, student_id, student_name, course_title, attended, total_sessions)
+        SELECT a.school_id, a.course_code, a.student_id, max(a.student_name), max(a.course_title),
+               count(*), coalesce(max(c.closed), 0)
+        FROM attendance a
+        LEFT JOIN (
+            SELECT school_id, course_code, count(*) AS closed
+            FROM attendance_sessions
+            WHERE is_active IS false
+            GROUP BY school_id, course_code
+        ) c ON c.school_id = a.school_id AND c.course_code = a.course_code
+        GROUP BY a.school_id, a.course_code, a.student_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_attendance_sessions_school_course', table_name='attendance_sessions')
+    op.drop_index('ix_attendance_rollups_student_school', table_name='attendance_rollups')
+    op.drop_table('attendance_rollups')
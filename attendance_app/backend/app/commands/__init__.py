@@ -0,0 +1 @@
+# Maintenance commands, run from the backend folder with `python -m app.commands.<name>`.
@@ -0,0 +1,38 @@
+"""
+rebuild_rollups.py
+Recomputes the attendance_rollups table from attendance and attendance_sessions.
+
+The rollups are maintained incrementally by crud; run this to repair them after
+manual data fixes or a failed deploy.
+
+Usage (from the backend folder):
+    python -m app.commands.rebuild_rollups
+    python -m app.commands.rebuild_rollups --school-id <uuid>
+"""
+
+import argparse
+import time
+import uuid
+
+from app import crud
+from app.database import SessionLocal
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--school-id", type=uuid.UUID, help="rebuild a single school (default: all)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        rows = crud.rebuild_attendance_rollups(db, args.school_id)
+    finally:
+        db.close()
+
+    scope = f"school {args.school_id}" if args.school_id else "all schools"
+    print(f"Rebuilt {rows} rollup rows for {scope} in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,6 +20,103 @@ class Settings(BaseSettings):
 
     CORS_ORIGINS: str = ""
 
+    # Log file next to the console output, rotated at LOG_FILE_MAX_BYTES keeping
+    # LOG_FILE_BACKUPS old files; empty disables it (app/core/logging_config.py)
+    LOG_FILE: str = "app.log"
+    LOG_FILE_MAX_BYTES: int = 10 * 1024 * 1024
+    LOG_FILE_BACKUPS: int = 5
+
+    # Request threads only enqueue records; a listener thread writes them in batches.
+    # A full queue drops records rather than blocking. False = write synchronously.
+    LOG_QUEUE: bool = True
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_BATCH_SIZE: int = 256
+
+    # "logger=rate,..." share of INFO/DEBUG records kept per logger (and its children),
+    # e.g. "app.routes.attendance.marks=0.1" logs one attendance mark in ten
+    LOG_SAMPLE_RATES: str = ""
+
+    # Mount the /test-attendance debug router (app/routes/debug_attendance.py). Off in
+    # production: it is only imported when enabled, which keeps it off the cold start.
+    ENABLE_DEBUG_ROUTES: bool = False
+
+    # GET /metrics (app/core/metrics.py), /health/details and /health/db-pool require
+    # "Authorization: Bearer <METRICS_TOKEN>"; while it is empty they answer 404
+    METRICS_TOKEN: str = ""
+    # Label request metrics with the school of the authenticated user as well. Every
+    # school multiplies the series of every route, so only for a handful of schools.
+    METRICS_SCHOOL_LABEL: bool = False
+
+    # Key of the session-code permutation (app/core/session_codes.py); SECRET_KEY when
+    # empty. Changing it can repeat codes of past sessions, so pin it before rotating
+    # SECRET_KEY.
+    SESSION_CODE_KEY: str = ""
+
+    # Live attendance streams (app/core/live_feed.py). "local" delivers within one worker;
+    # "postgres" fans out across workers with LISTEN/NOTIFY, on LIVE_FEED_DATABASE_URL
+    # (default DATABASE_URL), which must not go through PgBouncer's transaction pooling.
+    # A stream more than LIVE_FEED_QUEUE_SIZE events behind is closed for the client to
+    # reconnect; an idle stream sends a comment every LIVE_FEED_HEARTBEAT_SECONDS.
+    LIVE_FEED_BACKEND: str = "local"
+    LIVE_FEED_DATABASE_URL: str = ""
+    LIVE_FEED_QUEUE_SIZE: int = 256
+    LIVE_FEED_HEARTBEAT_SECONDS: float = 15
+
+    # Seconds an open session stays in the in-process registry (app/core/session_registry.py)
+    SESSION_REGISTRY_TTL_SECONDS: int = 60
+
+    # Authenticated-principal cache (app/core/principal_cache.py). The TTL bounds how
+    # long other workers keep serving a deactivated or edited account.
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+
+    # bcrypt process pool (app/core/password_pool.py). 0 workers = one per CPU.
+    # Sync routes hold a threadpool thread while they wait, so keep MAX_PENDING
+    # well below Starlette's 40 threads.
+    PASSWORD_POOL_WORKERS: int = 0
+    PASSWORD_POOL_MAX_PENDING: int = 16
+
+    # Serve the hot routes (login, attendance mark/records, /me) through AsyncSession.
+    # ASYNC_DATABASE_URL defaults to DATABASE_URL with the asyncpg driver.
+    DB_ASYNC: bool = False
+    ASYNC_DATABASE_URL: str = ""
+
+    # Connection pool per worker process (app/database.py), so the database sees up to
+    # workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections. DB_POOL_TIMEOUT is how long
+    # a request waits for a free connection before failing; DB_POOL_RECYCLE (seconds,
+    # -1 = never) replaces connections before server or proxy idle timeouts close them.
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+
+    # Behind PgBouncer (transaction pooling): no app-side pool (NullPool) and no
+    # prepared statements; PgBouncer's own pool size then bounds the connections
+    DB_PGBOUNCER: bool = False
+
+    # Rows fetched per round trip by the streaming exports (crud.stream_rows)
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Encode large list responses with orjson straight from column tuples instead of
+    # re-validating every row against the response_model (app/utils/fast_json.py)
+    FAST_LIST_RESPONSES: bool = True
+
+    # Profile-image storage (app/utils/storage.py): "supabase" or "local". The local
+    # backend writes under STORAGE_LOCAL_DIR, served by main.py at /media.
+    STORAGE_BACKEND: str = "supabase"
+    STORAGE_BUCKET: str = "profile-images"
+    STORAGE_LOCAL_DIR: str = str(BASE_DIR / "media")
+    STORAGE_LOCAL_URL: str = "http://127.0.0.1:8000/media"
+    STORAGE_MAX_UPLOAD_BYTES: int = 5 * 1024 * 1024
+    STORAGE_CHUNK_BYTES: int = 64 * 1024
+
+    # Background upload threads (app/core/upload_queue.py); a full queue answers 503
+    STORAGE_UPLOAD_WORKERS: int = 2
+    STORAGE_UPLOAD_MAX_PENDING: int = 64
+
+    # Processes that re-encode and thumbnail uploaded images (app/core/image_pool.py)
+    IMAGE_POOL_WORKERS: int = 1
+
     class Config:
         env_file = BASE_DIR / ".env"
         env_file_encoding = "utf-8"
@@ -0,0 +1,117 @@
+"""
+image_pool.py
+Process pool that re-encodes uploaded profile images.
+
+Every upload is decoded once and written back out as
+- the profile image itself, at most MAX_SIDE px on its longest side, and
+- one square thumbnail per THUMBNAIL_SIZES entry (the roster uses the 64 px one),
+all as progressive JPEG with no EXIF, XMP or ICC metadata (phones put GPS
+positions in there). EXIF orientation is applied before it is dropped.
+
+Decoding a 12 MP phone photo costs a few hundred ms of CPU, so it runs in
+IMAGE_POOL_WORKERS processes. Callers are the upload-queue threads
+(app/core/upload_queue.py), which already bound the number of jobs in flight.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+
+
+MAX_SIDE = 1024
+THUMBNAIL_SIZES = (64, 256)
+JPEG_OPTIONS = {"quality": 85, "optimize": True, "progressive": True}
+
+
+# Runs inside the worker processes. PIL is imported here, so only they load it.
+def _render(source: str, out_dir: str) -> Tuple[str, Dict[int, str]]:
+    from PIL import Image, ImageOps
+
+    # A small file can still decode to a huge bitmap; refuse instead of warning
+    warnings.simplefilter("error", Image.DecompressionBombWarning)
+
+    with Image.open(source) as original:
+        # JPEG only: let the decoder downscale by 1/2, 1/4 or 1/8 while decoding
+        original.draft("RGB", (MAX_SIDE, MAX_SIDE))
+        image = ImageOps.exif_transpose(original)
+
+        if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+            rgba = image.convert("RGBA")
+            image = Image.new("RGB", rgba.size, "white")
+            image.paste(rgba, mask=rgba.getchannel("A"))
+        else:
+            image = image.convert("RGB")
+
+    full = image.copy()
+    full.thumbnail((MAX_SIDE, MAX_SIDE), Image.LANCZOS)
+    full_path = os.path.join(out_dir, "full.jpg")
+    full.save(full_path, "JPEG", **JPEG_OPTIONS)
+
+    thumbnails = {}
+    for size in THUMBNAIL_SIZES:
+        path = os.path.join(out_dir, f"{size}.jpg")
+        ImageOps.fit(image, (size, size), Image.LANCZOS).save(path, "JPEG", **JPEG_OPTIONS)
+        thumbnails[size] = path
+    return full_path, thumbnails
+
+
+class ImagePool:
+    def __init__(self, workers: int):
+        self.workers = workers or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.count = 0
+        self.failed = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created on first use; spawn avoids forking a process that already runs threads
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    def render(self, source: str, out_dir: str) -> Tuple[str, Dict[int, str]]:
+        """Write the re-encoded image and its thumbnails into out_dir; returns (full_path, {size: path})."""
+        started = time.perf_counter()
+        try:
+            return self._get_executor().submit(_render, source, out_dir).result()
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.count += 1
+                self.total += elapsed
+                self.max = max(self.max, elapsed)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "count": self.count,
+                "failed": self.failed,
+                "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+                "max_ms": round(self.max * 1000, 2),
+            }
+
+
+image_pool = ImagePool(workers=settings.IMAGE_POOL_WORKERS)
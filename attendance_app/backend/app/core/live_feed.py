@@ -0,0 +1,334 @@
+"""
+live_feed.py
+Publish/subscribe of attendance-session events for the lecturer's live view
+(GET /lecturers/sessions/{session_id}/stream, Server-Sent Events).
+
+crud.mark_attendance and crud_async.mark_attendance publish a "mark" event once
+their insert has committed, crud.close_attendance_session a "closed" event.
+Subscribers are this worker's open streams: each gets a bounded asyncio.Queue
+on its event loop, and deliveries reach it through call_soon_threadsafe, so
+publishing works the same from threadpool routes and from the loop. A
+subscriber more than LIVE_FEED_QUEUE_SIZE events behind is cut off; its client
+reconnects and starts again from a snapshot.
+
+The backend carries events between workers (LIVE_FEED_BACKEND):
+- "local": events stay in this process. Enough for a single worker.
+- "postgres": NOTIFY on one channel. Every worker LISTENs on a connection of
+  its own and fans out what it hears, its own events included. Needs a direct
+  connection (LIVE_FEED_DATABASE_URL when DATABASE_URL goes through PgBouncer).
+"""
+
+import asyncio
+import logging
+import queue
+import select
+import threading
+import uuid
+from typing import Callable, Dict, List, Optional, Set
+
+import orjson
+
+from app import schemas
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Delivered to a subscriber that fell behind: its stream ends
+LAGGED = object()
+
+Deliver = Callable[[uuid.UUID, str, bytes], None]
+
+
+class Subscription:
+    """One stream's queue of (kind, data) events. Create and read it on the event loop."""
+
+    def __init__(self, session_id: uuid.UUID, max_size: int):
+        self.session_id = session_id
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.lagged = False
+
+    def offer(self, item) -> bool:
+        """Runs on self.loop. False once the subscriber has been cut off."""
+        if self.lagged:
+            return False
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.lagged = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(LAGGED)
+            return False
+        return True
+
+    async def get(self):
+        return await self.queue.get()
+
+
+# ----------------------------
+# Backends
+# ----------------------------
+# attach(deliver) hands a backend the fan-out callback; start() begins receiving
+# from other workers (app lifespan); publish() may be called before start().
+class LocalBackend:
+    name = "local"
+
+    def __init__(self):
+        self._deliver: Optional[Deliver] = None
+
+    def attach(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    def start(self) -> None:
+        pass
+
+    def publish(self, session_id: uuid.UUID, kind: str, data: bytes) -> None:
+        if self._deliver is not None:
+            self._deliver(session_id, kind, data)
+
+    def stats(self) -> dict:
+        return {"queue_depth": 0}
+
+    def shutdown(self) -> None:
+        pass
+
+
+class PostgresBackend:
+    """
+    NOTIFY/LISTEN on CHANNEL. The payload is "<session_id> <kind> <json>", well
+    under PostgreSQL's 8000 byte limit.
+
+    publish() only enqueues: a sender thread sends whatever has queued up with one
+    statement, so neither the event loop nor a marking request waits on it.
+    Events published while the database is unreachable are dropped and counted;
+    listeners reconnect with backoff.
+    """
+
+    name = "postgres"
+    CHANNEL = "attendance_live_feed"
+
+    def __init__(self, url: str, max_pending: int = 10_000):
+        from sqlalchemy.engine import make_url
+
+        # psycopg2 takes the libpq form of the SQLAlchemy URL
+        self.dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self._outbox: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._deliver: Optional[Deliver] = None
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.dropped = 0
+        self.reconnects = 0
+
+    def _connect(self):
+        import psycopg2
+
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def _spawn(self, target, name: str) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def attach(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    def start(self) -> None:
+        with self._lock:
+            self._spawn(self._listen, "live-feed-listen")
+
+    def publish(self, session_id: uuid.UUID, kind: str, data: bytes) -> None:
+        # The sender starts on first use, so scripts that only publish need no start()
+        with self._lock:
+            if not any(t.name == "live-feed-send" for t in self._threads):
+                self._spawn(self._send, "live-feed-send")
+        try:
+            self._outbox.put_nowait(f"{session_id} {kind} {data.decode()}")
+        except queue.Full:
+            self.dropped += 1
+
+    def _send(self) -> None:
+        conn = None
+        while not self._stop.is_set():
+            try:
+                payloads = [self._outbox.get(timeout=1)]
+            except queue.Empty:
+                continue
+            while len(payloads) < 500:
+                try:
+                    payloads.append(self._outbox.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                if conn is None:
+                    conn = self._connect()
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT pg_notify(%s, payload) FROM unnest(%s::text[]) AS payload",
+                        (self.CHANNEL, payloads),
+                    )
+                self.sent += len(payloads)
+            except Exception:
+                logger.exception("Live feed: could not send %d events", len(payloads))
+                self.dropped += len(payloads)
+                conn = self._close(conn)
+                self._stop.wait(1)
+        self._close(conn)
+
+    def _listen(self) -> None:
+        conn, backoff = None, 1
+        while not self._stop.is_set():
+            try:
+                if conn is None:
+                    conn = self._connect()
+                    with conn.cursor() as cursor:
+                        cursor.execute(f"LISTEN {self.CHANNEL}")
+                    backoff = 1
+                if select.select([conn], [], [], 1)[0]:
+                    conn.poll()
+                    while conn.notifies:
+                        self._dispatch(conn.notifies.pop(0).payload)
+            except Exception:
+                logger.exception("Live feed: listener connection lost, reconnecting in %ds", backoff)
+                self.reconnects += 1
+                conn = self._close(conn)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+        self._close(conn)
+
+    def _dispatch(self, payload: str) -> None:
+        try:
+            session_id, kind, data = payload.split(" ", 2)
+            self._deliver(uuid.UUID(session_id), kind, data.encode())
+        except Exception:
+            logger.exception("Live feed: bad notification %.80r", payload)
+
+    @staticmethod
+    def _close(conn):
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self._outbox.qsize(),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "reconnects": self.reconnects,
+        }
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads.clear()
+        self._stop.clear()
+
+
+def make_backend(name: str):
+    if name == "local":
+        return LocalBackend()
+    if name == "postgres":
+        return PostgresBackend(settings.LIVE_FEED_DATABASE_URL or settings.DATABASE_URL)
+    raise ValueError(f"Unknown LIVE_FEED_BACKEND {name!r}")
+
+
+# ----------------------------
+# Fan-out
+# ----------------------------
+class LiveFeed:
+    def __init__(self, backend, queue_size: int):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._subscribers: Dict[uuid.UUID, Set[Subscription]] = {}
+        self._lock = threading.Lock()
+        self._started = False
+        self.backend.attach(self._deliver)
+        self.published = 0
+        self.delivered = 0
+        self.lagged = 0
+
+    def start(self) -> None:
+        """Start receiving from the backend (app lifespan). Local delivery needs no start."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+        self.backend.start()
+
+    def use_backend(self, backend) -> None:
+        self.shutdown()
+        self.backend = backend
+        backend.attach(self._deliver)
+
+    def publish(self, session_id: uuid.UUID, kind: str, payload: dict) -> None:
+        self.published += 1
+        self.backend.publish(session_id, kind, orjson.dumps(payload))
+
+    def publish_mark(self, row) -> None:
+        """A committed attendance row, as AttendanceOut."""
+        self.publish(row["session_id"], "mark", {name: row[name] for name in schemas.AttendanceOut.model_fields})
+
+    def subscribe(self, session_id: uuid.UUID) -> Subscription:
+        subscription = Subscription(session_id, self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(session_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.session_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.session_id]
+
+    def _deliver(self, session_id: uuid.UUID, kind: str, data: bytes) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(session_id, ()))
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(self._offer, subscription, (kind, data))
+            except RuntimeError:
+                # Its loop has closed; the stream is gone
+                self.unsubscribe(subscription)
+
+    def _offer(self, subscription: Subscription, item) -> None:
+        if subscription.offer(item):
+            self.delivered += 1
+        elif subscription.lagged:
+            self.lagged += 1
+            self.unsubscribe(subscription)
+
+    def stats(self) -> dict:
+        with self._lock:
+            streams = sum(len(s) for s in self._subscribers.values())
+            sessions = len(self._subscribers)
+        return {
+            "backend": self.backend.name,
+            "streams": streams,
+            "sessions": sessions,
+            "published": self.published,
+            "delivered": self.delivered,
+            "lagged": self.lagged,
+            **self.backend.stats(),
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._subscribers.clear()
+
+    def shutdown(self) -> None:
+        self.backend.shutdown()
+        with self._lock:
+            self._started = False
+
+
+live_feed = LiveFeed(make_backend(settings.LIVE_FEED_BACKEND), settings.LIVE_FEED_QUEUE_SIZE)
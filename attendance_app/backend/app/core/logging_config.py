@@ -1,15 +1,201 @@
+"""
+logging_config.py
+JSON logging to stdout and a rotating LOG_FILE.
+
+With LOG_QUEUE (the default) the handlers on the root logger only enqueue:
+ContextFilter stamps user_id / school_id / role from the request's context
+variables and the record is put on a bounded queue, all on the calling thread.
+A listener thread formats the records as JSON and writes them in batches of up
+to LOG_BATCH_SIZE, one write and one flush per sink per batch. When the queue
+is full, records are dropped and counted instead of blocking a request.
+
+LOG_SAMPLE_RATES keeps a fraction of the INFO/DEBUG records of noisy loggers
+(and their children), e.g. "app.routes.attendance.marks=0.1". Warnings and
+errors are never sampled.
+
+LOG_QUEUE=false writes synchronously from the calling thread, as before.
+"""
+
+import atexit
 import logging
+import queue
+import random
 import sys
+import threading
+from logging.handlers import QueueHandler, RotatingFileHandler
+from typing import Dict, List, Optional
+
 from pythonjsonlogger import jsonlogger
+from app.config import settings
 from app.core.logging_filter import ContextFilter
 
 
+def parse_sample_rates(value: str) -> Dict[str, float]:
+    """"name=rate,name=rate" -> {name: rate}"""
+    rates = {}
+    for item in value.split(","):
+        if item.strip():
+            name, rate = item.split("=")
+            rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a random fraction of the sub-WARNING records of the configured loggers."""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self.dropped = 0
+
+    def _rate(self, name: str) -> Optional[float]:
+        # The logger itself or its nearest configured parent
+        while name:
+            if name in self.rates:
+                return self.rates[name]
+            name = name.rpartition(".")[0]
+        return None
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        if rate is None or random.random() < rate:
+            return True
+        self.dropped += 1
+        return False
+
+
+class ContextQueueHandler(QueueHandler):
+    """
+    Enqueues a copy of the record with its message and traceback rendered to
+    text (the arguments and traceback objects may not outlive the call), but
+    leaves the JSON formatting to the listener.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._exc_formatter = logging.Formatter()
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingListener:
+    """Drains the log queue on a daemon thread and writes every batch with one write per handler."""
+
+    _STOP = object()
+
+    def __init__(self, log_queue: queue.Queue, formatter: logging.Formatter, handlers: List[logging.Handler], batch_size: int):
+        self.queue = log_queue
+        self.formatter = formatter
+        self.handlers = handlers
+        self.batch_size = max(batch_size, 1)
+        self.written = 0
+        self.batches = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="log-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Write out what is queued, then end the thread."""
+        if self._thread is None:
+            return
+        self.queue.put(self._STOP)
+        self._thread.join()
+        self._thread = None
+
+        # Records enqueued after the stop marker
+        leftovers = []
+        while True:
+            try:
+                leftovers.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        if leftovers:
+            self._write(leftovers)
+
+    def _run(self) -> None:
+        while True:
+            # Block for the first record, then take whatever else is already waiting
+            batch = [self.queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is self._STOP
+            records = [r for r in batch if r is not self._STOP]
+            if records:
+                self._write(records)
+            if stop:
+                return
+
+    def _write(self, records: List[logging.LogRecord]) -> None:
+        try:
+            text = "".join(self.formatter.format(r) + "\n" for r in records)
+        except Exception:
+            # One bad record must not take the batch (or the thread) with it
+            text = "".join(self._format_safely(r) for r in records)
+
+        for handler in self.handlers:
+            handler.acquire()
+            try:
+                if isinstance(handler, RotatingFileHandler):
+                    # Checked once per batch, so a file may overshoot maxBytes by one batch
+                    if handler.stream is None:
+                        handler.stream = handler._open()
+                    if handler.shouldRollover(records[0]):
+                        handler.doRollover()
+                handler.stream.write(text)
+                handler.flush()
+            except Exception:
+                handler.handleError(records[0])
+            finally:
+                handler.release()
+
+        self.written += len(records)
+        self.batches += 1
+
+    def _format_safely(self, record) -> str:
+        try:
+            return self.formatter.format(record) + "\n"
+        except Exception:
+            return ""
+
+
+_listener: Optional[BatchingListener] = None
+_queue_handler: Optional[ContextQueueHandler] = None
+_sampling: Optional[SamplingFilter] = None
+
+
 def setup_logging():
+    global _listener, _queue_handler, _sampling
+
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
 
     # 🔥 REMOVE existing handlers (VERY IMPORTANT)
     logger.handlers.clear()
+    if _listener is not None:
+        _listener.stop()
+        _listener = _queue_handler = None
 
 
     formatter = jsonlogger.JsonFormatter(
@@ -20,15 +206,74 @@ def setup_logging():
     # 1. Console Handler (Terminal)
     # -----------------------------
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    console_handler.addFilter(ContextFilter())
+
+    handlers = [console_handler]
 
     # -----------------------------
-    # 2. File Handler (Persistent)
+    # 2. File Handler (Persistent, rotated)
     # -----------------------------
-    file_handler = logging.FileHandler("app.log")
-    file_handler.setFormatter(formatter)
-    file_handler.addFilter(ContextFilter())
+    # delay=True: the file is opened by the first record, not at startup
+    if settings.LOG_FILE:
+        handlers.append(RotatingFileHandler(
+            settings.LOG_FILE,
+            maxBytes=settings.LOG_FILE_MAX_BYTES,
+            backupCount=settings.LOG_FILE_BACKUPS,
+            delay=True
+        ))
+
+    _sampling = SamplingFilter(parse_sample_rates(settings.LOG_SAMPLE_RATES))
+
+    if not settings.LOG_QUEUE:
+        for handler in handlers:
+            handler.setFormatter(formatter)
+            handler.addFilter(_sampling)
+            handler.addFilter(ContextFilter())
+            logger.addHandler(handler)
+        return
+
+    # -----------------------------
+    # 3. Queue: enqueue on the caller, write on the listener
+    # -----------------------------
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    _queue_handler = ContextQueueHandler(log_queue)
+    # Sample first so dropped records skip the context lookup too
+    _queue_handler.addFilter(_sampling)
+    _queue_handler.addFilter(ContextFilter())
+    logger.addHandler(_queue_handler)
+
+    _listener = BatchingListener(log_queue, formatter, handlers, settings.LOG_BATCH_SIZE)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records and switch the root logger to writing directly, so
+    records logged during the rest of the shutdown are not lost (interpreter exit).
+    """
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+
+    root = logging.getLogger()
+    root.removeHandler(_queue_handler)
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.setFormatter(_listener.formatter)
+        handler.addFilter(_sampling)
+        handler.addFilter(ContextFilter())
+        root.addHandler(handler)
+    _listener = _queue_handler = None
+
+
+atexit.register(shutdown_logging)
+
 
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
\ No newline at end of file
+def logging_stats() -> dict:
+    return {
+        "queued": _listener is not None,
+        "queue_depth": _queue_handler.queue.qsize() if _queue_handler else 0,
+        "written": _listener.written if _listener else 0,
+        "batches": _listener.batches if _listener else 0,
+        "dropped_queue_full": _queue_handler.dropped if _queue_handler else 0,
+        "sampled_out": _sampling.dropped if _sampling else 0,
+    }
@@ -0,0 +1,211 @@
+"""
+metrics.py
+Per-route request metrics in Prometheus text format (GET /metrics).
+
+MetricsMiddleware times every HTTP request, including the streaming of its body,
+and records it under the route template (/attendance/sessions/{session_id}, not
+the concrete path), the method and the status. With METRICS_SCHOOL_LABEL the
+school of the authenticated user is a label too (request_context.school_id_ctx,
+empty when anonymous); it is off by default, since every school multiplies the
+series count of every route:
+
+- http_requests_total                       counter
+- http_request_duration_seconds             histogram
+- http_request_db_seconds                   histogram of database time per request
+- http_request_db_queries                   histogram of queries per request
+
+Database time comes from before/after_cursor_execute listeners on every
+SQLAlchemy Engine (sync and async), accumulated into the request's RequestTimer
+through a context variable. Threadpool calls run in a copy of that context,
+so sync routes and dependencies are counted as well.
+
+Values are per worker process: run one scrape target per worker, or aggregate
+with sum() over the instances.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.core.request_context import school_id_ctx
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Requests that matched no route share one label, so scanners cannot blow up the series count
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class RequestTimer:
+    """Database time and query count of one request."""
+    __slots__ = ("db_seconds", "db_queries")
+
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.db_queries = 0
+
+
+_current_request: ContextVar[Optional[RequestTimer]] = ContextVar("metrics_request", default=None)
+
+
+class Metrics:
+    def __init__(self, school_label: bool = False):
+        self.school_label = school_label
+        self.REQUEST_LABELS = ("method", "route", "school") if school_label else ("method", "route")
+        self._lock = threading.Lock()
+        self._requests: Dict[Tuple, int] = {}
+        self._latency: Dict[Tuple, Histogram] = {}
+        self._db_seconds: Dict[Tuple, Histogram] = {}
+        self._db_queries: Dict[Tuple, Histogram] = {}
+        self._gauges: List[Tuple[str, str, Callable[[], Dict[Tuple, float]], Tuple[str, ...]]] = []
+
+    def observe_request(self, method: str, route: str, status: int, school: str, seconds: float, timer: RequestTimer) -> None:
+        key = (method, route, school) if self.school_label else (method, route)
+        with self._lock:
+            count_key = key + (str(status),)
+            self._requests[count_key] = self._requests.get(count_key, 0) + 1
+            for series, buckets, value in (
+                (self._latency, LATENCY_BUCKETS, seconds),
+                (self._db_seconds, LATENCY_BUCKETS, timer.db_seconds),
+                (self._db_queries, QUERY_BUCKETS, timer.db_queries),
+            ):
+                histogram = series.get(key)
+                if histogram is None:
+                    histogram = series[key] = Histogram(buckets)
+                histogram.observe(value)
+
+    def register_gauge(self, name: str, help_text: str, collect: Callable[[], Dict[Tuple, float]], labels: Tuple[str, ...] = ()) -> None:
+        """collect() returns {label_values: value}, read at every scrape."""
+        self._gauges.append((name, help_text, collect, labels))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            lines += [
+                "# HELP http_requests_total HTTP requests by route template, method and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for key, count in sorted(self._requests.items()):
+                lines.append(f"http_requests_total{_labels(self.REQUEST_LABELS + ('status',), key)} {count}")
+
+            for name, help_text, series in (
+                ("http_request_duration_seconds", "Time from request start to the end of the response body.", self._latency),
+                ("http_request_db_seconds", "Time spent in database calls per request.", self._db_seconds),
+                ("http_request_db_queries", "Database statements executed per request.", self._db_queries),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.counts):
+                        cumulative += count
+                        le = 'le="+Inf"' if bound == float("inf") else f'le="{_number(bound)}"'
+                        lines.append(f"{name}_bucket{_labels(self.REQUEST_LABELS, key, le)} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(self.REQUEST_LABELS, key)} {_number(histogram.sum)}")
+                    lines.append(f"{name}_count{_labels(self.REQUEST_LABELS, key)} {histogram.count}")
+
+        for name, help_text, collect, labels in self._gauges:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for key, value in sorted(collect().items()):
+                lines.append(f"{name}{_labels(labels, key)} {_number(value)}")
+
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics(settings.METRICS_SCHOOL_LABEL)
+
+
+# ----------------------------
+# Database time (all engines)
+# ----------------------------
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("metrics_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    timer = _current_request.get()
+    if timer is not None:
+        timer.db_seconds += elapsed
+        timer.db_queries += 1
+
+
+# ----------------------------
+# Middleware
+# ----------------------------
+class MetricsMiddleware:
+    """Plain ASGI middleware, so streamed bodies are timed to their last chunk."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer()
+        token = _current_request.set(timer)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            route = scope.get("route")
+            school = school_id_ctx.get()
+            metrics.observe_request(
+                scope["method"],
+                getattr(route, "path", None) or UNMATCHED_ROUTE,
+                status,
+                str(school) if school else "",
+                elapsed,
+                timer,
+            )
+            _current_request.reset(token)
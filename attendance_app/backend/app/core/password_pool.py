@@ -0,0 +1,178 @@
+"""
+password_pool.py
+Dedicated process pool for bcrypt hashing and verification.
+
+bcrypt is deliberately slow (~100-250 ms of CPU per call). Run inline it holds a
+Starlette threadpool thread, and the GIL, for the whole call, so a login or
+registration storm at the start of term starves cheap endpoints such as
+/attendance/mark. The pool moves that work to PASSWORD_POOL_WORKERS processes
+and caps the number of calls waiting for one at PASSWORD_POOL_MAX_PENDING.
+Beyond that callers get a 503 straight away instead of queueing.
+
+A worker that dies (OOM killer, segfault) breaks the whole executor: every call
+after it would fail with BrokenProcessPool. The first call to see that replaces
+the executor, and each affected call is retried once on the new one; hashing
+and verification have no side effects, so a retry is safe.
+"""
+
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.config import settings
+
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# Run inside the worker processes
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class _Timing:
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+            "max_ms": round(self.max * 1000, 2),
+        }
+
+
+class PasswordPool:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+        self.restarts = 0
+        self._timings = {"hash": _Timing(), "verify": _Timing()}
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created on first use; spawn avoids forking a process that already runs threads
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    def _replace(self, broken: ProcessPoolExecutor) -> None:
+        """Drop a broken executor; the next submit creates a new one."""
+        with self._lock:
+            if self._executor is not broken:
+                # Another call has replaced it already
+                return
+            self._executor = None
+            self.restarts += 1
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _submit(self, kind: str, fn, *args) -> Tuple[ProcessPoolExecutor, Future]:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Server is busy, please try again shortly",
+                    headers={"Retry-After": "1"},
+                )
+            self.pending += 1
+            executor = self._get_executor()
+
+        started = time.perf_counter()
+
+        def done(_):
+            with self._lock:
+                self.pending -= 1
+                self._timings[kind].add(time.perf_counter() - started)
+
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool as exc:
+            # Broke before this call: report it on the future, like a call it was running
+            done(None)
+            future = Future()
+            future.set_exception(exc)
+            return executor, future
+        except Exception:
+            done(None)
+            raise
+        future.add_done_callback(done)
+        return executor, future
+
+    def _call(self, kind: str, fn, *args):
+        for attempt in range(2):
+            executor, future = self._submit(kind, fn, *args)
+            try:
+                return future.result()
+            except BrokenProcessPool:
+                self._replace(executor)
+                if attempt:
+                    raise
+
+    async def _call_async(self, kind: str, fn, *args):
+        for attempt in range(2):
+            executor, future = self._submit(kind, fn, *args)
+            try:
+                return await asyncio.wrap_future(future)
+            except BrokenProcessPool:
+                self._replace(executor)
+                if attempt:
+                    raise
+
+    def hash(self, password: str) -> str:
+        return self._call("hash", _hash, password)
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._call("verify", _verify, plain_password, hashed_password)
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._call_async("verify", _verify, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "queue_depth": self.pending,
+                "max_pending": self.max_pending,
+                "rejected": self.rejected,
+                "restarts": self.restarts,
+                "hash": self._timings["hash"].as_dict(),
+                "verify": self._timings["verify"].as_dict(),
+            }
+
+
+password_pool = PasswordPool(
+    workers=settings.PASSWORD_POOL_WORKERS,
+    max_pending=settings.PASSWORD_POOL_MAX_PENDING
+)
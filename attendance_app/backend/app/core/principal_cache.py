@@ -0,0 +1,110 @@
+"""
+principal_cache.py
+Bounded LRU + TTL cache of authenticated principals for security.get_current_user.
+
+Every protected route resolves the JWT to a Student/Lecturer/Admin row before
+doing any work. The cache keeps a read-only snapshot of that row keyed by
+(role, user_id) so cheap endpoints like /students/me skip the lookup.
+
+Writes that change what a principal may do or see (deactivate/reactivate,
+profile and password changes) evict the entry on the worker that handled them,
+so they apply to its next request. Other workers pick the change up once their
+entry expires after PRINCIPAL_CACHE_TTL_SECONDS. Only active accounts are cached.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Snapshot of the authenticated user's row, without the password hash."""
+    role: str
+    id: uuid.UUID
+    email: str
+    full_name: str
+    is_active: bool
+    school_id: Optional[uuid.UUID] = None
+    course: Optional[str] = None
+    registration_number: Optional[str] = None
+    department: Optional[str] = None
+    profile_image: Optional[str] = None
+
+    @classmethod
+    def from_model(cls, role: str, user) -> "Principal":
+        return cls(
+            role=role,
+            id=user.id,
+            email=user.email,
+            full_name=user.full_name,
+            is_active=bool(user.is_active),
+            school_id=getattr(user, "school_id", None),
+            course=getattr(user, "course", None),
+            registration_number=getattr(user, "registration_number", None),
+            department=getattr(user, "department", None),
+            profile_image=getattr(user, "profile_image", None),
+        )
+
+
+class PrincipalCache:
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Principal, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, role: str, user_id) -> Optional[Principal]:
+        key = (role, str(user_id))
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                principal, expires_at = item
+                if expires_at >= time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return principal
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, principal: Principal) -> None:
+        if not principal.is_active or self.max_entries <= 0:
+            return
+        key = (principal.role, str(principal.id))
+        with self._lock:
+            self._entries[key] = (principal, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def evict(self, role: str, user_id) -> None:
+        with self._lock:
+            self._entries.pop((role, str(user_id)), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+principals = PrincipalCache(
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES
+)
@@ -0,0 +1,84 @@
+"""
+session_codes.py
+Short attendance-session codes that are unique per school by construction.
+
+A school's n-th session gets code(school, n): n goes through a 30-bit Feistel
+permutation keyed by the school, and the result is written as six Crockford
+base32 symbols (no I, L, O or U) split 3-3, e.g. "7KQ-M2D". A permutation never
+maps two counters to the same value, so a school's codes cannot repeat before
+its 2**30th session and nothing is checked against the database. The key keeps
+the next code from being guessable from the last one.
+
+n is schools.session_code_seq, bumped in the session's own transaction by
+crud.create_attendance_session, so rolled-back sessions only skip a number.
+
+The key derives from settings.SESSION_CODE_KEY (SECRET_KEY when empty). A new
+key puts every school on another permutation, which can repeat codes of past
+sessions: set SESSION_CODE_KEY explicitly before rotating SECRET_KEY.
+
+Codes from before this scheme ("S-" and six hex digits) have a different shape,
+so they cannot clash with these.
+"""
+
+import hashlib
+import hmac
+import uuid
+
+from app.config import settings
+
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+SYMBOLS = 6
+BITS = 5 * SYMBOLS
+CAPACITY = 1 << BITS
+
+_HALF = BITS // 2
+_MASK = (1 << _HALF) - 1
+_ROUNDS = 4
+
+# Read the way Crockford base32 decodes them, so a typed O, I or L still matches
+_TYPOS = str.maketrans({"O": "0", "I": "1", "L": "1"})
+
+
+def _school_key(school_id: uuid.UUID) -> bytes:
+    secret = (settings.SESSION_CODE_KEY or settings.SECRET_KEY).encode()
+    return hmac.new(secret, b"session-code:" + school_id.bytes, hashlib.sha256).digest()
+
+
+def _round(key: bytes, index: int, half: int) -> int:
+    digest = hashlib.blake2s(bytes((index,)) + half.to_bytes(2, "big"), key=key, digest_size=4).digest()
+    return int.from_bytes(digest, "big") & _MASK
+
+
+def permute(key: bytes, n: int) -> int:
+    """A bijection of [0, CAPACITY): balanced Feistel rounds over two 15-bit halves."""
+    left, right = n >> _HALF, n & _MASK
+    for index in range(_ROUNDS):
+        left, right = right, left ^ _round(key, index, right)
+    return (left << _HALF) | right
+
+
+def encode(value: int) -> str:
+    symbols = []
+    for _ in range(SYMBOLS):
+        value, digit = divmod(value, len(ALPHABET))
+        symbols.append(ALPHABET[digit])
+    text = "".join(reversed(symbols))
+    return f"{text[:3]}-{text[3:]}"
+
+
+def session_code(school_id: uuid.UUID, n: int) -> str:
+    """The code of the school's n-th session."""
+    if not 0 <= n < CAPACITY:
+        raise ValueError(f"session counter {n} is outside the code space")
+    return encode(permute(_school_key(school_id), n))
+
+
+def normalize(code: str) -> str:
+    """A typed code in its stored form: upper case, no spaces, O/I/L as 0/1, hyphen restored."""
+    code = "".join(code.split()).upper()
+    if code.startswith("S-"):
+        return code  # issued before this scheme
+    code = code.translate(_TYPOS)
+    if len(code) == SYMBOLS:
+        code = f"{code[:3]}-{code[3:]}"
+    return code
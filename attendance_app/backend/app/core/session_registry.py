@@ -0,0 +1,137 @@
+"""
+session_registry.py
+In-process registry of open attendance sessions.
+
+Students verify a session code and then mark attendance against the session id,
+usually hundreds of them within a minute of the code going up. Only a few dozen
+sessions are open per school at any time, so they are kept in memory keyed by
+(school_id, session_code) and by id, and those two routes can tell whether a
+session is open without reading the database.
+
+Entries are added when a lecturer creates a session (crud.create_attendance_session)
+or on a database read that finds an open session, and dropped when the session is
+closed, when its date is in the past, or after SESSION_REGISTRY_TTL_SECONDS. The TTL
+bounds how long a worker that did not handle the close keeps treating a session as open.
+"""
+
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Optional, Tuple
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class ActiveSession:
+    """Snapshot of the AttendanceSession columns the student routes need."""
+    id: uuid.UUID
+    lecturer_id: uuid.UUID
+    lecturer_name: str
+    course_code: str
+    course_title: str
+    date: date
+    session_code: str
+    school_id: uuid.UUID
+    is_active: bool = True
+
+    @classmethod
+    def from_model(cls, session) -> "ActiveSession":
+        return cls(
+            id=session.id,
+            lecturer_id=session.lecturer_id,
+            lecturer_name=session.lecturer_name,
+            course_code=session.course_code,
+            course_title=session.course_title,
+            date=session.date,
+            session_code=session.session_code,
+            school_id=session.school_id,
+        )
+
+
+class ActiveSessionRegistry:
+    def __init__(self, ttl_seconds: float, max_entries: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._by_id: Dict[uuid.UUID, Tuple[ActiveSession, float]] = {}
+        self._by_code: Dict[Tuple[uuid.UUID, str], uuid.UUID] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def add(self, session) -> Optional[ActiveSession]:
+        """Register an open session (ORM row or ActiveSession). Closed or past sessions are ignored."""
+        if not session.is_active or session.date < date.today():
+            return None
+
+        entry = session if isinstance(session, ActiveSession) else ActiveSession.from_model(session)
+        expires_at = time.monotonic() + self.ttl_seconds
+
+        with self._lock:
+            if entry.id not in self._by_id and len(self._by_id) >= self.max_entries:
+                self._evict_expired()
+                if len(self._by_id) >= self.max_entries:
+                    # dicts keep insertion order, so this is the oldest entry
+                    self._remove(next(iter(self._by_id)))
+            self._by_id[entry.id] = (entry, expires_at)
+            self._by_code[(entry.school_id, entry.session_code)] = entry.id
+        return entry
+
+    def get_by_id(self, session_id: uuid.UUID, school_id: uuid.UUID) -> Optional[ActiveSession]:
+        with self._lock:
+            return self._lookup(session_id, school_id)
+
+    def get_by_code(self, session_code: str, school_id: uuid.UUID) -> Optional[ActiveSession]:
+        with self._lock:
+            return self._lookup(self._by_code.get((school_id, session_code)), school_id)
+
+    def invalidate(self, session_id: uuid.UUID) -> None:
+        with self._lock:
+            self._remove(session_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_id.clear()
+            self._by_code.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._by_id),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+    # Callers must hold self._lock
+    def _lookup(self, session_id: Optional[uuid.UUID], school_id: uuid.UUID) -> Optional[ActiveSession]:
+        item = self._by_id.get(session_id) if session_id is not None else None
+        if item is not None:
+            entry, expires_at = item
+            if expires_at < time.monotonic() or entry.date < date.today():
+                # TTL ran out or the date rolled over
+                self._remove(entry.id)
+            elif entry.school_id == school_id:
+                self.hits += 1
+                return entry
+        self.misses += 1
+        return None
+
+    def _remove(self, session_id: uuid.UUID) -> None:
+        item = self._by_id.pop(session_id, None)
+        if item is not None:
+            entry = item[0]
+            self._by_code.pop((entry.school_id, entry.session_code), None)
+
+    def _evict_expired(self) -> None:
+        now = time.monotonic()
+        today = date.today()
+        for session_id, (entry, expires_at) in list(self._by_id.items()):
+            if expires_at < now or entry.date < today:
+                self._remove(session_id)
+
+
+active_sessions = ActiveSessionRegistry(ttl_seconds=settings.SESSION_REGISTRY_TTL_SECONDS)
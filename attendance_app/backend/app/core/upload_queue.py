@@ -0,0 +1,120 @@
+"""
+upload_queue.py
+Background worker threads for storage uploads.
+
+A profile-image upload to Supabase can take seconds. Done inline it holds a
+Starlette threadpool thread for the whole call, so the routes stage the file
+on local disk, submit the upload here and return straight away. Up to
+STORAGE_UPLOAD_MAX_PENDING jobs wait for one of STORAGE_UPLOAD_WORKERS threads;
+beyond that callers get a 503 instead of queueing.
+
+Jobs are plain callables. A failed job is logged and counted, never retried:
+the staged file is gone by then and the user can upload again.
+"""
+
+import logging
+import queue
+import threading
+import time
+from typing import List
+
+from fastapi import HTTPException
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class UploadQueue:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = max(workers, 1)
+        self.max_pending = max_pending
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._busy_seconds = 0.0
+
+    def _start(self) -> None:
+        # Threads start on first use, not at import (cold start)
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"upload-queue-{i}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self) -> None:
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                fn, args = job
+                started = time.perf_counter()
+                try:
+                    fn(*args)
+                except Exception:
+                    logger.exception("Background upload %s failed", getattr(fn, "__name__", fn))
+                    ok = False
+                else:
+                    ok = True
+                with self._lock:
+                    self._busy_seconds += time.perf_counter() - started
+                    if ok:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+            finally:
+                self._queue.task_done()
+
+    def submit(self, fn, *args) -> None:
+        self._start()
+        try:
+            self._queue.put_nowait((fn, args))
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Server is busy, please try again shortly",
+                headers={"Retry-After": "1"},
+            )
+
+    def join(self) -> None:
+        """Block until every submitted job has finished."""
+        self._queue.join()
+
+    def shutdown(self, timeout: float = 10.0) -> None:
+        """Let queued jobs finish, then stop the threads (main.lifespan)."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(_STOP)
+        deadline = time.monotonic() + timeout
+        for thread in threads:
+            thread.join(max(deadline - time.monotonic(), 0))
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self.completed + self.failed
+            return {
+                "workers": self.workers,
+                "queue_depth": self._queue.qsize(),
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_ms": round(self._busy_seconds / done * 1000, 2) if done else 0.0,
+            }
+
+
+upload_queue = UploadQueue(
+    workers=settings.STORAGE_UPLOAD_WORKERS,
+    max_pending=settings.STORAGE_UPLOAD_MAX_PENDING
+)
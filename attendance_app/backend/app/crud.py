@@ -4,28 +4,114 @@ CRUD operations for Smart Attendance System.
 """
 
 from sqlalchemy.orm import Session
+from sqlalchemy import select, update, delete, literal, func, tuple_, or_, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app import models, schemas
-from passlib.context import CryptContext
 from datetime import datetime, timedelta, date
 from jose import jwt, JWTError
 from app.config import settings
+from app.core.session_registry import active_sessions, ActiveSession
+from app.core import session_codes
+from app.core.live_feed import live_feed
+from app.core.principal_cache import principals
+from app.core.password_pool import password_pool
+from app.utils.helpers import normalize_email, encode_cursor, decode_cursor, like_prefix
 from typing import Optional, Dict
 import uuid
 from fastapi import HTTPException
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # ----------------------------
 # Password helpers
 # ----------------------------
+# bcrypt runs in the password process pool; both raise a 503 HTTPException when its queue is full.
 def get_password_hash(password: str) -> str:
     if len(password.encode("utf-8")) > 72:
         raise ValueError("Password too long (max 72 characters).")
-    return pwd_context.hash(password)
+    return password_pool.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_pool.verify(plain_password, hashed_password)
+
+
+# ----------------------------
+# Keyset pagination
+# ----------------------------
+# List endpoints page newest-first on (created_at, id). Each page is one indexed
+# range scan of limit + 1 rows, however much history sits behind it.
+def keyset_statement(stmt, model, cursor: Optional[str], limit: int):
+    """Restrict stmt to the page after cursor, fetching one extra row to detect a next page."""
+    if cursor:
+        try:
+            created_at, row_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        stmt = stmt.where(tuple_(model.created_at, model.id) < tuple_(created_at, row_id))
+    return stmt.order_by(model.created_at.desc(), model.id.desc()).limit(limit + 1)
+
+
+def schema_columns(model, schema) -> tuple:
+    """The model column behind every field of schema, in field order, plus created_at for the cursor."""
+    return tuple(getattr(model, name) for name in schema.model_fields) + (model.created_at,)
+
+
+def keyset_page(rows, limit: int):
+    """Split the rows of a keyset_statement into (items, next_cursor)."""
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(last.created_at, last.id)
+
+
+# ----------------------------
+# Principal helpers (security.get_current_user)
+# ----------------------------
+USER_MODELS = {
+    "student": models.Student,
+    "lecturer": models.Lecturer,
+    "admin": models.Admin,
+}
+
+
+def get_user_by_id(db: Session, role: str, user_id: uuid.UUID):
+    """Primary-key lookup of the account behind a token."""
+    return db.get(USER_MODELS[role], user_id)
+
+
+# Emails are stored normalized (utils.helpers.normalize_email) and unique on
+# lower(email): every lookup and existence check below compares lower(email) with
+# the normalized input, served by the ix_<table>_email_lower indexes.
+def get_user_for_login(db: Session, role: str, email: str):
+    """Single lookup on lower(email)."""
+    model = USER_MODELS[role]
+    return db.query(model).filter(func.lower(model.email) == normalize_email(email)).first()
+
+
+def set_account_active(db: Session, role: str, user_id: uuid.UUID, is_active: bool):
+    """Deactivate or reactivate an account and drop its cached principal."""
+    user = get_user_by_id(db, role, user_id)
+    if not user:
+        return None
+
+    user.is_active = is_active
+    db.commit()
+    principals.evict(role, user_id)
+    return user
+
+
+def set_profile_image(db: Session, role: str, user_id: uuid.UUID, image_url: str, thumbnails: Optional[dict] = None):
+    """thumbnails: {size: url} for the profile_thumb_<size> columns."""
+    user = get_user_by_id(db, role, user_id)
+    if not user:
+        return None
+
+    user.profile_image = image_url
+    for size, url in (thumbnails or {}).items():
+        setattr(user, f"profile_thumb_{size}", url)
+    db.commit()
+    principals.evict(role, user_id)
+    return user
 
 
 # ----------------------------
@@ -33,11 +119,14 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 # ----------------------------
 
 def change_lecturer_password(db: Session, lecturer, current_password: str, new_password: str):
-    if not verify_password(current_password, lecturer.hashed_password):
+    # lecturer may be a cached Principal, which carries no password hash
+    lecturer = get_user_by_id(db, "lecturer", lecturer.id)
+    if not lecturer or not verify_password(current_password, lecturer.hashed_password):
         return False
 
     lecturer.hashed_password = get_password_hash(new_password)
     db.commit()
+    principals.evict("lecturer", lecturer.id)
     return True
     
 
@@ -55,24 +144,25 @@ def update_lecturer(db: Session, lecturer_id: uuid.UUID, school_id: uuid.UUID, u
 
     for field, value in updates.items():
         if field in ALLOWED_FIELDS and value is not None:
-            setattr(lecturer, field, value)
+            setattr(lecturer, field, normalize_email(value) if field == "email" else value)
 
 
     db.commit()
     db.refresh(lecturer)
+    principals.evict("lecturer", lecturer.id)
 
     return lecturer
 
 def get_lecturer_by_email(db: Session, email: str, school_id: uuid.UUID):
     return (
         db.query(models.Lecturer)
-        .filter(models.Lecturer.email == email).filter(models.Lecturer.school_id == school_id)
+        .filter(func.lower(models.Lecturer.email) == normalize_email(email)).filter(models.Lecturer.school_id == school_id)
         .first()
     )
 
 
 def lecturer_email_exists(db: Session, email: str, exclude_id: Optional[uuid.UUID] = None) -> bool:
-    query = db.query(models.Lecturer).filter(models.Lecturer.email == email)
+    query = db.query(models.Lecturer).filter(func.lower(models.Lecturer.email) == normalize_email(email))
 
     if exclude_id:
         query = query.filter(models.Lecturer.id != exclude_id)
@@ -80,7 +170,7 @@ def lecturer_email_exists(db: Session, email: str, exclude_id: Optional[uuid.UUI
     return db.query(query.exists()).scalar()
 
 def get_lecturer(db: Session, lecturer_id: uuid.UUID, school_id:uuid.UUID):
-    return db.query(models.Lecturer).filter(models.Lecturer.id == lecturer_id).first().filter(models.Lecturer.school_id == school_id)
+    return db.query(models.Lecturer).filter(models.Lecturer.id == lecturer_id, models.Lecturer.school_id == school_id).first()
 
 def create_lecturer(db: Session, lecturer_in: schemas.LecturerCreate):
     if lecturer_email_exists(db, lecturer_in.email):
@@ -95,7 +185,7 @@ def create_lecturer(db: Session, lecturer_in: schemas.LecturerCreate):
 
     lecturer = models.Lecturer(
         full_name=lecturer_in.full_name,
-        email=lecturer_in.email,
+        email=normalize_email(lecturer_in.email),
         hashed_password=get_password_hash(lecturer_in.password),
         course=lecturer_in.course,
         school_id = school.id
@@ -119,11 +209,14 @@ def authenticate_lecturer(db: Session, email: str, password: str, school_id:uuid
 # Student CRUD
 # ----------------------------
 def change_student_password(db: Session, student, current_password: str, new_password: str):
-    if not verify_password(current_password, student.hashed_password):
+    # student may be a cached Principal, which carries no password hash
+    student = get_user_by_id(db, "student", student.id)
+    if not student or not verify_password(current_password, student.hashed_password):
         return False
 
     student.hashed_password = get_password_hash(new_password)
     db.commit()
+    principals.evict("student", student.id)
     return True
 
 
@@ -141,24 +234,25 @@ def update_student(db: Session, student_id: uuid.UUID, school_id:uuid.UUID, upda
 
     for field, value in updates.items():
         if field in ALLOWED_FIELDS and value is not None:
-            setattr(student, field, value)
+            setattr(student, field, normalize_email(value) if field == "email" else value)
 
 
     db.commit()
     db.refresh(student)
+    principals.evict("student", student.id)
 
     return student
 
 def get_student_by_email(db: Session, email: str, school_id:uuid.UUID):
     return (
         db.query(models.Student)
-        .filter(models.Student.email == email).filter(models.Student.school_id == school_id)
+        .filter(func.lower(models.Student.email) == normalize_email(email)).filter(models.Student.school_id == school_id)
         .first()
     )
 
 
 def student_email_exists(db: Session, email: str, exclude_id: Optional[uuid.UUID] = None) -> bool:
-    query = db.query(models.Student).filter(models.Student.email == email)
+    query = db.query(models.Student).filter(func.lower(models.Student.email) == normalize_email(email))
 
     if exclude_id:
         query = query.filter(models.Student.id != exclude_id)
@@ -174,6 +268,64 @@ def get_student(db: Session, student_id: uuid.UUID):
 def get_all_students(db: Session, school_id:uuid.UUID):
     return db.query(models.Student).filter(models.Student.school_id == school_id).all()
 
+# Roster image column per ?image= value; students without thumbnails yet fall back to the full image
+ROSTER_IMAGES = {
+    "thumb": func.coalesce(models.Student.profile_thumb_64, models.Student.profile_image),
+    "medium": func.coalesce(models.Student.profile_thumb_256, models.Student.profile_image),
+    "full": models.Student.profile_image,
+}
+
+
+def get_students_page(db: Session, school_id: uuid.UUID, cursor: Optional[str], limit: int, image: str = "thumb"):
+    """One roster page as StudentOut column tuples, profile_image being the requested size."""
+    computed = {
+        "profile_image": ROSTER_IMAGES[image].label("profile_image"),
+        "school_name": models.School.name.label("school_name"),
+    }
+    columns = [
+        computed[name] if name in computed else getattr(models.Student, name)
+        for name in schemas.StudentOut.model_fields
+    ]
+
+    stmt = (
+        select(*columns, models.Student.created_at)
+        .join(models.School, models.School.id == models.Student.school_id)
+        .where(models.Student.school_id == school_id)
+    )
+    return keyset_page(db.execute(keyset_statement(stmt, models.Student, cursor, limit)), limit)
+
+def get_admin_user_page(
+    db: Session,
+    role: str,
+    school_id: Optional[uuid.UUID] = None,
+    is_active: Optional[bool] = None,
+    q: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+):
+    """
+    One page of the admin student or lecturer listing as AdminUserOut column
+    tuples; hashed_password is never selected. q matches a case-insensitive
+    prefix of the name or the email (ix_*_name_lower / ix_*_email_lower).
+    """
+    model = USER_MODELS[role]
+    stmt = select(*schema_columns(model, schemas.AdminUserOut))
+
+    if school_id:
+        stmt = stmt.where(model.school_id == school_id)
+
+    if is_active is not None:
+        stmt = stmt.where(model.is_active == is_active)
+
+    if q:
+        pattern = like_prefix(q.strip().lower())
+        stmt = stmt.where(or_(
+            func.lower(model.full_name).like(pattern, escape="\\"),
+            func.lower(model.email).like(pattern, escape="\\")
+        ))
+
+    return keyset_page(db.execute(keyset_statement(stmt, model, cursor, limit)), limit)
+
 def create_student(db: Session, student_in: schemas.StudentCreate):
     if (student_email_exists(db, student_in.email)
         or get_student_by_registration(db, student_in.registration_number)):
@@ -188,7 +340,7 @@ def create_student(db: Session, student_in: schemas.StudentCreate):
 
     student = models.Student(
         full_name=student_in.full_name,
-        email=student_in.email,
+        email=normalize_email(student_in.email),
         registration_number=student_in.registration_number,
         department=student_in.department,
         hashed_password=get_password_hash(student_in.password),
@@ -220,13 +372,46 @@ def get_attendance_by_student_with_filter(db: Session, school_id:uuid.UUID, stud
     )
     
     if date_value:
-        query = query.filter(models.Attendance.date == date)
+        query = query.filter(models.Attendance.date == date_value)
 
     if course_code:
         query = query.filter(models.Attendance.course_code == course_code)
     
     return query.all()
 
+def get_attendance_for_student_page(
+    db: Session,
+    student_id: uuid.UUID,
+    school_id: uuid.UUID,
+    date_value: Optional[date] = None,
+    course_code: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50,
+    schema=schemas.AttendanceOut
+):
+    """One page of rows holding schema's fields (then created_at), as plain column tuples."""
+    stmt = select(*schema_columns(models.Attendance, schema)).where(
+        models.Attendance.student_id == student_id,
+        models.Attendance.school_id == school_id
+    )
+
+    if date_value:
+        stmt = stmt.where(models.Attendance.date == date_value)
+
+    if course_code:
+        stmt = stmt.where(models.Attendance.course_code == course_code)
+
+    return keyset_page(db.execute(keyset_statement(stmt, models.Attendance, cursor, limit)), limit)
+
+def get_attendance_for_session(db: Session, session_id: uuid.UUID, school_id: uuid.UUID):
+    """The session's marks as AttendanceOut column tuples, oldest first (live stream snapshot)."""
+    attendance = models.Attendance
+    return db.execute(
+        select(*schema_columns(attendance, schemas.AttendanceOut))
+        .where(attendance.session_id == session_id, attendance.school_id == school_id)
+        .order_by(attendance.created_at, attendance.id)
+    ).all()
+
 def get_attendance_by_course_and_date(db: Session, school_id:uuid.UUID, course_code: str, date_value: date):
     return (
         db.query(models.Attendance).join(models.Student)
@@ -271,19 +456,118 @@ def create_attendance(
     )
 
     db.add(attendance)
+    db.execute(rollup_mark_statement(school_id, course_code, course_title, student_id, student_name))
     db.commit()
     db.refresh(attendance)
     return attendance
 
 
+def mark_attendance_statement(
+    student_id: uuid.UUID,
+    student_name: str,
+    session_id: uuid.UUID,
+    school_id: uuid.UUID,
+    status: str = "present",
+    open_session: Optional[ActiveSession] = None
+):
+    """
+    Build the single statement that validates the session and inserts the attendance row.
+
+    INSERT ... SELECT copies the course snapshot from the session row only if it
+    belongs to the school, is active and has not expired. When the caller already
+    knows the session is open (open_session from the active-session registry) the
+    snapshot is inserted as plain values instead. ON CONFLICT on
+    (student_id, session_id) makes concurrent duplicate marks a no-op.
+
+    Shared by crud.mark_attendance and crud_async.mark_attendance.
+    """
+    session = models.AttendanceSession
+    attendance = models.Attendance.__table__
+
+    if open_session is not None:
+        stmt = pg_insert(attendance).values(
+            student_id=student_id,
+            student_name=student_name,
+            lecturer_id=open_session.lecturer_id,
+            lecturer_name=open_session.lecturer_name,
+            session_id=open_session.id,
+            course_code=open_session.course_code,
+            course_title=open_session.course_title,
+            date=open_session.date,
+            status=status,
+            school_id=school_id,
+        )
+    else:
+        source = select(
+            literal(student_id, attendance.c.student_id.type),
+            literal(student_name, attendance.c.student_name.type),
+            session.lecturer_id,
+            session.lecturer_name,
+            session.id,
+            session.course_code,
+            session.course_title,
+            session.date,
+            literal(status, attendance.c.status.type),
+            session.school_id,
+        ).where(
+            session.id == session_id,
+            session.school_id == school_id,
+            session.is_active.is_(True),
+            session.date >= date.today(),
+        )
+        stmt = pg_insert(attendance).from_select(
+            [
+                "student_id", "student_name", "lecturer_id", "lecturer_name", "session_id",
+                "course_code", "course_title", "date", "status", "school_id",
+            ],
+            source,
+        )
+
+    return (
+        stmt
+        .on_conflict_do_nothing(index_elements=["student_id", "session_id"])
+        .returning(*attendance.c)
+    )
+
+
+def mark_attendance(
+    db: Session,
+    student_id: uuid.UUID,
+    student_name: str,
+    session_id: uuid.UUID,
+    school_id: uuid.UUID,
+    status: str = "present",
+    open_session: Optional[ActiveSession] = None
+):
+    """
+    Validate the session and insert the attendance row in one statement.
+
+    Returns the inserted row, or None when nothing was inserted (unknown,
+    closed or expired session, or already marked). A committed mark goes out to
+    the session's live streams (core/live_feed.py).
+    """
+    stmt = mark_attendance_statement(student_id, student_name, session_id, school_id, status, open_session)
+
+    row = db.execute(stmt).mappings().first()
+    if row:
+        db.execute(rollup_mark_statement(**rollup_keys(row)))
+    db.commit()
+    if row:
+        live_feed.publish_mark(row)
+    return row
+
+
 
 # ----------------------------
 # NEW: Attendance Session CRUD
 # ----------------------------
 def create_attendance_session(db: Session, session_in: schemas.AttendanceSessionCreate, lecturer_id:uuid.UUID, lecturer_name: str, school_id:uuid.UUID):
-    """Create a new class attendance session with a unique session code."""
+    """
+    Create a new class attendance session with a unique session code, and count it
+    toward every rollup of its course in the same transaction.
+    """
 
-    unique_code = f"S-{uuid.uuid4().hex[:6].upper()}"
+    unique_code = next_session_code(db, school_id)
 
     session = models.AttendanceSession(
         lecturer_id=lecturer_id,
@@ -297,11 +581,35 @@ def create_attendance_session(db: Session, session_in: schemas.AttendanceSession
     )
     
     db.add(session)
+    db.execute(
+        update(models.AttendanceRollup)
+        .where(
+            models.AttendanceRollup.school_id == school_id,
+            models.AttendanceRollup.course_code == session_in.course_code
+        )
+        .values(total_sessions=models.AttendanceRollup.total_sessions + 1, updated_at=func.now())
+    )
     db.commit()
     db.refresh(session)
+    active_sessions.add(session)
     return session
 
 
+def next_session_code(db: Session, school_id: uuid.UUID) -> str:
+    """
+    The school's next session code. Bumps schools.session_code_seq in the caller's
+    transaction; the code is a permutation of it (core/session_codes.py), unique
+    in the school without looking at existing codes.
+    """
+    seq = db.execute(
+        update(models.School)
+        .where(models.School.id == school_id)
+        .values(session_code_seq=models.School.session_code_seq + 1)
+        .returning(models.School.session_code_seq)
+    ).scalar_one()
+    return session_codes.session_code(school_id, seq)
+
+
 def get_session_by_code(db: Session, session_code: str, school_id:uuid.UUID):
     """Retrieve attendance session by unique code."""
     return (
@@ -311,6 +619,12 @@ def get_session_by_code(db: Session, session_code: str, school_id:uuid.UUID):
         .first()
     )
 
+def get_sessions_for_lecturer_page(db: Session, lecturer_id: uuid.UUID, cursor: Optional[str] = None, limit: int = 50):
+    """Rows of AttendanceSessionOut's fields (then created_at), as plain column tuples."""
+    columns = schema_columns(models.AttendanceSession, schemas.AttendanceSessionOut)
+    stmt = select(*columns).where(models.AttendanceSession.lecturer_id == lecturer_id)
+    return keyset_page(db.execute(keyset_statement(stmt, models.AttendanceSession, cursor, limit)), limit)
+
 def get_attendance_by_student_and_session(db: Session, student_id: uuid.UUID, session_id: uuid.UUID, school_id:uuid.UUID):
     return (
         db.query(models.Attendance).join(models.Student)
@@ -342,6 +656,101 @@ def get_attendance_for_lecturer(
 
     return query.all()
 
+def attendance_for_lecturer_statement(
+    lecturer_id: uuid.UUID,
+    school_id: uuid.UUID,
+    date: Optional[date] = None,
+    course_code: Optional[str] = None
+):
+    """
+    get_attendance_for_lecturer as a select() of AttendanceOut's columns (then
+    created_at), shared with crud_async.
+    """
+    stmt = select(*schema_columns(models.Attendance, schemas.AttendanceOut)).where(
+        models.Attendance.lecturer_id == lecturer_id,
+        models.Attendance.school_id == school_id
+    )
+
+    if date:
+        stmt = stmt.where(models.Attendance.date == date)
+
+    if course_code:
+        stmt = stmt.where(models.Attendance.course_code == course_code)
+
+    return stmt
+
+def get_attendance_for_lecturer_page(
+    db: Session,
+    lecturer_id: uuid.UUID,
+    school_id: uuid.UUID,
+    date: Optional[date] = None,
+    course_code: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+):
+    stmt = attendance_for_lecturer_statement(lecturer_id, school_id, date, course_code)
+    return keyset_page(db.execute(keyset_statement(stmt, models.Attendance, cursor, limit)), limit)
+
+
+# ----------------------------
+# Attendance export
+# ----------------------------
+# Plain columns, no ORM objects: an export row is a tuple in this order.
+ATTENDANCE_EXPORT_COLUMNS = (
+    models.Attendance.id,
+    models.Attendance.date,
+    models.Attendance.course_code,
+    models.Attendance.course_title,
+    models.Attendance.student_id,
+    models.Attendance.student_name,
+    models.Attendance.lecturer_id,
+    models.Attendance.lecturer_name,
+    models.Attendance.session_id,
+    models.Attendance.status,
+    models.Attendance.created_at,
+)
+ATTENDANCE_EXPORT_HEADERS = [c.key for c in ATTENDANCE_EXPORT_COLUMNS]
+
+def attendance_export_statement(
+    school_id: uuid.UUID,
+    lecturer_id: Optional[uuid.UUID] = None,
+    date: Optional[date] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    course_code: Optional[str] = None
+):
+    """Same filters as get_attendance_for_lecturer plus an inclusive date range."""
+    stmt = select(*ATTENDANCE_EXPORT_COLUMNS).where(models.Attendance.school_id == school_id)
+
+    if lecturer_id:
+        stmt = stmt.where(models.Attendance.lecturer_id == lecturer_id)
+
+    if date:
+        stmt = stmt.where(models.Attendance.date == date)
+
+    if date_from:
+        stmt = stmt.where(models.Attendance.date >= date_from)
+
+    if date_to:
+        stmt = stmt.where(models.Attendance.date <= date_to)
+
+    if course_code:
+        stmt = stmt.where(models.Attendance.course_code == course_code)
+
+    return stmt.order_by(models.Attendance.created_at, models.Attendance.id)
+
+def stream_rows(db: Session, stmt, batch_size: int = settings.EXPORT_BATCH_SIZE):
+    """
+    Yield result tuples batch_size at a time. yield_per runs the query on a
+    server-side cursor, so memory stays flat however many rows match.
+    """
+    result = db.execute(stmt.execution_options(yield_per=batch_size))
+    try:
+        for partition in result.partitions():
+            yield from partition
+    finally:
+        result.close()
+
 def get_attendance_by_id(db: Session, attendance_id: uuid.UUID, school_id:uuid.UUID):
     """Get a specific attendance record by ID"""
     return db.query(models.Attendance).join(models.Lecturer).filter(models.Attendance.id == attendance_id).filter(models.Lecturer.school_id == school_id).first()
@@ -350,24 +759,206 @@ def delete_attendance(db: Session, attendance_id: uuid.UUID, school_id: uuid.UUI
     """Delete a specific attendance record"""
     attendance = get_attendance_by_id(db, attendance_id, school_id)
     if attendance:
+        session_id = attendance.session_id
         db.delete(attendance)
+        for stmt in rollup_unmark_statements(attendance.school_id, attendance.course_code, attendance.student_id):
+            db.execute(stmt)
         db.commit()
+        live_feed.publish(session_id, "unmark", {"id": attendance_id})
 
 def get_attendance_session_by_id(db: Session, session_id: uuid.UUID, school_id:uuid.UUID):
-    return db.query(models.AttendanceSession).join(models.Student).filter(
+    return db.query(models.AttendanceSession).filter(
         models.AttendanceSession.id == session_id,
-        models.Student.school_id == school_id
+        models.AttendanceSession.school_id == school_id
     ).first()
 
 def is_session_expired(session):
     return session.date < date.today()
 
+def close_attendance_session(db: Session, session: models.AttendanceSession):
+    """
+    Close the session if it is still open. The guarded UPDATE settles concurrent
+    closes in the database: only the one that flips is_active stamps closed_at and
+    announces it. Rollups counted the session when it was created.
+    """
+    closed = db.execute(
+        update(models.AttendanceSession)
+        .where(models.AttendanceSession.id == session.id, models.AttendanceSession.is_active.is_(True))
+        .values(is_active=False, closed_at=datetime.utcnow())
+        .returning(models.AttendanceSession.id)
+    ).first()
+    db.commit()
+    active_sessions.invalidate(session.id)
+    if closed is not None:
+        live_feed.publish(session.id, "closed", {})
+    return session
+
+
+# ----------------------------
+# Attendance rollups
+# ----------------------------
+# attendance_rollups holds (attended, total_sessions) per (school, course, student).
+# total_sessions counts every session the course has held, open, closed or
+# expired, from the moment it is created: a session that runs past its date
+# without being closed still counts, and attended never exceeds total_sessions.
+# Every attendance insert/delete and session creation updates it in the same
+# transaction; rebuild_attendance_rollups recomputes it from scratch.
+def course_sessions_count(school_id, course_code):
+    return (
+        select(func.count())
+        .select_from(models.AttendanceSession)
+        .where(
+            models.AttendanceSession.school_id == school_id,
+            models.AttendanceSession.course_code == course_code
+        )
+        .scalar_subquery()
+    )
+
+def rollup_keys(row) -> Dict:
+    """rollup_mark_statement arguments from an attendance row or RETURNING mapping."""
+    return {
+        "school_id": row["school_id"],
+        "course_code": row["course_code"],
+        "course_title": row["course_title"],
+        "student_id": row["student_id"],
+        "student_name": row["student_name"],
+    }
+
+def rollup_mark_statement(school_id, course_code, course_title, student_id, student_name):
+    """
+    Count one more attended session. A student's first mark in a course creates
+    the row, starting total_sessions at the sessions the course has held so far.
+    """
+    rollup = models.AttendanceRollup
+    stmt = pg_insert(rollup).values(
+        school_id=school_id,
+        course_code=course_code,
+        student_id=student_id,
+        student_name=student_name,
+        course_title=course_title,
+        attended=1,
+        total_sessions=course_sessions_count(school_id, course_code)
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=[rollup.school_id, rollup.course_code, rollup.student_id],
+        set_={"attended": rollup.attended + 1, "updated_at": func.now()}
+    )
+
+def rollup_unmark_statements(school_id, course_code, student_id):
+    """
+    Count one attended session less, dropping the row at zero: a student without
+    attendance in the course has no rollup, as after rebuild_attendance_rollups.
+    """
+    rollup = models.AttendanceRollup
+    keys = (rollup.school_id == school_id, rollup.course_code == course_code, rollup.student_id == student_id)
+    return (
+        update(rollup)
+        .where(*keys, rollup.attended > 0)
+        .values(attended=rollup.attended - 1, updated_at=func.now()),
+        delete(rollup).where(*keys, rollup.attended <= 0),
+    )
+
+def get_student_summary(db: Session, student_id: uuid.UUID, school_id: uuid.UUID):
+    return db.scalars(
+        select(models.AttendanceRollup)
+        .where(
+            models.AttendanceRollup.student_id == student_id,
+            models.AttendanceRollup.school_id == school_id
+        )
+        .order_by(models.AttendanceRollup.course_code)
+    ).all()
+
+def get_course_summary(db: Session, school_id: uuid.UUID, lecturer_id: uuid.UUID, course_code: str):
+    """
+    Rollups of the course, or None unless the lecturer has held a session of it.
+    Students registered under the lecturer (students.lecturer_id) who have never
+    marked are listed too, at 0 of the course's sessions.
+    """
+    sessions = models.AttendanceSession
+    held, owned = db.execute(
+        select(func.count(), func.coalesce(func.max(case((sessions.lecturer_id == lecturer_id, 1), else_=0)), 0))
+        .where(sessions.school_id == school_id, sessions.course_code == course_code)
+    ).one()
+    if not owned:
+        return None
+
+    rollup = models.AttendanceRollup
+    rows = db.scalars(
+        select(rollup)
+        .where(rollup.school_id == school_id, rollup.course_code == course_code)
+        .order_by(rollup.student_name)
+    ).all()
+
+    absent = db.execute(
+        select(models.Student.id, models.Student.full_name)
+        .where(
+            models.Student.school_id == school_id,
+            models.Student.lecturer_id == lecturer_id,
+            models.Student.id.not_in(
+                select(rollup.student_id).where(rollup.school_id == school_id, rollup.course_code == course_code)
+            )
+        )
+    ).all()
+    if not absent:
+        return rows
+    rows = list(rows) + [
+        models.AttendanceRollup(student_id=student_id, student_name=name, attended=0, total_sessions=held)
+        for student_id, name in absent
+    ]
+    return sorted(rows, key=lambda row: row.student_name)
+
+def rebuild_attendance_rollups(db: Session, school_id: Optional[uuid.UUID] = None) -> int:
+    """
+    Recompute attendance_rollups from attendance and attendance_sessions, for one
+    school or all of them. Returns the number of rollup rows written.
+    """
+    attendance = models.Attendance
+    sessions = models.AttendanceSession
+    rollup = models.AttendanceRollup
+
+    held = (
+        select(sessions.school_id, sessions.course_code, func.count().label("held"))
+        .group_by(sessions.school_id, sessions.course_code)
+        .subquery()
+    )
+    counts = (
+        select(
+            attendance.school_id,
+            attendance.course_code,
+            attendance.student_id,
+            func.max(attendance.student_name),
+            func.max(attendance.course_title),
+            func.count(),
+            func.coalesce(func.max(held.c.held), 0)
+        )
+        .outerjoin(
+            held,
+            (held.c.school_id == attendance.school_id) & (held.c.course_code == attendance.course_code)
+        )
+        .group_by(attendance.school_id, attendance.course_code, attendance.student_id)
+    )
+
+    clear = delete(rollup)
+    if school_id:
+        clear = clear.where(rollup.school_id == school_id)
+        counts = counts.where(attendance.school_id == school_id)
+
+    db.execute(clear)
+    result = db.execute(
+        rollup.__table__.insert().from_select(
+            ["school_id", "course_code", "student_id", "student_name", "course_title", "attended", "total_sessions"],
+            counts
+        )
+    )
+    db.commit()
+    return result.rowcount
+
 # ======================
 # ADMIN CRUD
 # ======================
 
 def get_admin_by_email(db: Session, email: str):
-    return db.query(models.Admin).filter(models.Admin.email == email).first()
+    return db.query(models.Admin).filter(func.lower(models.Admin.email) == normalize_email(email)).first()
 
 
 def authenticate_admin(db: Session, email: str, password: str):
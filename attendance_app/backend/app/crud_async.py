@@ -0,0 +1,94 @@
+"""
+crud_async.py
+AsyncSession counterparts of the crud.py functions used by the hot routes
+(login, attendance mark/records, student/lecturer /me), and nothing else.
+
+Only used when settings.DB_ASYNC is enabled. Names and return values mirror crud.py.
+"""
+
+from sqlalchemy import select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from app import models, crud
+from app.core.session_registry import ActiveSession
+from app.core.live_feed import live_feed
+from app.utils.helpers import normalize_email
+from datetime import date
+from typing import Optional
+import uuid
+
+
+# ----------------------------
+# Principal helpers
+# ----------------------------
+async def get_user_by_id(db: AsyncSession, role: str, user_id: uuid.UUID):
+    return await db.get(crud.USER_MODELS[role], user_id)
+
+
+async def get_user_for_login(db: AsyncSession, role: str, email: str):
+    model = crud.USER_MODELS[role]
+    query = select(model).where(func.lower(model.email) == normalize_email(email))
+    return (await db.execute(query)).scalars().first()
+
+
+# ----------------------------
+# Attendance
+# ----------------------------
+async def get_attendance_for_lecturer_page(
+    db: AsyncSession,
+    lecturer_id: uuid.UUID,
+    school_id: uuid.UUID,
+    date: Optional[date] = None,
+    course_code: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = 50
+):
+    stmt = crud.attendance_for_lecturer_statement(lecturer_id, school_id, date, course_code)
+    result = await db.execute(crud.keyset_statement(stmt, models.Attendance, cursor, limit))
+    return crud.keyset_page(result, limit)
+
+
+async def mark_attendance(
+    db: AsyncSession,
+    student_id: uuid.UUID,
+    student_name: str,
+    session_id: uuid.UUID,
+    school_id: uuid.UUID,
+    status: str = "present",
+    open_session: Optional[ActiveSession] = None
+):
+    """See crud.mark_attendance."""
+    stmt = crud.mark_attendance_statement(student_id, student_name, session_id, school_id, status, open_session)
+
+    row = (await db.execute(stmt)).mappings().first()
+    if row:
+        await db.execute(crud.rollup_mark_statement(**crud.rollup_keys(row)))
+    await db.commit()
+    if row:
+        live_feed.publish_mark(row)
+    return row
+
+
+# ----------------------------
+# Attendance Session
+# ----------------------------
+async def get_attendance_session_by_id(db: AsyncSession, session_id: uuid.UUID, school_id: uuid.UUID):
+    query = select(models.AttendanceSession).where(
+        models.AttendanceSession.id == session_id,
+        models.AttendanceSession.school_id == school_id
+    )
+    return (await db.execute(query)).scalars().first()
+
+
+# ----------------------------
+# Admin
+# ----------------------------
+async def get_admin_by_email(db: AsyncSession, email: str):
+    query = select(models.Admin).where(func.lower(models.Admin.email) == normalize_email(email))
+    return (await db.execute(query)).scalars().first()
+
+
+# ----------------------------
+# School
+# ----------------------------
+async def get_school_by_id(db: AsyncSession, school_id: uuid.UUID):
+    return await db.get(models.School, school_id)
@@ -2,34 +2,165 @@
 backend/database.py\n
 Database setup using SQLAlchemy
 Reads DATABASE_URL from config.py
+
+Engines are created on first use (main.lifespan creates them at startup), never
+at import time, and creating one does not connect: the first connection is opened
+by the first query. Pool sizing comes from the DB_POOL_* settings; with
+DB_PGBOUNCER the app keeps no pool of its own and disables prepared statements,
+so it can sit behind PgBouncer in transaction mode.
 """
 
-from sqlalchemy import create_engine
+import logging
+import threading
+import time
+import uuid
+
+from sqlalchemy import create_engine, exc, make_url
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import NullPool, QueuePool, AsyncAdaptedQueuePool
 from app.config import settings
-from dotenv import load_dotenv
-import os
 
-load_dotenv()
+logger = logging.getLogger(__name__)
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = settings.DATABASE_URL
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True
-)
+Base = declarative_base()
+
+
+# ----------------------------
+# Pool instrumentation
+# ----------------------------
+class PoolWaits:
+    """Time spent waiting for a connection at checkout, and checkouts that timed out."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+
+    def add(self, seconds: float, timed_out: bool) -> None:
+        with self._lock:
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+            self.timeouts += timed_out
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            return {
+                "count": self.count,
+                "avg_ms": round(self.total / self.count * 1000, 2) if self.count else 0.0,
+                "max_ms": round(self.max * 1000, 2),
+                "timeouts": self.timeouts,
+            }
+
+
+class _TimedCheckout:
+    """Pool mixin timing _do_get, the call that blocks while the pool is exhausted."""
+    waits: PoolWaits
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.waits.add(time.perf_counter() - started, timed_out)
+
+
+# Class-level counters, so they survive the pool being recreated by engine.dispose()
+class TimedQueuePool(_TimedCheckout, QueuePool):
+    waits = PoolWaits()
+
+
+class TimedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    waits = PoolWaits()
+
+
+class TimedNullPool(_TimedCheckout, NullPool):
+    waits = PoolWaits()
+
+
+class TimedAsyncNullPool(_TimedCheckout, NullPool):
+    waits = PoolWaits()
+
+
+def engine_options(url, pool_class, null_pool_class) -> dict:
+    """
+    create_engine keyword arguments for the DB_POOL_* / DB_PGBOUNCER settings.
+    Every worker process gets its own pool, so the database sees up to
+    workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+    """
+    options = {"pool_pre_ping": True}
+    if settings.DB_PGBOUNCER:
+        # PgBouncer owns the pooling; a connection is opened per checkout
+        options["poolclass"] = null_pool_class
+    elif make_url(url).get_backend_name() != "sqlite":
+        options.update(
+            poolclass=pool_class,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
+
+
+# ----------------------------
+# Sync engine
+# ----------------------------
+_engine = None
+_engine_lock = threading.Lock()
+# False for an engine handed in through use_engine: its owner disposes it
+_engine_owned = True
+
+
+def get_engine():
+    """The process-wide engine, created on first call. psycopg2 never uses server-side prepared statements."""
+    global _engine, _engine_owned
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine_owned = True
+                _engine = create_engine(
+                    DATABASE_URL,
+                    **engine_options(DATABASE_URL, TimedQueuePool, TimedNullPool)
+                )
+                logger.info("Database engine created (%s)", _engine.pool.status())
+    return _engine
+
+
+def use_engine(engine) -> None:
+    """
+    Serve this process from an engine created elsewhere (main.create_app(engine),
+    tests and benchmarks on in-memory SQLite). SessionLocal and get_db pick it up
+    on their next call; dispose_engines() leaves it to its owner. None goes back
+    to creating the DATABASE_URL engine on first use.
+    """
+    global _engine, _engine_owned
+    with _engine_lock:
+        _engine = engine
+        _engine_owned = False
 
-with engine.connect() as conn:
-    print("Connected successfully")
 
-SessionLocal = sessionmaker(
+class _LazySessionmaker(sessionmaker):
+    """sessionmaker bound to get_engine() at call time, so creating one never touches the database."""
+
+    def __call__(self, **local_kw):
+        local_kw.setdefault("bind", get_engine())
+        return super().__call__(**local_kw)
+
+
+SessionLocal = _LazySessionmaker(
     autocommit=False,
-    autoflush=False,
-    bind=engine
+    autoflush=False
 )
 
-Base = declarative_base()
-
 # Dependency for FastAPI routes
 def get_db():
     db = SessionLocal()
@@ -37,3 +168,115 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ----------------------------
+# Async engine (settings.DB_ASYNC)
+# ----------------------------
+def async_database_url(url: str):
+    """Point a sync PostgreSQL URL at asyncpg. asyncpg takes ssl instead of sslmode."""
+    url = make_url(url)
+    connect_args = {}
+    if url.get_backend_name() != "postgresql":
+        return url, connect_args
+
+    url = url.set(drivername="postgresql+asyncpg")
+    sslmode = url.query.get("sslmode")
+    if sslmode:
+        url = url.difference_update_query(["sslmode"])
+        connect_args["ssl"] = sslmode
+
+    if settings.DB_PGBOUNCER:
+        # Transaction-mode PgBouncer hands each transaction a different server
+        # connection, so asyncpg must not cache or reuse named prepared statements
+        url = url.update_query_dict({"prepared_statement_cache_size": "0"})
+        connect_args["statement_cache_size"] = 0
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+    return url, connect_args
+
+
+_async_engine = None
+AsyncSessionLocal = None
+
+
+def get_async_engine():
+    """The process-wide async engine, created on first call (event-loop thread only, no lock needed)."""
+    global _async_engine, AsyncSessionLocal
+    if _async_engine is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+        async_url, async_connect_args = async_database_url(settings.ASYNC_DATABASE_URL or DATABASE_URL)
+
+        _async_engine = create_async_engine(
+            async_url,
+            connect_args=async_connect_args,
+            **engine_options(async_url, TimedAsyncQueuePool, TimedAsyncNullPool)
+        )
+
+        # expire_on_commit=False: attributes cannot be lazy-loaded outside an await
+        AsyncSessionLocal = async_sessionmaker(
+            bind=_async_engine,
+            autoflush=False,
+            expire_on_commit=False
+        )
+        logger.info("Async database engine created (%s)", _async_engine.pool.status())
+    return _async_engine
+
+
+async def get_async_db():
+    if AsyncSessionLocal is None:
+        get_async_engine()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# ----------------------------
+# Lifecycle and stats
+# ----------------------------
+def init_engines() -> None:
+    """Create the engines this process serves with (main.lifespan). Does not connect."""
+    get_engine()
+    if settings.DB_ASYNC:
+        get_async_engine()
+
+
+async def dispose_engines() -> None:
+    global _engine, _async_engine, AsyncSessionLocal
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = AsyncSessionLocal = None
+    if _engine is not None:
+        if _engine_owned:
+            _engine.dispose()
+        _engine = None
+
+
+def _pool_stats(engine) -> dict:
+    if engine is None:
+        return {"created": False}
+
+    pool = engine.pool
+    stats = {"created": True, "pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            # overflow() counts down from -size until the pool is full
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout_s=pool.timeout(),
+        )
+    waits = getattr(pool, "waits", None)
+    if waits is not None:
+        stats["checkout_wait"] = waits.as_dict()
+    return stats
+
+
+def pool_stats() -> dict:
+    """Live pool numbers for /health/db-pool. Never creates an engine."""
+    return {
+        "pgbouncer": settings.DB_PGBOUNCER,
+        "sync": _pool_stats(_engine),
+        "async": _pool_stats(_async_engine) if settings.DB_ASYNC else None,
+    }
@@ -7,73 +7,130 @@ Provides:
 - /attendance endpoints
 - /lecturer endpoints
 - /student endpoints
+
+`app` is built by create_app() from the settings. Tests and benchmarks call
+create_app(engine) to serve the same routes from their own engine (tests/conftest.py).
 """
 
-from fastapi import FastAPI, Depends
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, FastAPI, Depends, Header, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 import datetime
 from app.config import settings
 from app.routes import students, lecturers, auth, attendance, admin_auth, admin, admin_create, schools
 from fastapi.openapi.utils import get_openapi
-from tests import test_attendance
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from app.models import Base
 from app import models
 from sqlalchemy.orm import Session
-from app.database import get_db, engine
-from app.core.logging_config import setup_logging
+from app.database import get_db, init_engines, dispose_engines, pool_stats, use_engine
+from app.core.logging_config import setup_logging, logging_stats
+from app.core.session_registry import active_sessions
+from app.core.principal_cache import principals
+from app.core.password_pool import password_pool
+from app.core.upload_queue import upload_queue
+from app.core.image_pool import image_pool
+from app.core.metrics import metrics, MetricsMiddleware
+from app.core.live_feed import live_feed
+import hmac
 import os
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Creating the engines does not connect, so the server binds its port
+    # without waiting on the database
+    init_engines()
+    live_feed.start()
+    yield
+    live_feed.shutdown()
+    upload_queue.shutdown()
+    image_pool.shutdown()
+    await dispose_engines()
+    password_pool.shutdown()
 
-app = FastAPI(
-    title=settings.APP_NAME,
-    debug=settings.DEBUG,
-    description="Backend for attendance system",
-    version="1.0.0"
-)
 
 setup_logging()
 
-# CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-
-app.include_router(auth.router)
-app.include_router(students.router)
-app.include_router(lecturers.router)
-app.include_router(attendance.router)
-app.include_router(test_attendance.router)
-app.include_router(admin_auth.router)
-app.include_router(admin.router)
-app.include_router(schools.router)
-app.include_router(admin_create.router)
 
-# BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-# PROJECT_ROOT = os.path.dirname(BASE_DIR)
+# =====================================================
+# HEALTH AND METRICS
+# =====================================================
+ops_router = APIRouter()
 
 
+def require_ops_token(authorization: str = Header(default="")):
+    """
+    Guards /metrics and the detailed health stats: "Authorization: Bearer
+    <METRICS_TOKEN>". Without a configured token they are not served at all.
+    """
+    if not settings.METRICS_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not hmac.compare_digest(authorization.encode(), f"Bearer {settings.METRICS_TOKEN}".encode()):
+        raise HTTPException(status_code=401, detail="Invalid metrics token")
 
-# FRONTEND_DIR = os.path.join(PROJECT_ROOT, "frontend")
 
-# app.mount(
-#     "/",
-#     StaticFiles(directory=FRONTEND_DIR, html=True),
-#     name="frontend"
-# )
-@app.get("/health", tags=["health"])
+@ops_router.get("/health", tags=["health"])
 def health_check():
+    """Liveness only; the worker's internals are under /health/details."""
     return {"status": "ok", "timestamp": datetime.datetime.utcnow()}
 
 
-@app.get("/")
+@ops_router.get("/health/details", tags=["health"], dependencies=[Depends(require_ops_token)])
+def health_details():
+    return {
+        "status": "ok",
+        "timestamp": datetime.datetime.utcnow(),
+        "session_registry": active_sessions.stats(),
+        "principal_cache": principals.stats(),
+        "password_pool": password_pool.stats(),
+        "upload_queue": upload_queue.stats(),
+        "image_pool": image_pool.stats(),
+        "logging": logging_stats(),
+        "live_feed": live_feed.stats(),
+        "db_pool": pool_stats()
+    }
+
+
+@ops_router.get("/health/db-pool", tags=["health"], dependencies=[Depends(require_ops_token)])
+def db_pool_health():
+    """Checked-out / overflow connections and checkout wait times of the database pools."""
+    return pool_stats()
+
+
+def _db_pool_gauge(field):
+    def collect():
+        return {
+            (name,): stats[field]
+            for name, stats in pool_stats().items()
+            if isinstance(stats, dict) and field in stats
+        }
+    return collect
+
+
+metrics.register_gauge("db_pool_checked_out", "Connections checked out of the pool.", _db_pool_gauge("checked_out"), ("engine",))
+metrics.register_gauge("db_pool_overflow", "Connections open beyond DB_POOL_SIZE.", _db_pool_gauge("overflow"), ("engine",))
+metrics.register_gauge(
+    "background_queue_depth",
+    "Jobs waiting in the in-process worker queues.",
+    lambda: {
+        ("password_pool",): password_pool.stats()["queue_depth"],
+        ("upload_queue",): upload_queue.stats()["queue_depth"],
+        ("logging",): logging_stats()["queue_depth"],
+        ("live_feed",): live_feed.stats()["queue_depth"],
+    },
+    ("queue",),
+)
+
+
+@ops_router.get("/metrics", tags=["health"], response_class=PlainTextResponse, dependencies=[Depends(require_ops_token)])
+def prometheus_metrics():
+    """Request, database and queue metrics of this worker in Prometheus text format."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@ops_router.get("/")
 def root():
     return {"message": f"Welcome to {settings.APP_NAME}"}
 
@@ -82,7 +139,7 @@ def root():
 # CUSTOM SWAGGER (OpenAPI) FOR JWT AUTH
 # =====================================================
 
-def custom_openapi():
+def custom_openapi(app: FastAPI):
     if app.openapi_schema:
         return app.openapi_schema
 
@@ -111,4 +168,70 @@ def custom_openapi():
     return app.openapi_schema
 
 
-app.openapi = custom_openapi  # <-- ACTIVATE CUSTOM SWAGGER
\ No newline at end of file
+# =====================================================
+# APP FACTORY
+# =====================================================
+def create_app(engine=None) -> FastAPI:
+    """
+    Build the application. With engine, the process serves from it instead of
+    DATABASE_URL (database.use_engine); the caller keeps ownership and disposes it.
+    """
+    if engine is not None:
+        use_engine(engine)
+
+    app = FastAPI(
+        title=settings.APP_NAME,
+        debug=settings.DEBUG,
+        description="Backend for attendance system",
+        version="1.0.0",
+        lifespan=lifespan
+    )
+
+    # CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.cors_origins,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    # Outermost, so the timings include CORS and every other middleware
+    app.add_middleware(MetricsMiddleware)
+
+    app.include_router(auth.router)
+    app.include_router(students.router)
+    app.include_router(lecturers.router)
+    app.include_router(attendance.router)
+    if settings.ENABLE_DEBUG_ROUTES:
+        from app.routes import debug_attendance
+
+        app.include_router(debug_attendance.router)
+    app.include_router(admin_auth.router)
+    app.include_router(admin.router)
+    app.include_router(schools.router)
+    app.include_router(admin_create.router)
+    app.include_router(ops_router)
+
+    # Profile images written by the local storage backend (app/utils/storage.py)
+    if settings.STORAGE_BACKEND == "local":
+        os.makedirs(settings.STORAGE_LOCAL_DIR, exist_ok=True)
+        app.mount("/media", StaticFiles(directory=settings.STORAGE_LOCAL_DIR), name="media")
+
+    # BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    # PROJECT_ROOT = os.path.dirname(BASE_DIR)
+
+
+
+    # FRONTEND_DIR = os.path.join(PROJECT_ROOT, "frontend")
+
+    # app.mount(
+    #     "/",
+    #     StaticFiles(directory=FRONTEND_DIR, html=True),
+    #     name="frontend"
+    # )
+
+    app.openapi = lambda: custom_openapi(app)  # <-- ACTIVATE CUSTOM SWAGGER
+    return app
+
+
+app = create_app()
@@ -4,12 +4,16 @@ Defines database tables for the Smart Attendance System.
 Uses SQLAlchemy ORM with proper relationships.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Date, Boolean
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, ForeignKey, Date, Boolean, Index, Uuid
 from sqlalchemy.sql import func, text
 from sqlalchemy.orm import relationship
 from app.database import Base
 import uuid
-from sqlalchemy.dialects.postgresql import UUID
+
+# Uuid is native UUID on PostgreSQL and CHAR(32) elsewhere (SQLite in tests and
+# benchmarks). Primary keys are generated client-side by default=uuid.uuid4, so
+# inserts work on any dialect; gen_random_uuid() stays as the PostgreSQL column
+# default for rows written outside the ORM.
 
 #---------------------------
 # Admin Model
@@ -17,7 +21,7 @@ from sqlalchemy.dialects.postgresql import UUID
 class Admin(Base):
     __tablename__ = "admins"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"), index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     full_name = Column(String, nullable=False)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
@@ -30,8 +34,10 @@ class Admin(Base):
 class School(Base):
     __tablename__ = "schools"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"), index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     name = Column(String(225), unique=True, nullable=False)
+    # Sessions created so far; numbers the codes of app/core/session_codes.py
+    session_code_seq = Column(BigInteger, nullable=False, default=0, server_default=text("0"))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     # Relationships
@@ -46,15 +52,24 @@ class School(Base):
 # ----------------------------
 class Lecturer(Base):
     __tablename__ = "lecturers"
+    __table_args__ = (
+        # Keyset pages of the admin lecturer listing (crud.get_admin_user_page)
+        Index("ix_lecturers_school_created", "school_id", "created_at", "id"),
+        Index("ix_lecturers_created", "created_at", "id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"), index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     full_name = Column(String(225), nullable=False)
     email = Column(String(225), unique=True, nullable=False)
     hashed_password = Column(String(225), nullable=False)
     course = Column(String(225))
     profile_image = Column(String(225), nullable=True)
+    # Square JPEG thumbnails written by utils/storage.py (core/image_pool.THUMBNAIL_SIZES)
+    profile_thumb_64 = Column(String(225), nullable=True)
+    profile_thumb_256 = Column(String(225), nullable=True)
     is_active = Column(Boolean, default=True)
-    school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id", ondelete="CASCADE"), nullable=False, index=True)
+    school_id = Column(Uuid, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
     # Relationships
@@ -64,46 +79,79 @@ class Lecturer(Base):
     attendance_sessions = relationship("AttendanceSession", back_populates="lecturer")
     school = relationship("School", back_populates="lecturers")
 
+    @property
+    def school_name(self):
+        return self.school.name if self.school else None
+
 
 # ----------------------------
 # Student Model
 # ----------------------------
 class Student(Base):
     __tablename__ = "students"
+    __table_args__ = (
+        # Keyset pages of the student rosters (crud.get_students_page, crud.get_admin_user_page)
+        Index("ix_students_school_created", "school_id", "created_at", "id"),
+        Index("ix_students_created", "created_at", "id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"), index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     full_name = Column(String(225), nullable=False)
     email = Column(String(225), unique=True, nullable=False)
     hashed_password = Column(String(225), nullable=False)
     registration_number = Column(String(225), unique=True, nullable=False)
     department = Column(String(225))
     profile_image = Column(String(225), nullable=True)
+    # Square JPEG thumbnails written by utils/storage.py (core/image_pool.THUMBNAIL_SIZES)
+    profile_thumb_64 = Column(String(225), nullable=True)
+    profile_thumb_256 = Column(String(225), nullable=True)
     is_active = Column(Boolean, default=True)
-    school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id", ondelete="CASCADE"), nullable=False, index=True)
+    school_id = Column(Uuid, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
-    lecturer_id = Column(UUID(as_uuid=True), ForeignKey("lecturers.id", ondelete="CASCADE"), index=True)
+    lecturer_id = Column(Uuid, ForeignKey("lecturers.id", ondelete="CASCADE"), index=True)
     lecturer = relationship("Lecturer", back_populates="students")
     school = relationship("School", back_populates="students")
     attendance_records = relationship("Attendance", back_populates="student")
 
+    @property
+    def school_name(self):
+        return self.school.name if self.school else None
+
 
 # ----------------------------
 # Attendance Model
 # ----------------------------
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        # One mark per student per session; also the ON CONFLICT target in crud.mark_attendance
+        Index("uq_attendance_student_session", "student_id", "session_id", unique=True),
+        # Keyset pages of the lecturer and student attendance listings; the student one
+        # also serves crud.get_attendance_by_student (created_at desc)
+        Index("ix_attendance_lecturer_school_created", "lecturer_id", "school_id", "created_at", "id"),
+        Index("ix_attendance_student_school_created", "student_id", "school_id", "created_at", "id"),
+        # date / course_code filters of crud.get_attendance_for_lecturer and
+        # crud.get_attendance_by_student_with_filter
+        Index("ix_attendance_lecturer_school_date_course", "lecturer_id", "school_id", "date", "course_code"),
+        Index("ix_attendance_student_school_date_course", "student_id", "school_id", "date", "course_code"),
+        # /admin/export (crud.attendance_export_statement without a lecturer)
+        Index("ix_attendance_school_created", "school_id", "created_at", "id"),
+        # Marks of one session, for the live stream's snapshot (crud.get_attendance_for_session)
+        Index("ix_attendance_session_created", "session_id", "created_at", "id"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"), index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
 
-    student_id = Column(UUID(as_uuid=True), ForeignKey("students.id", ondelete="CASCADE"), nullable=False, index=True)
+    student_id = Column(Uuid, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
     student_name = Column(String(225), nullable=False)
-    lecturer_id = Column(UUID(as_uuid=True), ForeignKey("lecturers.id", ondelete="CASCADE"), nullable=False, index=True)
+    lecturer_id = Column(Uuid, ForeignKey("lecturers.id", ondelete="CASCADE"), nullable=False)
     lecturer_name = Column(String(225), nullable=False)
 
     # NEW: session link
     session_id = Column(
-        UUID(as_uuid=True),
+        Uuid,
         ForeignKey("attendance_sessions.id", ondelete="CASCADE"),
         nullable=True,
         index=True
@@ -116,7 +164,7 @@ class Attendance(Base):
     date = Column(Date, nullable=False, index=True)
     status = Column(String(225), nullable=False, default="present")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id", ondelete="CASCADE"), nullable=False, index=True)
+    school_id = Column(Uuid, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False)
 
     # Relationships
     student = relationship("Student", back_populates="attendance_records")
@@ -131,12 +179,12 @@ class Attendance(Base):
 class Course(Base):
     __tablename__ = "courses"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"), index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
     title = Column(String(225), nullable=False)
     code = Column(String(225), unique=True, nullable=False)
 
-    lecturer_id = Column(UUID(as_uuid=True), ForeignKey("lecturers.id", ondelete="CASCADE"), nullable=False, index=True)
-    school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id", ondelete="CASCADE"), nullable=False, index=True)
+    lecturer_id = Column(Uuid, ForeignKey("lecturers.id", ondelete="CASCADE"), nullable=False, index=True)
+    school_id = Column(Uuid, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False, index=True)
 
     lecturer = relationship("Lecturer", back_populates="courses")
     school = relationship("School", back_populates="courses")
@@ -147,9 +195,17 @@ class Course(Base):
 # ----------------------------
 class AttendanceSession(Base):
     __tablename__ = "attendance_sessions"
+    __table_args__ = (
+        # Keyset pages of /lecturers/me/sessions
+        Index("ix_attendance_sessions_lecturer_created", "lecturer_id", "created_at", "id"),
+        # Codes are unique per school (app/core/session_codes.py); serves crud.get_session_by_code
+        Index("uq_attendance_sessions_school_code", "school_id", "session_code", unique=True),
+        # Session counts per course (attendance_rollups.total_sessions)
+        Index("ix_attendance_sessions_school_course", "school_id", "course_code"),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, server_default=text("gen_random_uuid()"), index=True)
-    lecturer_id = Column(UUID(as_uuid=True), ForeignKey("lecturers.id", ondelete="CASCADE"), nullable=False, index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4, server_default=text("gen_random_uuid()"))
+    lecturer_id = Column(Uuid, ForeignKey("lecturers.id", ondelete="CASCADE"), nullable=False)
     lecturer_name = Column(String(225), nullable=False)
 
     course_code = Column(String(225), nullable=False)
@@ -157,12 +213,62 @@ class AttendanceSession(Base):
 
     date = Column(Date, nullable=False)
 
-    session_code = Column(String(225), unique=True, nullable=False)
+    session_code = Column(String(225), nullable=False)
     is_active = Column(Boolean, default=True)
     closed_at = Column(DateTime, nullable=True)
-    school_id = Column(UUID(as_uuid=True), ForeignKey("schools.id", ondelete="CASCADE"), nullable=False, index=True)
+    school_id = Column(Uuid, ForeignKey("schools.id", ondelete="CASCADE"), nullable=False)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
     lecturer = relationship("Lecturer", back_populates="attendance_sessions")
-    school = relationship("School", back_populates="attendance_sessions")
\ No newline at end of file
+    school = relationship("School", back_populates="attendance_sessions")
+
+
+# ----------------------------
+# Attendance Rollup Model
+# ----------------------------
+class AttendanceRollup(Base):
+    """
+    Per-student, per-course attendance counts, kept current by crud alongside the
+    attendance and session writes so summaries never scan attendance history.
+
+    total_sessions counts every session the course has held, from its creation on,
+    so a session left to expire without being closed still counts.
+    """
+    __tablename__ = "attendance_rollups"
+    __table_args__ = (
+        # /students/me/summary
+        Index("ix_attendance_rollups_student_school", "student_id", "school_id"),
+    )
+
+    school_id = Column(Uuid, ForeignKey("schools.id", ondelete="CASCADE"), primary_key=True)
+    course_code = Column(String(225), primary_key=True)
+    student_id = Column(Uuid, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+
+    # Snapshot fields, like Attendance
+    student_name = Column(String(225), nullable=False)
+    course_title = Column(String(225), nullable=False)
+
+    attended = Column(Integer, nullable=False, default=0, server_default="0")
+    total_sessions = Column(Integer, nullable=False, default=0, server_default="0")
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def percentage(self):
+        return round(100 * self.attended / self.total_sessions, 1) if self.total_sessions else None
+
+
+# ----------------------------
+# Case-insensitive email lookups and uniqueness (crud.get_user_for_login)
+# ----------------------------
+# text_pattern_ops on students / lecturers: the same index also serves the
+# LIKE 'prefix%' search of the admin listings (crud.get_admin_user_page)
+Index("ix_admins_email_lower", func.lower(Admin.email), unique=True)
+Index("ix_lecturers_email_lower", func.lower(Lecturer.email).label("email_lower"), unique=True, postgresql_ops={"email_lower": "text_pattern_ops"})
+Index("ix_students_email_lower", func.lower(Student.email).label("email_lower"), unique=True, postgresql_ops={"email_lower": "text_pattern_ops"})
+
+# ----------------------------
+# Name prefix search on the admin listings (crud.get_admin_user_page)
+# ----------------------------
+Index("ix_lecturers_name_lower", func.lower(Lecturer.full_name).label("name_lower"), postgresql_ops={"name_lower": "text_pattern_ops"})
+Index("ix_students_name_lower", func.lower(Student.full_name).label("name_lower"), postgresql_ops={"name_lower": "text_pattern_ops"})
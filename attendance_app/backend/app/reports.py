@@ -0,0 +1,198 @@
+"""
+reports.py
+Course attendance reports built on a NumPy student x session matrix.
+
+fetch_course_matrix has the database number the course's students and sessions
+in the same statement that returns the attendance rows, so the numbering and
+the rows come from one snapshot; the (student_code, session_code) pairs index
+straight into a boolean matrix. Every statistic in summarize() is a reduction
+over that matrix.
+
+The matrix covers the requesting lecturer's sessions of the course. Its rows are
+the students who attended at least one of them: there is no enrolment data, so a
+student who never marked in is not in the matrix, and turnout rates are shares of
+those attendees, not of a class list.
+"""
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import List
+import uuid
+
+import numpy as np
+from sqlalchemy import select, func
+from sqlalchemy.orm import Session
+
+from app import models
+
+
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def percent(part: np.ndarray, whole: np.ndarray) -> np.ndarray:
+    """Element-wise 100 * part / whole to one decimal, 0 where whole is 0."""
+    out = np.zeros(len(part), dtype=np.float64)
+    np.divide(100 * part, whole, out=out, where=whole > 0)
+    return np.round(out, 1)
+
+
+@dataclass
+class AttendanceMatrix:
+    """present[i, j] is True when student i attended session j. Sessions are in date order."""
+    student_ids: List[uuid.UUID]
+    student_names: List[str]
+    session_ids: List[uuid.UUID]
+    session_dates: np.ndarray  # datetime64[D], one per session
+    present: np.ndarray        # bool, (students, sessions)
+
+    @classmethod
+    def build(cls, students, sessions, codes) -> "AttendanceMatrix":
+        """
+        students: [(id, name)] in row order, sessions: [(id, date)] in column order,
+        codes: [(student_code, session_code)] one per attendance row, indexing those lists.
+        """
+        flat = np.fromiter(chain.from_iterable(codes), dtype=np.int32, count=2 * len(codes))
+        rows, cols = flat[0::2], flat[1::2]
+
+        present = np.zeros((len(students), len(sessions)), dtype=bool)
+        present[rows, cols] = True
+
+        return cls(
+            student_ids=[s[0] for s in students],
+            student_names=[s[1] for s in students],
+            session_ids=[s[0] for s in sessions],
+            session_dates=np.array([s[1] for s in sessions], dtype="datetime64[D]"),
+            present=present,
+        )
+
+    # ----------------------------
+    # Reductions
+    # ----------------------------
+    def attended(self) -> np.ndarray:
+        return self.present.sum(axis=1)
+
+    def turnout(self) -> np.ndarray:
+        return self.present.sum(axis=0)
+
+    def longest_streaks(self) -> np.ndarray:
+        """Longest run of consecutive attended sessions per student."""
+        n_students, n_sessions = self.present.shape
+        padded = np.zeros((n_students, n_sessions + 2), dtype=np.int8)
+        padded[:, 1:-1] = self.present
+        edges = np.diff(padded, axis=1)
+
+        # nonzero() walks row-major, so the k-th start and k-th end belong to the same run
+        run_rows, starts = np.nonzero(edges == 1)
+        _, ends = np.nonzero(edges == -1)
+
+        longest = np.zeros(n_students, dtype=np.int64)
+        np.maximum.at(longest, run_rows, ends - starts)
+        return longest
+
+    def current_streaks(self) -> np.ndarray:
+        """Consecutive attended sessions ending at the most recent one."""
+        missed = ~self.present[:, ::-1]
+        return np.where(missed.any(axis=1), missed.argmax(axis=1), self.present.shape[1])
+
+    def weekdays(self) -> np.ndarray:
+        """Monday=0 weekday of every session (1970-01-01 was a Thursday)."""
+        return (self.session_dates.astype(np.int64) + 3) % 7
+
+    def summarize(self) -> dict:
+        n_students, n_sessions = self.present.shape
+        attended = self.attended()
+        turnout = self.turnout()
+        longest = self.longest_streaks()
+        current = self.current_streaks()
+
+        student_rate = percent(attended, np.full(n_students, n_sessions))
+        session_rate = percent(turnout, np.full(n_sessions, n_students))
+
+        weekday = self.weekdays()
+        weekday_sessions = np.bincount(weekday, minlength=7)
+        weekday_marks = np.bincount(weekday, weights=turnout, minlength=7)
+        weekday_rate = percent(weekday_marks, weekday_sessions * n_students)
+
+        # One '0'/'1' character per session, in session order
+        rows = (self.present.view(np.uint8) + ord("0")).astype(np.uint8)
+        matrix = [row.tobytes().decode("ascii") for row in rows]
+
+        return {
+            "students_count": n_students,
+            "sessions_count": n_sessions,
+            "sessions": [
+                {
+                    "session_id": self.session_ids[j],
+                    "date": self.session_dates[j].item(),
+                    "turnout": int(turnout[j]),
+                    "turnout_rate": float(session_rate[j]),
+                }
+                for j in range(n_sessions)
+            ],
+            "students": [
+                {
+                    "student_id": self.student_ids[i],
+                    "student_name": self.student_names[i],
+                    "attended": int(attended[i]),
+                    "rate": float(student_rate[i]),
+                    "current_streak": int(current[i]),
+                    "longest_streak": int(longest[i]),
+                    "attendance": matrix[i],
+                }
+                for i in range(n_students)
+            ],
+            "weekdays": [
+                {
+                    "weekday": WEEKDAYS[d],
+                    "sessions": int(weekday_sessions[d]),
+                    "turnout_rate": float(weekday_rate[d]),
+                }
+                for d in range(7)
+                if weekday_sessions[d]
+            ],
+        }
+
+
+def fetch_course_matrix(db: Session, school_id: uuid.UUID, lecturer_id: uuid.UUID, course_code: str) -> AttendanceMatrix:
+    """
+    The lecturer's sessions of the course and their attendees, in one statement:
+    a session created or a first mark committed meanwhile cannot renumber the
+    codes between reading them and reading the attendance they index.
+
+    One row per attendance, plus one per session nobody attended (the outer
+    join). dense_rank() numbers sessions by date and students by name; students
+    with NULLs last, so the empty sessions' rows do not take a code on any dialect.
+    """
+    sessions_t = models.AttendanceSession
+    students_t = models.Student
+    rows = db.execute(
+        select(
+            (func.dense_rank().over(order_by=(sessions_t.date, sessions_t.created_at, sessions_t.id)) - 1).label("session_code"),
+            sessions_t.id,
+            sessions_t.date,
+            (func.dense_rank().over(order_by=(students_t.id.is_(None), students_t.full_name, students_t.id)) - 1).label("student_code"),
+            students_t.id,
+            students_t.full_name,
+        )
+        .select_from(sessions_t)
+        .outerjoin(models.Attendance, models.Attendance.session_id == sessions_t.id)
+        .outerjoin(students_t, students_t.id == models.Attendance.student_id)
+        .where(
+            sessions_t.school_id == school_id,
+            sessions_t.lecturer_id == lecturer_id,
+            sessions_t.course_code == course_code
+        )
+    ).all()
+
+    sessions, students, codes = {}, {}, []
+    for session_code, session_id, session_date, student_code, student_id, student_name in rows:
+        sessions[session_code] = (session_id, session_date)
+        if student_id is not None:
+            students[student_code] = (student_id, student_name)
+            codes.append((student_code, session_code))
+
+    return AttendanceMatrix.build(
+        [students[code] for code in range(len(students))],
+        [sessions[code] for code in range(len(sessions))],
+        codes,
+    )
@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
-from app import models
+from typing import Optional, Literal
+from datetime import date
+from app import models, crud, schemas
 from app.database import get_db
 from app.utils.security import get_current_admin
+from app.utils.fast_json import page_response
+from app.routes.attendance import export_response, check_date_range
 import uuid
 import logging
 
@@ -21,46 +25,63 @@ def get_admin_profile(current_admin=Depends(get_current_admin)):
         "email": current_admin.email
     }
 
-@router.get("/students")
+@router.get("/students", response_model=schemas.Page[schemas.AdminUserOut])
 def admin_list_students(
+    school_id: Optional[uuid.UUID] = None,
+    is_active: Optional[bool] = None,
+    q: Optional[str] = Query(None, min_length=2, max_length=100, description="Name or email prefix"),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_admin=Depends(get_current_admin)
 ):
-    students = db.query(models.Student).all()
-
-    # return [
-    #     {
-    #         "id": s.id,
-    #         "full_name": s.full_name,
-    #         "email": s.email,
-    #         "registration_number": s.registration_number,
-    #         "department": s.department,
-    #         "is_active": s.is_active
-    #     }
-    #     for s in students
-    # ]
-    return students
-
-@router.get("/lecturers")
+    students, next_cursor = crud.get_admin_user_page(db, "student", school_id, is_active, q, cursor, limit)
+    return page_response(schemas.AdminUserOut, students, next_cursor)
+
+@router.get("/lecturers", response_model=schemas.Page[schemas.AdminUserOut])
 def admin_list_lecturers(
+    school_id: Optional[uuid.UUID] = None,
+    is_active: Optional[bool] = None,
+    q: Optional[str] = Query(None, min_length=2, max_length=100, description="Name or email prefix"),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_admin=Depends(get_current_admin)
 ):
-    lecturers = db.query(models.Lecturer).all()
-
-    return [
-        {
-            "id": l.id,
-            "full_name": l.full_name,
-            "email": l.email,
-            "course": l.course,
-            "is_active": l.is_active
-        }
-        for l in lecturers
-    ]
+    lecturers, next_cursor = crud.get_admin_user_page(db, "lecturer", school_id, is_active, q, cursor, limit)
+    return page_response(schemas.AdminUserOut, lecturers, next_cursor)
 
 from fastapi import HTTPException
 
+@router.get("/export")
+def admin_export_attendance(
+    school_id: uuid.UUID,
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    lecturer_id: Optional[uuid.UUID] = None,
+    date: Optional[date] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    course_code: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_admin=Depends(get_current_admin)
+):
+    check_date_range(date_from, date_to)
+
+    if not crud.get_school_by_id(db, school_id):
+        raise HTTPException(status_code=404, detail="School not found")
+
+    stmt = crud.attendance_export_statement(
+        school_id=school_id,
+        lecturer_id=lecturer_id,
+        date=date,
+        date_from=date_from,
+        date_to=date_to,
+        course_code=course_code
+    )
+
+    logger.info(f"Admin {current_admin.full_name} exported attendance for school {school_id} ({export_format})")
+    return export_response(db, stmt, export_format, f"attendance-{school_id}")
+
 @router.patch("/deactivate/{role}/{user_id}")
 def admin_deactivate_account(
     role: str,
@@ -68,19 +89,16 @@ def admin_deactivate_account(
     db: Session = Depends(get_db),
     current_admin=Depends(get_current_admin)
 ):
-    if role == "student":
-        user = db.query(models.Student).filter(models.Student.id == uuid.UUID(user_id)).first()
-    elif role == "lecturer":
-        user = db.query(models.Lecturer).filter(models.Lecturer.id == uuid.UUID(user_id)).first()
-    else:
+    if role not in ("student", "lecturer"):
         raise HTTPException(status_code=400, detail="Invalid role")
 
+    # Also evicts the cached principal, so the account is locked out on its next request
+    user = crud.set_account_active(db, role, uuid.UUID(user_id), False)
+
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.is_active = False
     logger.info(f"Admin deactivated {role.capitalize()}: {user.id}")
-    db.commit()
 
     return {"message": f"{role.capitalize()} account deactivated"}
 
@@ -91,19 +109,15 @@ def admin_reactivate_account(
     db: Session = Depends(get_db),
     current_admin=Depends(get_current_admin)
 ):
-    if role == "student":
-        user = db.query(models.Student).filter(models.Student.id == uuid.UUID(user_id)).first()
-    elif role == "lecturer":
-        user = db.query(models.Lecturer).filter(models.Lecturer.id == uuid.UUID(user_id)).first()
-    else:
+    if role not in ("student", "lecturer"):
         raise HTTPException(status_code=400, detail="Invalid role")
 
+    user = crud.set_account_active(db, role, uuid.UUID(user_id), True)
+
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    user.is_active = True
     logger.info(f"Admin reactivated {role.capitalize()}: {user.id}")
-    db.commit()
 
     return {"message": f"{role.capitalize()} account reactivated"}
 
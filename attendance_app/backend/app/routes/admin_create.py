@@ -5,7 +5,8 @@ from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import Admin
 from app.schemas import AdminCreate
-from app.crud import get_password_hash
+from app.crud import get_admin_by_email, get_password_hash
+from app.utils.helpers import normalize_email
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -18,12 +19,12 @@ def bootstrap_admin(
     if x_admin_key != os.getenv("ADMIN_BOOTSTRAP_KEY"):
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    if db.query(Admin).filter(Admin.email == admin.email).first():
+    if get_admin_by_email(db, admin.email):
         raise HTTPException(status_code=400, detail="Admin already exists")
 
     new_admin = Admin(
         full_name=admin.full_name,
-        email=admin.email,
+        email=normalize_email(admin.email),
         hashed_password=get_password_hash(admin.password),
         is_active=True
     )
@@ -3,18 +3,26 @@ Attendance Routes.
 Handles marking and viewing of attendance records.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
-from typing import List
-from app.database import get_db
-from app import crud, schemas, models
+from typing import List, Literal
+from app.database import get_db, get_async_db
+from app.config import settings
+from app import crud, crud_async, schemas, models
 from app.utils import security
+from app.utils.helpers import EXPORT_FORMATS
+from app.utils.fast_json import page_response
+from app.core.session_registry import active_sessions
 from typing import Optional
 import uuid
 import logging
 
 logger = logging.getLogger(__name__)
+# One record per mark: the logger to sample (LOG_SAMPLE_RATES) during marking bursts
+mark_logger = logging.getLogger(f"{__name__}.marks")
 
 router = APIRouter(prefix="/attendance", tags=["Attendance"])
 
@@ -22,7 +30,29 @@ router = APIRouter(prefix="/attendance", tags=["Attendance"])
 # ======================================================
 # Mark Attendance (Student)
 # ======================================================
-@router.post("/mark", response_model=schemas.AttendanceOut)
+def _raise_not_marked(session):
+    """Explain why the mark insert wrote nothing. session is None when it does not exist."""
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Attendance session not found"
+        )
+
+    if not session.is_active or session.date < date.today():
+        raise HTTPException(
+            status_code=400,
+            detail="This attendance session is closed or expired"
+        )
+
+    active_sessions.add(session)
+
+    # Session is open, so the insert hit the (student_id, session_id) unique index
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Attendance already marked for this session"
+    )
+
+
 def mark_attendance(
     attendance_data: schemas.AttendanceMarkCreate,
     db: Session = Depends(get_db),
@@ -31,81 +61,177 @@ def mark_attendance(
     """
     Allows a student to mark attendance for a specific session.
     Prevents duplicate attendance per session.
+
+    The happy path is a single INSERT statement (see crud.mark_attendance). Sessions
+    found in the active-session registry are known to be open, otherwise the insert
+    validates the session itself; it is only looked up again to explain why nothing
+    was inserted.
     """
 
-    # Get the session
-    session = crud.get_attendance_session_by_id(
+    open_session = active_sessions.get_by_id(attendance_data.session_id, current_user.school_id)
+
+    new_attendance = crud.mark_attendance(
         db=db,
+        student_id=current_user.id,
+        student_name=current_user.full_name,
         session_id=attendance_data.session_id,
-        school_id=current_user.school_id
+        school_id=current_user.school_id,
+        status="present",
+        open_session=open_session
     )
 
-    if not session:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Attendance session not found"
-        )
-    
-    # After fetching session
-    if not session.is_active or session.date < date.today():
-        raise HTTPException(
-            status_code=400,
-            detail="This attendance session is closed or expired"
-        )
+    if new_attendance is None:
+        _raise_not_marked(open_session or crud.get_attendance_session_by_id(
+            db=db,
+            session_id=attendance_data.session_id,
+            school_id=current_user.school_id
+        ))
 
+    mark_logger.info(f"Student {current_user.full_name} marked attendance. Course: {new_attendance['course_title']}, Lecturer: {new_attendance['lecturer_name']}")
+    return new_attendance
 
-    #Prevent duplicate attendance for this session
-    existing = crud.get_attendance_by_student_and_session(
-        db=db,
-        student_id=current_user.id,
-        session_id=session.id,
-        school_id=current_user.school_id
-    )
 
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Attendance already marked for this session"
-        )
-    
-    # Create attendance with course snapshot
-    new_attendance = crud.create_attendance(
+async def mark_attendance_async(
+    attendance_data: schemas.AttendanceMarkCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.Student = Depends(security.get_current_student_async),
+):
+    """mark_attendance served through AsyncSession (settings.DB_ASYNC)."""
+
+    open_session = active_sessions.get_by_id(attendance_data.session_id, current_user.school_id)
+
+    new_attendance = await crud_async.mark_attendance(
         db=db,
         student_id=current_user.id,
         student_name=current_user.full_name,
-        lecturer_id=session.lecturer_id,
-        lecturer_name=session.lecturer_name,
-        session_id=session.id,
-        course_code=session.course_code,
-        course_title=session.course_title,
-        date=session.date,
+        session_id=attendance_data.session_id,
         school_id=current_user.school_id,
-        status="present"
+        status="present",
+        open_session=open_session
     )
 
-    logger.info(f"Student {current_user.full_name} marked attendance. Course: {session.course_title}, Lecturer: {session.lecturer_name}")
+    if new_attendance is None:
+        _raise_not_marked(open_session or await crud_async.get_attendance_session_by_id(
+            db=db,
+            session_id=attendance_data.session_id,
+            school_id=current_user.school_id
+        ))
+
+    mark_logger.info(f"Student {current_user.full_name} marked attendance. Course: {new_attendance['course_title']}, Lecturer: {new_attendance['lecturer_name']}")
     return new_attendance
 
 
+router.add_api_route(
+    "/mark",
+    mark_attendance_async if settings.DB_ASYNC else mark_attendance,
+    methods=["POST"],
+    response_model=schemas.AttendanceOut,
+    name="mark_attendance"
+)
+
+
 
 # ======================================================
 # View Attendance (Lecturer)
 # ======================================================
-@router.get("/records", response_model=List[schemas.AttendanceOut])
 def view_attendance_records(
     date: Optional[date] = None,
     course_code: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_user: models.Lecturer = Depends(security.get_current_lecturer)
 ):
-    return crud.get_attendance_for_lecturer(
+    records, next_cursor = crud.get_attendance_for_lecturer_page(
         db=db,
         lecturer_id=current_user.id,
         school_id=current_user.school_id,
         date=date,
+        course_code=course_code,
+        cursor=cursor,
+        limit=limit
+    )
+    return page_response(schemas.AttendanceOut, records, next_cursor)
+
+
+async def view_attendance_records_async(
+    date: Optional[date] = None,
+    course_code: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: models.Lecturer = Depends(security.get_current_lecturer_async)
+):
+    records, next_cursor = await crud_async.get_attendance_for_lecturer_page(
+        db=db,
+        lecturer_id=current_user.id,
+        school_id=current_user.school_id,
+        date=date,
+        course_code=course_code,
+        cursor=cursor,
+        limit=limit
+    )
+    return page_response(schemas.AttendanceOut, records, next_cursor)
+
+
+router.add_api_route(
+    "/records",
+    view_attendance_records_async if settings.DB_ASYNC else view_attendance_records,
+    methods=["GET"],
+    response_model=schemas.Page[schemas.AttendanceOut],
+    name="view_attendance_records"
+)
+
+
+
+
+# ======================================================
+# Export Attendance (Lecturer)
+# ======================================================
+def export_response(db: Session, stmt, export_format: str, filename: str) -> StreamingResponse:
+    """Stream an attendance_export_statement as CSV or NDJSON. Also used by /admin/export."""
+    encode, media_type = EXPORT_FORMATS[export_format]
+    rows = crud.stream_rows(db, stmt)
+    return StreamingResponse(
+        encode(crud.ATTENDANCE_EXPORT_HEADERS, rows),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'}
+    )
+
+
+def check_date_range(date_from: Optional[date], date_to: Optional[date]):
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+
+
+@router.get("/export")
+def export_attendance(
+    export_format: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    date: Optional[date] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    course_code: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: models.Lecturer = Depends(security.get_current_lecturer)
+):
+    """
+    Stream the lecturer's attendance records. Rows are read from a server-side
+    cursor as the client consumes them, so exports of any size start immediately.
+    """
+    check_date_range(date_from, date_to)
+
+    stmt = crud.attendance_export_statement(
+        school_id=current_user.school_id,
+        lecturer_id=current_user.id,
+        date=date,
+        date_from=date_from,
+        date_to=date_to,
         course_code=course_code
     )
 
+    logger.info(f"Lecturer {current_user.full_name} exported attendance ({export_format})")
+    return export_response(db, stmt, export_format, "attendance")
+
 
 
 
@@ -114,7 +240,7 @@ def view_attendance_records(
 # ======================================================
 @router.delete("/{attendance_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_attendance_record(
-    attendance_id: str,
+    attendance_id: uuid.UUID,
     db: Session = Depends(get_db),
     current_user: models.Lecturer = Depends(security.get_current_lecturer)
 ):
@@ -123,7 +249,7 @@ def delete_attendance_record(
     Only deletes if the record belongs to the logged-in lecturer.
     """
 
-    attendance = crud.get_attendance_by_id(db, uuid.UUID(attendance_id), current_user.school_id)
+    attendance = crud.get_attendance_by_id(db, attendance_id, current_user.school_id)
 
     if not attendance:
         raise HTTPException(status_code=404, detail="Attendance not found")
@@ -153,17 +279,22 @@ def check_attendance_status(
         "marked": attendance is not None
     }
 
-@router.get("/me", response_model=List[schemas.AttendanceOut])
+@router.get("/me", response_model=schemas.Page[schemas.AttendanceOut])
 def view_my_attendance(
     date: Optional[date] = None,
     course_code: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_student: models.Student = Depends(security.get_current_student)
 ):
-    return crud.get_attendance_by_student_with_filter(
+    records, next_cursor = crud.get_attendance_for_student_page(
         db=db,
         school_id=current_student.school_id,
         student_id=current_student.id,
         date_value=date,
-        course_code=course_code
+        course_code=course_code,
+        cursor=cursor,
+        limit=limit
     )
+    return page_response(schemas.AttendanceOut, records, next_cursor)
@@ -9,8 +9,9 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from fastapi.security import OAuth2PasswordRequestForm
 from datetime import timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
 from app import crud, schemas, models
-from app.database import get_db
+from app.database import get_db, get_async_db
 from app.utils import security
 from app.config import settings
 from typing import List
@@ -46,73 +47,48 @@ def register_student(student: schemas.StudentCreate, db: Session = Depends(get_d
 
 
 # Lecturer login (separate route)
-@router.post("/login/lecturer", response_model=schemas.Token)
 def login_lecturer(payload: schemas.LecturerLogin, db: Session = Depends(get_db)):
     """
     Lecturer login endpoint.
     Accepts JSON: { email, password }
     """
-    try:
-        lecturer = db.query(models.Lecturer).filter(
-            models.Lecturer.email == payload.email
-            ).first()
-        school = db.query(models.School).filter(
-            models.School.id == lecturer.school_id
-        ).first()
-        user = crud.authenticate_lecturer(db, payload.email, payload.password, school.id)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email, password, or non-existing account")
-
-        #create JWT token
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = security.create_access_token(
-            data={"email": user.email, "role": "lecturer", "user_id": str(user.id), "school_id": str(user.school_id)},
-            expires_delta=access_token_expires
-        )
-    except AttributeError:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
-
-    return {
-    "access_token": access_token,
-    "token_type": "bearer",
-    "user_id": user.id,
-    "school_id": user.school_id,
-    "role": "lecturer",
-    "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60}
-
+    return security.login_lecturer(db, payload.email, payload.password)
 
 
 # Student login (separate route)
-@router.post("/login/student", response_model=schemas.Token)
 def login_student(payload: schemas.StudentLogin, db: Session = Depends(get_db)):
     """
     Student login endpoint.
     Accepts JSON: { email, password }
     """
-    try:
-        student = db.query(models.Student).filter(
-            models.Student.email == payload.email
-            ).first()
-        school = db.query(models.School).filter(
-            models.School.id == student.school_id
-        ).first()
-        user = crud.authenticate_student(db, payload.email, payload.password, school.id)
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email, password or non-existing account")
-
-        #create JWT token
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        access_token = security.create_access_token(
-            data={"email": user.email, "role": "student", "user_id": str(user.id), "school_id": str(user.school_id)},
-            expires_delta=access_token_expires
-        )
-    except AttributeError:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
-
-    return {
-    "access_token": access_token,
-    "token_type": "bearer",
-    "user_id": user.id,
-    "school_id": user.school_id,
-    "role": "student"
-}
+    return security.login_student(db, payload.email, payload.password)
+
+
+# ------------------------------------
+# AsyncSession logins (settings.DB_ASYNC)
+# ------------------------------------
+async def login_lecturer_async(payload: schemas.LecturerLogin, db: AsyncSession = Depends(get_async_db)):
+    """login_lecturer served through AsyncSession."""
+    return await security.login_async(db, "lecturer", payload.email, payload.password)
+
+
+async def login_student_async(payload: schemas.StudentLogin, db: AsyncSession = Depends(get_async_db)):
+    """login_student served through AsyncSession."""
+    return await security.login_async(db, "student", payload.email, payload.password)
+
+
+router.add_api_route(
+    "/login/lecturer",
+    login_lecturer_async if settings.DB_ASYNC else login_lecturer,
+    methods=["POST"],
+    response_model=schemas.Token,
+    name="login_lecturer"
+)
+
+router.add_api_route(
+    "/login/student",
+    login_student_async if settings.DB_ASYNC else login_student,
+    methods=["POST"],
+    response_model=schemas.Token,
+    name="login_student"
+)
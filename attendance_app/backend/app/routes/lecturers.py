@@ -5,15 +5,23 @@ lecturers.py\n
 Routes for lecturer dashboard, profile, and class attendance management.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from datetime import datetime
-from typing import List
-from app import schemas, crud, models
-from app.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from collections import Counter
+from typing import List, Literal, Optional
+from app import schemas, crud, crud_async, models
+from app.config import settings
+from app.database import get_db, get_async_db, SessionLocal
 from app.utils import security
+from app.utils.fast_json import page_response, rows_to_dicts
 from fastapi import UploadFile, File
 from app.utils.storage import upload_profile_image
+from app.core.live_feed import live_feed, LAGGED
+import asyncio
+import orjson
 import uuid
 import logging
 
@@ -27,10 +35,7 @@ router = APIRouter(
 # -------------------------
 # Get logged-in lecturer profile
 # -------------------------
-@router.get("/me", response_model=schemas.LecturerOut)
-def get_my_profile(db: Session = Depends(get_db), current_lecturer: models.Lecturer =Depends(security.get_current_lecturer)):
-    school = crud.get_school_by_id(db, current_lecturer.school_id)
-
+def _profile(current_lecturer, school):
     return {
         "id": current_lecturer.id,
         "full_name": current_lecturer.full_name,
@@ -40,6 +45,26 @@ def get_my_profile(db: Session = Depends(get_db), current_lecturer: models.Lectu
         "school_name": school.name,
         "school_id": current_lecturer.school_id
     }
+
+
+def get_my_profile(db: Session = Depends(get_db), current_lecturer: models.Lecturer =Depends(security.get_current_lecturer)):
+    school = crud.get_school_by_id(db, current_lecturer.school_id)
+    return _profile(current_lecturer, school)
+
+
+async def get_my_profile_async(db: AsyncSession = Depends(get_async_db), current_lecturer: models.Lecturer = Depends(security.get_current_lecturer_async)):
+    school = await crud_async.get_school_by_id(db, current_lecturer.school_id)
+    return _profile(current_lecturer, school)
+
+
+router.add_api_route(
+    "/me",
+    get_my_profile_async if settings.DB_ASYNC else get_my_profile,
+    methods=["GET"],
+    response_model=schemas.LecturerOut,
+    name="get_my_profile"
+)
+
 # -------------------------
 # Update lecturer profile
 # -------------------------
@@ -84,24 +109,19 @@ def change_lecturer_password(
 
 
 # upload profile image
-@router.post("/profile/image")
+@router.post("/profile/image", status_code=202)
 def upload_profile_image_lecturer(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
     current_lecturer=Depends(security.get_current_lecturer)
 ):
     if file.content_type not in ["image/jpeg", "image/png"]:
         raise HTTPException(status_code=400, detail="Invalid image type")
 
-    image_url = upload_profile_image(file, current_lecturer.id)
+    # Stored by the upload queue; the profile points at the URL once the object exists
+    result = upload_profile_image(file, "lecturer", current_lecturer.id, current_lecturer.profile_image)
+    logger.info(f"Lecturer {current_lecturer.full_name} uploaded profile image {result['profile_image']} ({result['status']})")
 
-    current_lecturer.profile_image = image_url
-    logger.info(f"Lecturer {current_lecturer.full_name} uploaded profile image {image_url}")
-    db.commit()
-
-    return {
-        "profile_image": image_url
-    }
+    return result
 
 # deactivate lecturer account
 @router.delete("/deactivate")
@@ -109,34 +129,83 @@ def deactivate_lecturer(
     db: Session = Depends(get_db),
     current_lecturer=Depends(security.get_current_lecturer)
 ):
-    current_lecturer.is_active = False
+    crud.set_account_active(db, "lecturer", current_lecturer.id, False)
 
     logger.info(f'Lecturer {current_lecturer.full_name} account deactivated')
-    db.commit()
     return {"detail": "Account deactivated successfully"}
 
 # -------------------------
 # View all students
 # -------------------------
-@router.get("/students", response_model=List[schemas.StudentOut])
+@router.get("/students", response_model=schemas.Page[schemas.StudentOut])
 def get_all_students(
+    image: Literal["thumb", "medium", "full"] = Query("thumb", description="profile_image size: 64 px, 256 px or full"),
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_lecturer: models.Lecturer = Depends(security.get_current_lecturer)
 ):
-    students = crud.get_all_students(db, current_lecturer.school_id)
-    return students
+    students, next_cursor = crud.get_students_page(db, current_lecturer.school_id, cursor, limit, image)
+    return page_response(schemas.StudentOut, students, next_cursor)
 
 
 # -------------------------
 # View all attendance records
 # -------------------------
-@router.get("/me/attendance", response_model=List[schemas.AttendanceOut])
+@router.get("/me/attendance", response_model=schemas.Page[schemas.AttendanceOut])
 def get_all_attendance_records(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_user: models.Lecturer = Depends(security.get_current_lecturer)
 ):
-    records = crud.get_attendance_for_lecturer(db, current_user.id, current_user.school_id)
-    return records
+    records, next_cursor = crud.get_attendance_for_lecturer_page(
+        db, current_user.id, current_user.school_id, cursor=cursor, limit=limit
+    )
+    return page_response(schemas.AttendanceOut, records, next_cursor)
+
+
+# -------------------------------------------------------
+# Attendance percentage per student for a course
+# -------------------------------------------------------
+@router.get("/courses/{course_code}/summary", response_model=List[schemas.CourseStudentSummary])
+def get_course_attendance_summary(
+    course_code: str,
+    db: Session = Depends(get_db),
+    current_lecturer: models.Lecturer = Depends(security.get_current_lecturer)
+):
+    """
+    Reads attendance_rollups: one row per student who has attended the course, plus
+    the lecturer's registered students who never have. 404 unless the lecturer has
+    held a session of the course.
+    """
+    summary = crud.get_course_summary(db, current_lecturer.school_id, current_lecturer.id, course_code)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="No sessions found for this course")
+    return summary
+
+
+# -------------------------------------------------------
+# Student x session attendance matrix for a course
+# -------------------------------------------------------
+@router.get("/courses/{course_code}/matrix", response_model=schemas.CourseMatrixOut)
+def get_course_attendance_matrix(
+    course_code: str,
+    db: Session = Depends(get_db),
+    current_lecturer: models.Lecturer = Depends(security.get_current_lecturer)
+):
+    """
+    The lecturer's own sessions of the course; rows are the students who attended
+    at least one of them (see app/reports.py).
+    """
+    # Imported here: app.reports pulls in NumPy, which only this route needs (cold start)
+    from app import reports
+
+    matrix = reports.fetch_course_matrix(db, current_lecturer.school_id, current_lecturer.id, course_code)
+    if not matrix.session_ids:
+        raise HTTPException(status_code=404, detail="No sessions found for this course")
+
+    return {"course_code": course_code, **matrix.summarize()}
 
 
 # -------------------------------------------------------
@@ -155,17 +224,15 @@ def create_attendance_session(
     logger.info(f"Lecturer {current_lecturer.full_name} created attendance session")
     return session
 
-@router.get("/me/sessions")
+@router.get("/me/sessions", response_model=schemas.Page[schemas.AttendanceSessionOut])
 def get_my_sessions(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db),
     current_lecturer: models.Lecturer = Depends(security.get_current_lecturer),
 ):
-    return (
-        db.query(models.AttendanceSession)
-        .filter(models.AttendanceSession.lecturer_id == current_lecturer.id)
-        .order_by(models.AttendanceSession.created_at.desc())
-        .all()
-    )
+    sessions, next_cursor = crud.get_sessions_for_lecturer_page(db, current_lecturer.id, cursor, limit)
+    return page_response(schemas.AttendanceSessionOut, sessions, next_cursor)
 
 # Close session
 @router.post("/sessions/{session_id}/close")
@@ -182,9 +249,100 @@ def close_session(
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    session.is_active = False
-    session.closed_at = datetime.utcnow()
+    crud.close_attendance_session(db, session)
     logger.info(f"Lecturer {current_lecturer.full_name} closed attendance session: {session_id}")
 
-    db.commit()
     return {"message": "Session closed successfully"}
+
+
+# -------------------------------------------------------
+# Live attendance of a session (Server-Sent Events)
+# -------------------------------------------------------
+def _session_snapshot(session_id: uuid.UUID, lecturer):
+    """The lecturer's session and its marks so far; (None, []) when it is not theirs."""
+    # Own short-lived Session: a get_db one would keep its connection for the whole stream
+    db = SessionLocal()
+    try:
+        session = db.query(models.AttendanceSession).filter(
+            models.AttendanceSession.id == session_id,
+            models.AttendanceSession.lecturer_id == lecturer.id
+        ).first()
+        if session is None:
+            return None, []
+        records = rows_to_dicts(schemas.AttendanceOut, crud.get_attendance_for_session(db, session_id, session.school_id))
+        return schemas.AttendanceSessionOut.model_validate(session).model_dump(), records
+    finally:
+        db.close()
+
+
+def _sse(event: str, payload: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(payload) + b"\n\n"
+
+
+async def _session_events(subscription, session: dict, records: list):
+    # id -> status of the marks counted so far. Marks committed between subscribing
+    # and the snapshot arrive twice and are skipped.
+    marked = {str(record["id"]): record["status"] for record in records}
+
+    def counts():
+        return {"marked": len(marked), "by_status": dict(Counter(marked.values()))}
+
+    try:
+        yield _sse("snapshot", {"session": session, "records": records, "counts": counts()})
+        if not session["is_active"]:
+            yield _sse("closed", {"counts": counts()})
+            return
+
+        while True:
+            try:
+                item = await asyncio.wait_for(subscription.get(), settings.LIVE_FEED_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                # Keeps proxies from timing the stream out
+                yield b": keep-alive\n\n"
+                continue
+            if item is LAGGED:
+                return  # the client reconnects and starts from a new snapshot
+
+            kind, data = item
+            payload = orjson.loads(data)
+            if kind == "mark" and payload["id"] not in marked:
+                marked[payload["id"]] = payload["status"]
+                yield _sse("mark", {"record": payload, "counts": counts()})
+            elif kind == "unmark" and payload["id"] in marked:
+                del marked[payload["id"]]
+                yield _sse("unmark", {"id": payload["id"], "counts": counts()})
+            elif kind == "closed":
+                yield _sse("closed", {"counts": counts()})
+                return
+    finally:
+        live_feed.unsubscribe(subscription)
+
+
+@router.get("/sessions/{session_id}/stream")
+async def stream_session_attendance(
+    session_id: uuid.UUID,
+    # No get_db anywhere in the chain: nothing may hold a connection while the stream is open
+    current_lecturer: models.Lecturer = Depends(security.get_current_lecturer_for_stream),
+):
+    """
+    Live marks of one of the lecturer's sessions as Server-Sent Events:
+    "snapshot" (the session, its marks so far and the counts) first, then "mark"
+    and "unmark" with the running counts as they commit, and "closed" at the end.
+    """
+    # Subscribe before reading the snapshot, so no mark falls between the two
+    subscription = live_feed.subscribe(session_id)
+    try:
+        session, records = await run_in_threadpool(_session_snapshot, session_id, current_lecturer)
+    except BaseException:
+        live_feed.unsubscribe(subscription)
+        raise
+
+    if session is None:
+        live_feed.unsubscribe(subscription)
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    return StreamingResponse(
+        _session_events(subscription, session, records),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
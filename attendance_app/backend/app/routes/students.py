@@ -5,15 +5,20 @@ students.py
 Routes for student dashboard, profile, and attendance records.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import date
-from typing import List
-from app import schemas, crud, models
-from app.database import get_db
+from typing import List, Optional
+from app import schemas, crud, crud_async, models
+from app.config import settings
+from app.database import get_db, get_async_db
 from app.utils import security
+from app.utils.fast_json import page_response
 from fastapi import UploadFile, File
 from app.utils.storage import upload_profile_image
+from app.core.session_registry import active_sessions
+from app.core import session_codes
 import logging
 
 logger = logging.getLogger(__name__)
@@ -26,10 +31,7 @@ router = APIRouter(
 # -------------------------
 # Get logged-in student profile
 # -------------------------
-@router.get("/me", response_model=schemas.StudentOut)
-def get_my_profile(db: Session = Depends(get_db), current_student: models.Student = Depends(security.get_current_student)):
-    school = crud.get_school_by_id(db, current_student.school_id)
-    
+def _profile(current_student, school):
     return {
         "id": current_student.id,
         "full_name": current_student.full_name,
@@ -41,6 +43,25 @@ def get_my_profile(db: Session = Depends(get_db), current_student: models.Studen
         "school_id": current_student.school_id
     }
 
+
+def get_my_profile(db: Session = Depends(get_db), current_student: models.Student = Depends(security.get_current_student)):
+    school = crud.get_school_by_id(db, current_student.school_id)
+    return _profile(current_student, school)
+
+
+async def get_my_profile_async(db: AsyncSession = Depends(get_async_db), current_student: models.Student = Depends(security.get_current_student_async)):
+    school = await crud_async.get_school_by_id(db, current_student.school_id)
+    return _profile(current_student, school)
+
+
+router.add_api_route(
+    "/me",
+    get_my_profile_async if settings.DB_ASYNC else get_my_profile,
+    methods=["GET"],
+    response_model=schemas.StudentOut,
+    name="get_my_profile"
+)
+
 # -------------------------
 # Update profile
 # -------------------------
@@ -83,25 +104,20 @@ def change_student_password(
     return {"message": "Password updated successfully"}
 
 # update profile image
-@router.post("/profile/image")
+@router.post("/profile/image", status_code=202)
 def upload_profile_image_student(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db),
     current_student=Depends(security.get_current_student)
 ):
     if file.content_type not in ["image/jpeg", "image/png"]:
         raise HTTPException(status_code=400, detail="Invalid image type")
 
-    image_url = upload_profile_image(file, current_student.id)
+    # Stored by the upload queue; the profile points at the URL once the object exists
+    result = upload_profile_image(file, "student", current_student.id, current_student.profile_image)
 
-    current_student.profile_image = image_url
+    logger.info(f"Student: {current_student.full_name} uploaded profile image {result['profile_image']} ({result['status']})")
 
-    logger.info(f"Student: {current_student.full_name} uploaded profile image {image_url}")
-    db.commit()
-
-    return {
-        "profile_image": image_url
-    }
+    return result
 
 # deactivate student account
 @router.delete("/deactivate")
@@ -109,31 +125,37 @@ def deactivate_student(
     db: Session = Depends(get_db),
     current_student=Depends(security.get_current_student)
 ):
-    current_student.is_active = False
+    crud.set_account_active(db, "student", current_student.id, False)
     logger.info(f"Student: {current_student.full_name} account deactivated")
-    db.commit()
     return {"detail": "Account deactivated successfully"}
 
 # -------------------------
 # Get my attendance records
 # -------------------------
-@router.get("/me/attendance", response_model=List[schemas.MyAttendanceOut])
+@router.get("/me/attendance", response_model=schemas.Page[schemas.MyAttendanceOut])
 def get_my_attendance_records(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: models.Student = Depends(security.get_current_student)
+):
+    records, next_cursor = crud.get_attendance_for_student_page(
+        db, current_user.id, current_user.school_id, cursor=cursor, limit=limit,
+        schema=schemas.MyAttendanceOut
+    )
+    return page_response(schemas.MyAttendanceOut, records, next_cursor)
+
+
+# -------------------------------------------------------
+# Attendance percentage per course
+# -------------------------------------------------------
+@router.get("/me/summary", response_model=List[schemas.StudentCourseSummary])
+def get_my_attendance_summary(
     db: Session = Depends(get_db),
     current_user: models.Student = Depends(security.get_current_student)
 ):
-    records = crud.get_attendance_by_student(db, current_user.id, current_user.school_id)
-    output = []
-    for rec in records:
-        output.append({
-            "id": rec.id,
-            "date": rec.date,
-            "status": rec.status,
-            "course_title": rec.course_title,
-            "course_code": rec.course_code,
-            "lecturer_name": rec.lecturer_name
-        })
-    return output
+    """Reads attendance_rollups only: one row per course the student has attended."""
+    return crud.get_student_summary(db, current_user.id, current_user.school_id)
 
 
 # -------------------------------------------------------
@@ -147,6 +169,11 @@ def verify_session_code(
 ):
     """Student enters the generated attendance code to access session"""
 
+    session_code = session_codes.normalize(session_code)
+    session = active_sessions.get_by_code(session_code, current_student.school_id)
+    if session:
+        return session
+
     session = crud.get_session_by_code(db, session_code, current_student.school_id)
 
     if not session:
@@ -155,4 +182,6 @@ def verify_session_code(
     if not session.is_active or session.date < date.today():
         raise HTTPException(status_code=400, detail="Session is expired")
 
+    # Open session another worker created: serve the rest of the class from memory
+    active_sessions.add(session)
     return session
\ No newline at end of file
@@ -5,7 +5,7 @@ Used for request validation and response serialization.
 """
 
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional, List
+from typing import Optional, List, Generic, TypeVar
 from datetime import date, datetime
 import uuid
 
@@ -15,6 +15,15 @@ class AdminCreate(BaseModel):
     email: EmailStr
     password: str = Field(..., min_length=6)
 
+class AdminUserOut(BaseModel):
+    """A row of the admin student / lecturer listings: only what admin.html shows."""
+    id: uuid.UUID
+    full_name: str
+    email: EmailStr
+    is_active: Optional[bool] = None
+
+    model_config = {"from_attributes": True}
+
 # --------------------------
 # Shared by both roles
 # --------------------------
@@ -126,6 +135,7 @@ class Token(BaseModel):
     user_id: uuid.UUID
     role: str 
     school_id: uuid.UUID
+    expires_in: Optional[int] = None
 
 
 class TokenData(BaseModel):
@@ -178,6 +188,68 @@ class AttendanceOut(BaseModel):
 
     model_config = {"from_attributes": True}
 
+# ----------------------------
+# ATTENDANCE SUMMARY SCHEMAS (attendance_rollups)
+# ----------------------------
+class StudentCourseSummary(BaseModel):
+    course_code: str
+    course_title: str
+    attended: int
+    total_sessions: int
+    percentage: Optional[float] = None
+
+    model_config = {"from_attributes": True}
+
+class CourseStudentSummary(BaseModel):
+    student_id: uuid.UUID
+    student_name: str
+    attended: int
+    total_sessions: int
+    percentage: Optional[float] = None
+
+    model_config = {"from_attributes": True}
+
+# ----------------------------
+# COURSE MATRIX SCHEMAS (app/reports.py)
+# ----------------------------
+class MatrixSession(BaseModel):
+    session_id: uuid.UUID
+    date: date
+    turnout: int
+    turnout_rate: float  # share of CourseMatrixOut.students (the course's attendees), in percent
+
+class MatrixStudent(BaseModel):
+    student_id: uuid.UUID
+    student_name: str
+    attended: int
+    rate: float
+    current_streak: int
+    longest_streak: int
+    attendance: str  # '1' attended / '0' missed, one character per entry of CourseMatrixOut.sessions
+
+class WeekdayTurnout(BaseModel):
+    weekday: str
+    sessions: int
+    turnout_rate: float
+
+class CourseMatrixOut(BaseModel):
+    course_code: str
+    students_count: int
+    sessions_count: int
+    sessions: List[MatrixSession]
+    students: List[MatrixStudent]
+    weekdays: List[WeekdayTurnout]
+
+# ----------------------------
+# PAGINATION
+# ----------------------------
+T = TypeVar("T")
+
+class Page(BaseModel, Generic[T]):
+    """One keyset page. Pass next_cursor back as ?cursor= for the next one; null on the last page."""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
 class SchoolCreate(BaseModel):
     name: str
 
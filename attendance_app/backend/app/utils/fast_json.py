@@ -0,0 +1,43 @@
+"""
+fast_json.py
+Fast response path for large list endpoints.
+
+The rows come from column-only selects (crud.schema_columns) whose columns are
+exactly the response schema's fields, so they are already the right shape and
+types. page_response zips them into dicts and encodes them with orjson. It
+returns a Response, so FastAPI skips validating every row against the
+response_model again. Routes keep their response_model, and the OpenAPI
+schema is unchanged.
+
+settings.FAST_LIST_RESPONSES = False returns plain dicts instead, which FastAPI
+validates as before.
+"""
+
+from typing import Iterable, Optional, Sequence
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from app.config import settings
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
+
+def rows_to_dicts(schema: type[BaseModel], rows: Iterable[Sequence]) -> list:
+    """Rows whose leading columns follow schema's field order; extra trailing columns are dropped."""
+    fields = tuple(schema.model_fields)
+    return [dict(zip(fields, row)) for row in rows]
+
+
+def page_response(schema: type[BaseModel], rows: Iterable[Sequence], next_cursor: Optional[str]):
+    """A schemas.Page[schema] body built from column tuples."""
+    content = {"items": rows_to_dicts(schema, rows), "next_cursor": next_cursor}
+    if settings.FAST_LIST_RESPONSES:
+        return FastJSONResponse(content)
+    return content
@@ -6,17 +6,21 @@ Miscellaneous helper utilities for Smart Attendance System.
 This module contains:
 - File helpers
 - Date / time helpers
-- CSV export helpers
+- CSV / NDJSON export helpers
 - Safe string utilities
 
 No database or authentication logic should live here.
 """
 
 import os
+import io
 import csv
+import json
 import uuid
+import base64
+import time
 from datetime import datetime, date
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, Iterator, Sequence
 
 
 # ==============================
@@ -66,7 +70,7 @@ def format_date(value: date | datetime) -> str:
 
 
 # ==============================
-# CSV EXPORT HELPERS
+# CSV / NDJSON EXPORT HELPERS
 # ==============================
 
 def export_to_csv(
@@ -93,6 +97,77 @@ def export_to_csv(
     return filepath
 
 
+def _export_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    return value
+
+
+def _chunks(lines: Iterable[str], chunk_rows: int, flush_seconds: float) -> Iterator[str]:
+    """
+    Join lines into response chunks. The first line goes out on its own; after
+    that a chunk is sent every chunk_rows lines, or sooner once flush_seconds
+    have passed since the last one, so a slow query still trickles rows out.
+    """
+    chunk: List[str] = []
+    flushed = None
+    for line in lines:
+        chunk.append(line)
+        now = time.monotonic()
+        if flushed is None or len(chunk) >= chunk_rows or now - flushed >= flush_seconds:
+            yield "".join(chunk)
+            chunk = []
+            flushed = now
+
+    if chunk:
+        yield "".join(chunk)
+
+
+def iter_csv(
+    headers: Sequence[str], rows: Iterable[Sequence[Any]], chunk_rows: int = 500, flush_seconds: float = 1.0
+) -> Iterator[str]:
+    """
+    Stream rows (tuples in header order) as CSV text.
+
+    The header goes out on its own so the client sees the first byte before the
+    first row is fetched; rows follow as _chunks.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def line(values) -> str:
+        writer.writerow(values)
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return text
+
+    yield line(headers)
+    yield from _chunks(
+        (line([_export_value(v) for v in row]) for row in rows), chunk_rows, flush_seconds
+    )
+
+
+def iter_ndjson(
+    headers: Sequence[str], rows: Iterable[Sequence[Any]], chunk_rows: int = 500, flush_seconds: float = 1.0
+) -> Iterator[str]:
+    """
+    Stream rows (tuples in header order) as newline-delimited JSON objects, in _chunks.
+    """
+    yield from _chunks(
+        (json.dumps({h: _export_value(v) for h, v in zip(headers, row)}) + "\n" for row in rows),
+        chunk_rows, flush_seconds
+    )
+
+
+EXPORT_FORMATS = {
+    "csv": (iter_csv, "text/csv"),
+    "ndjson": (iter_ndjson, "application/x-ndjson"),
+}
+
+
 # ==============================
 # STRING & DATA HELPERS
 # ==============================
@@ -102,6 +177,15 @@ def normalize_email(email: str) -> str:
     return email.strip().lower()
 
 
+def like_prefix(value: str) -> str:
+    """
+    LIKE pattern matching strings that start with value. Wildcards in value are
+    escaped with a backslash, so use it with escape="\\".
+    """
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
 def safe_str(value: Any) -> str:
     """
     Convert value to string safely.
@@ -111,9 +195,29 @@ def safe_str(value: Any) -> str:
 
 
 # ==============================
-# PAGINATION HELPER (OPTIONAL)
+# PAGINATION HELPERS
 # ==============================
 
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """
+    Opaque keyset cursor for the (created_at, id) position of the last row on a page.
+    """
+    raw = json.dumps([created_at.isoformat(), str(row_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Inverse of encode_cursor. Raises ValueError for anything it did not produce.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (TypeError, ValueError, json.JSONDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
 def paginate(items: List[Any], page: int = 1, size: int = 20) -> Dict[str, Any]:
     """
     Simple in-memory pagination helper.
@@ -11,11 +11,15 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
+import uuid
+from starlette.concurrency import run_in_threadpool
 
-from app.database import get_db
-from app import models, crud
+from app.database import SessionLocal, get_db, get_async_db
+from app import models, crud, crud_async
 from app.config import settings
 from app.core.request_context import user_id_ctx, school_id_ctx, role_ctx
+from app.core.principal_cache import principals, Principal
+from app.core.password_pool import password_pool
 
 bearer_scheme = HTTPBearer()
 
@@ -40,6 +44,77 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     return encoded_jwt
 
 
+# ------------------------------------
+# Login: one lookup, one bcrypt verify, one token
+# ------------------------------------
+LOGIN_FAILED_DETAIL = {
+    "student": "Invalid email, password or non-existing account",
+    "lecturer": "Invalid email, password, or non-existing account",
+    "admin": "Invalid credentials",
+}
+
+
+def issue_token(user, role: str) -> dict:
+    school_id = getattr(user, "school_id", None)
+    expires_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+
+    access_token = create_access_token(
+        data={
+            "email": user.email,
+            "role": role,
+            "user_id": str(user.id),
+            "school_id": str(school_id) if school_id else None,
+        },
+        expires_delta=timedelta(minutes=expires_minutes)
+    )
+
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "user_id": user.id,
+        "school_id": school_id,
+        "role": role,
+        "expires_in": expires_minutes * 60
+    }
+
+
+def _login_result(user, role: str, password_ok: bool) -> dict:
+    # Unknown email and wrong password get the same answer
+    if not user or not password_ok:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=LOGIN_FAILED_DETAIL[role])
+
+    if not user.is_active:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Account is deactivated")
+
+    return issue_token(user, role)
+
+
+def login(db: Session, role: str, email: str, password: str) -> dict:
+    """Shared by the student, lecturer and admin login routes."""
+    user = crud.get_user_for_login(db, role, email)
+    password_ok = user is not None and crud.verify_password(password, user.hashed_password)
+    return _login_result(user, role, password_ok)
+
+
+async def login_async(db, role: str, email: str, password: str) -> dict:
+    """login() through AsyncSession (settings.DB_ASYNC)."""
+    user = await crud_async.get_user_for_login(db, role, email)
+    password_ok = user is not None and await password_pool.verify_async(password, user.hashed_password)
+    return _login_result(user, role, password_ok)
+
+
+def login_student(db: Session, email: str, password: str) -> dict:
+    return login(db, "student", email, password)
+
+
+def login_lecturer(db: Session, email: str, password: str) -> dict:
+    return login(db, "lecturer", email, password)
+
+
+def login_admin(db: Session, email: str, password: str) -> dict:
+    return login(db, "admin", email, password)
+
+
 # ------------------------------------
 # Decode token and get payload
 # ------------------------------------
@@ -61,11 +136,7 @@ def verify_token(token: str):
 # ------------------------------------
 # Retrieve current logged-in user
 # ------------------------------------
-async def get_current_user(   # ✅ CHANGED TO ASYNC
-    request: Request,
-    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
-    db: Session = Depends(get_db)
-):
+def _token_identity(request: Request, credentials: HTTPAuthorizationCredentials):
     token = credentials.credentials
     payload = verify_token(token)
 
@@ -73,21 +144,39 @@ async def get_current_user(   # ✅ CHANGED TO ASYNC
 
     email = payload.get("email")
     role = payload.get("role")
-    school_id = payload.get("school_id")
 
     if not email or not role:
         raise HTTPException(status_code=401, detail="Invalid authentication data")
 
-    # Fetch user from DB
-    if role == "student":
-        user = crud.get_student_by_email(db, email, school_id)
-    elif role == "lecturer":
-        user = crud.get_lecturer_by_email(db, email, school_id)
-    elif role == "admin":
-        user = crud.get_admin_by_email(db, email)
-    else:
+    if role not in crud.USER_MODELS:
         raise HTTPException(status_code=401, detail="Invalid role")
 
+    # Admin tokens issued before admin_login added user_id carry only the email
+    try:
+        user_id = uuid.UUID(payload["user_id"]) if payload.get("user_id") else None
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Invalid authentication data")
+
+    return role, user_id, email
+
+
+def _load_principal(db: Session, role: str, user_id, email: str):
+    if user_id:
+        user = crud.get_user_by_id(db, role, user_id)
+    else:
+        user = crud.get_admin_by_email(db, email) if role == "admin" else None
+    return Principal.from_model(role, user) if user else None
+
+
+async def _load_principal_async(db, role: str, user_id, email: str):
+    if user_id:
+        user = await crud_async.get_user_by_id(db, role, user_id)
+    else:
+        user = await crud_async.get_admin_by_email(db, email) if role == "admin" else None
+    return Principal.from_model(role, user) if user else None
+
+
+def _current(user, role: str):
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -98,13 +187,81 @@ async def get_current_user(   # ✅ CHANGED TO ASYNC
         )
 
     # 🔥 SET LOGGING CONTEXT (trusted DB data)
+    # Set here, on the event loop, so the values are copied into the route's context
     user_id_ctx.set(str(user.id))
-    school_id_ctx.set(str(user.school_id) if hasattr(user, "school_id") else None)
+    school_id_ctx.set(str(user.school_id) if user.school_id else None)
     role_ctx.set(role)
 
     return {"role": role, "user": user}
 
 
+async def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db: Session = Depends(get_db)
+):
+    """
+    Resolve the bearer token to a Principal snapshot of the user's row.
+    Served from the principal cache when possible, otherwise by primary key.
+    """
+    role, user_id, email = _token_identity(request, credentials)
+
+    principal = principals.get(role, user_id) if user_id else None
+    if principal is None:
+        # The lookup uses a blocking Session, so keep it off the event loop
+        principal = await run_in_threadpool(_load_principal, db, role, user_id, email)
+        if principal and user_id:
+            principals.put(principal)
+
+    return _current(principal, role)
+
+
+def _load_principal_closing(role: str, user_id, email: str):
+    """_load_principal on a Session of its own, closed before returning."""
+    db = SessionLocal()
+    try:
+        return _load_principal(db, role, user_id, email)
+    finally:
+        db.close()
+
+
+async def get_current_user_for_stream(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+):
+    """
+    get_current_user for long-lived responses (Server-Sent Events). A get_db
+    Session is closed only when the response ends, so on a principal-cache miss
+    its connection would stay checked out for the whole stream.
+    """
+    role, user_id, email = _token_identity(request, credentials)
+
+    principal = principals.get(role, user_id) if user_id else None
+    if principal is None:
+        principal = await run_in_threadpool(_load_principal_closing, role, user_id, email)
+        if principal and user_id:
+            principals.put(principal)
+
+    return _current(principal, role)
+
+
+async def get_current_user_async(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
+    db=Depends(get_async_db)
+):
+    """get_current_user for routes served through AsyncSession (settings.DB_ASYNC)."""
+    role, user_id, email = _token_identity(request, credentials)
+
+    principal = principals.get(role, user_id) if user_id else None
+    if principal is None:
+        principal = await _load_principal_async(db, role, user_id, email)
+        if principal and user_id:
+            principals.put(principal)
+
+    return _current(principal, role)
+
+
 # ------------------------------------
 # Restrict to students only
 # ------------------------------------
@@ -153,4 +310,28 @@ async def get_current_admin(   # ✅ ASYNC
             detail="Admin account deactivated"
         )
 
-    return admin
\ No newline at end of file
+    return admin
+
+
+# ------------------------------------
+# AsyncSession variants (settings.DB_ASYNC)
+# ------------------------------------
+async def get_current_student_async(
+    current=Depends(get_current_user_async)
+):
+    return await get_current_student(current)
+
+
+async def get_current_lecturer_async(
+    current=Depends(get_current_user_async)
+):
+    return await get_current_lecturer(current)
+
+
+# ------------------------------------
+# Streaming variant (get_current_user_for_stream)
+# ------------------------------------
+async def get_current_lecturer_for_stream(
+    current=Depends(get_current_user_for_stream)
+):
+    return await get_current_lecturer(current)
\ No newline at end of file
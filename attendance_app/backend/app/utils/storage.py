@@ -1,25 +1,258 @@
-from supabase import create_client
-from app.config import settings
+"""
+storage.py
+Profile-image storage behind a small backend interface.
+
+- stage_upload reads the request body in STORAGE_CHUNK_BYTES chunks into a temp
+  file, hashing as it goes, and rejects anything over STORAGE_MAX_UPLOAD_BYTES
+  or whose bytes are not a JPEG/PNG.
+- Objects are named by the SHA-256 of the uploaded bytes, so the public URLs are
+  known before the upload runs and the same image is never stored twice.
+- upload_profile_image hands the work to the background upload queue
+  (app/core/upload_queue.py): the image is re-encoded without metadata and
+  thumbnailed in the image pool (app/core/image_pool.py), the results are
+  stored, and then the profile row is pointed at the new URLs.
+
+STORAGE_BACKEND picks SupabaseStorage (default) or LocalStorage, which writes
+under STORAGE_LOCAL_DIR and is served by main.py at /media.
+"""
+
+import abc
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
 import uuid
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
 
-supabase = create_client(
-    settings.SUPABASE_URL,
-    settings.SUPABASE_SERVICE_ROLE_KEY
-)
+from app import crud
+from app.config import settings
+from app.core.image_pool import THUMBNAIL_SIZES, image_pool
+from app.core.upload_queue import upload_queue
+from app.database import SessionLocal
 
-def upload_profile_image(file, user_id: uuid.UUID):
-    ext = file.filename.split(".")[-1]
-    filename = f"user_{user_id}_{uuid.uuid4()}.{ext}"
+logger = logging.getLogger(__name__)
 
-    content = file.file.read()
+# Leading bytes of the accepted image types
+IMAGE_SIGNATURES = {
+    "image/jpeg": b"\xff\xd8\xff",
+    "image/png": b"\x89PNG\r\n\x1a\n",
+}
 
-    supabase.storage.from_("profile-images").upload(
-        filename,
-        content,
-        {
-            "content-type": file.content_type
-        }
+# Content-addressed names never change content, so clients may cache them for good
+IMMUTABLE_CACHE_SECONDS = 31536000
+
+
+@lru_cache(maxsize=1)
+def get_supabase():
+    """
+    Supabase client, built on the first upload. The supabase package and its
+    HTTP stack are the slowest import in the app, so it stays off the cold-start path.
+    """
+    from supabase import create_client
+
+    return create_client(
+        settings.SUPABASE_URL,
+        settings.SUPABASE_SERVICE_ROLE_KEY
     )
 
-    public_url = supabase.storage.from_("profile-images").get_public_url(filename)
-    return public_url
+
+# ----------------------------
+# Backends
+# ----------------------------
+class StorageBackend(abc.ABC):
+    """Stores named objects in one bucket and tells where they are served from."""
+
+    def __init__(self, bucket: str):
+        self.bucket = bucket
+
+    @abc.abstractmethod
+    def exists(self, name: str) -> bool:
+        ...
+
+    @abc.abstractmethod
+    def save(self, name: str, path: str, content_type: str) -> None:
+        """Store the file at path under name."""
+
+    @abc.abstractmethod
+    def public_url(self, name: str) -> str:
+        ...
+
+
+class SupabaseStorage(StorageBackend):
+    def _bucket(self):
+        return get_supabase().storage.from_(self.bucket)
+
+    def exists(self, name: str) -> bool:
+        return self._bucket().exists(name)
+
+    def save(self, name: str, path: str, content_type: str) -> None:
+        # An open file is streamed by the HTTP client instead of read into memory
+        with open(path, "rb") as f:
+            self._bucket().upload(
+                name,
+                f,
+                {
+                    "content-type": content_type,
+                    "cache-control": str(IMMUTABLE_CACHE_SECONDS),
+                    "upsert": "true"
+                }
+            )
+
+    def public_url(self, name: str) -> str:
+        # Built from the project URL; no request is made
+        return self._bucket().get_public_url(name)
+
+
+class LocalStorage(StorageBackend):
+    def __init__(self, bucket: str, root: str, base_url: str):
+        super().__init__(bucket)
+        self.directory = Path(root) / bucket
+        self.base_url = base_url.rstrip("/")
+
+    def exists(self, name: str) -> bool:
+        return (self.directory / name).is_file()
+
+    def save(self, name: str, path: str, content_type: str) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Copy next to the target and rename, so a reader never sees a partial file
+        partial = self.directory / f".{name}.{uuid.uuid4().hex}"
+        shutil.copyfile(path, partial)
+        os.replace(partial, self.directory / name)
+
+    def public_url(self, name: str) -> str:
+        return f"{self.base_url}/{self.bucket}/{name}"
+
+
+@lru_cache(maxsize=1)
+def get_storage() -> StorageBackend:
+    if settings.STORAGE_BACKEND == "local":
+        return LocalStorage(settings.STORAGE_BUCKET, settings.STORAGE_LOCAL_DIR, settings.STORAGE_LOCAL_URL)
+    if settings.STORAGE_BACKEND == "supabase":
+        return SupabaseStorage(settings.STORAGE_BUCKET)
+    raise ValueError(f"Unknown STORAGE_BACKEND {settings.STORAGE_BACKEND!r}")
+
+
+# ----------------------------
+# Staging
+# ----------------------------
+@dataclass
+class StagedUpload:
+    """An upload copied to local disk; the request's own file is gone once it returns."""
+    path: str
+    digest: str
+    content_type: str
+    size: int
+
+    def discard(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def stage_upload(file: UploadFile) -> StagedUpload:
+    """Chunked copy of an image upload to a temp file, named by its SHA-256."""
+    digest = hashlib.sha256()
+    size = 0
+    content_type = None
+
+    fd, path = tempfile.mkstemp(prefix="upload-")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := file.file.read(settings.STORAGE_CHUNK_BYTES):
+                if content_type is None:
+                    # Trust the bytes, not the client's Content-Type header
+                    content_type = next(
+                        (kind for kind, magic in IMAGE_SIGNATURES.items() if chunk.startswith(magic)),
+                        ""
+                    )
+                    if not content_type:
+                        raise HTTPException(status_code=400, detail="Invalid image type")
+
+                size += len(chunk)
+                if size > settings.STORAGE_MAX_UPLOAD_BYTES:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"Image is larger than {settings.STORAGE_MAX_UPLOAD_BYTES // 1024} KB"
+                    )
+                digest.update(chunk)
+                out.write(chunk)
+
+        if not size:
+            raise HTTPException(status_code=400, detail="Empty file")
+    except BaseException:
+        os.remove(path)
+        raise
+
+    return StagedUpload(path=path, digest=digest.hexdigest(), content_type=content_type, size=size)
+
+
+# ----------------------------
+# Profile images
+# ----------------------------
+def profile_image_names(digest: str) -> Tuple[str, Dict[int, str]]:
+    """Object names of the re-encoded image and of each thumbnail (all JPEG)."""
+    return f"{digest}.jpg", {size: f"{digest}_{size}.jpg" for size in THUMBNAIL_SIZES}
+
+
+def _store_profile_image(staged: StagedUpload, role: str, user_id: uuid.UUID) -> None:
+    """
+    Runs on the upload queue: render and store the image and its thumbnails
+    (unless already stored), then repoint the profile.
+    """
+    storage = get_storage()
+    full_name, thumb_names = profile_image_names(staged.digest)
+    try:
+        if storage.exists(full_name):
+            logger.info(f"Profile image {full_name} already stored, upload skipped")
+        else:
+            with tempfile.TemporaryDirectory(prefix="render-") as out_dir:
+                full_path, thumb_paths = image_pool.render(staged.path, out_dir)
+                # Thumbnails first: once the full image exists the set counts as stored
+                for size, path in thumb_paths.items():
+                    storage.save(thumb_names[size], path, "image/jpeg")
+                storage.save(full_name, full_path, "image/jpeg")
+    finally:
+        staged.discard()
+
+    db = SessionLocal()
+    try:
+        crud.set_profile_image(
+            db, role, user_id,
+            storage.public_url(full_name),
+            {size: storage.public_url(name) for size, name in thumb_names.items()}
+        )
+    finally:
+        db.close()
+
+
+def upload_profile_image(file: UploadFile, role: str, user_id: uuid.UUID, current_url: Optional[str]) -> dict:
+    """
+    Stage the upload and queue it. Returns the URLs the image and its thumbnails
+    will have, and whether anything was queued ("unchanged" when it is already
+    the current image).
+    """
+    staged = stage_upload(file)
+    storage = get_storage()
+    full_name, thumb_names = profile_image_names(staged.digest)
+    result = {
+        "profile_image": storage.public_url(full_name),
+        "profile_thumbnails": {size: storage.public_url(name) for size, name in thumb_names.items()},
+    }
+
+    if result["profile_image"] == current_url:
+        staged.discard()
+        return {**result, "status": "unchanged"}
+
+    try:
+        upload_queue.submit(_store_profile_image, staged, role, user_id)
+    except HTTPException:
+        staged.discard()
+        raise
+    return {**result, "status": "queued"}
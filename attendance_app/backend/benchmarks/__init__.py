@@ -0,0 +1,2 @@
+# Benchmark scripts for the Smart Attendance backend.
+# Run from the backend folder, e.g. `python -m benchmarks.bench_mark_attendance`.
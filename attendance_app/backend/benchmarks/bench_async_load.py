@@ -0,0 +1,161 @@
+"""
+bench_async_load.py
+Throughput of one uvicorn worker with the sync Session stack and with the
+AsyncSession stack (settings.DB_ASYNC).
+
+Seeds a throwaway school with one lecturer, one student and an open session in
+the database pointed to by DATABASE_URL, starts `uvicorn app.main:app --workers 1`
+once per mode, drives the hot routes (/students/me, /lecturers/me,
+/attendance/records, /attendance/mark) at a fixed concurrency, then deletes the
+school again.
+
+Usage (from the backend folder):
+    python -m benchmarks.bench_async_load --concurrency 64 --duration 20
+"""
+
+import argparse
+import asyncio
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import date
+
+import httpx
+from sqlalchemy import delete
+
+from app import crud, models, schemas
+from app.database import SessionLocal
+
+PASSWORD = "bench-password"
+
+
+def seed():
+    db = SessionLocal()
+    try:
+        school = models.School(name=f"bench-{uuid.uuid4().hex[:8]}")
+        db.add(school)
+        db.flush()
+
+        hashed = crud.get_password_hash(PASSWORD)
+        lecturer = models.Lecturer(
+            full_name="Bench Lecturer",
+            email=f"lecturer-{uuid.uuid4().hex[:8]}@bench.local",
+            hashed_password=hashed,
+            school_id=school.id,
+        )
+        student = models.Student(
+            full_name="Bench Student",
+            email=f"student-{uuid.uuid4().hex[:8]}@bench.local",
+            registration_number=f"BENCH-{uuid.uuid4().hex[:10]}",
+            hashed_password=hashed,
+            school_id=school.id,
+        )
+        db.add_all([lecturer, student])
+        db.commit()
+
+        session_in = schemas.AttendanceSessionCreate(course_code="BEN101", course_title="Benchmarking", date=date.today())
+        session = crud.create_attendance_session(db, session_in, lecturer.id, lecturer.full_name, school.id)
+        return school.id, lecturer.email, student.email, session.id
+    finally:
+        db.close()
+
+
+def start_server(port: int, async_mode: bool):
+    env = dict(os.environ, DB_ASYNC="true" if async_mode else "false")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", "1", "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+async def drive(base_url: str, lecturer_email: str, student_email: str, session_id, concurrency: int, duration: float):
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        lecturer = (await client.post("/auth/login/lecturer", json={"email": lecturer_email, "password": PASSWORD})).json()
+        student = (await client.post("/auth/login/student", json={"email": student_email, "password": PASSWORD})).json()
+        lecturer_headers = {"Authorization": f"Bearer {lecturer['access_token']}"}
+        student_headers = {"Authorization": f"Bearer {student['access_token']}"}
+
+        # Repeat marks are rejected by the unique index, which still exercises the whole path
+        requests = [
+            ("GET", "/students/me", student_headers, None),
+            ("GET", "/lecturers/me", lecturer_headers, None),
+            ("GET", "/attendance/records", lecturer_headers, None),
+            ("POST", "/attendance/mark", student_headers, {"session_id": str(session_id)}),
+        ]
+        latencies, errors = [], 0
+        deadline = time.perf_counter() + duration
+
+        async def worker(offset: int):
+            nonlocal errors
+            i = offset
+            while time.perf_counter() < deadline:
+                method, path, headers, body = requests[i % len(requests)]
+                i += 1
+                started = time.perf_counter()
+                response = await client.request(method, path, headers=headers, json=body)
+                latencies.append(time.perf_counter() - started)
+                if response.status_code >= 500:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+        wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "req_per_s": len(latencies) / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        # Nearest rank
+        "p99_ms": latencies[math.ceil(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    school_id, lecturer_email, student_email, session_id = seed()
+    results = {}
+    try:
+        for name, async_mode in (("sync Session", False), ("AsyncSession", True)):
+            proc = start_server(args.port, async_mode)
+            try:
+                results[name] = asyncio.run(drive(
+                    f"http://127.0.0.1:{args.port}", lecturer_email, student_email, session_id,
+                    args.concurrency, args.duration,
+                ))
+            finally:
+                proc.terminate()
+                proc.wait()
+    finally:
+        db = SessionLocal()
+        db.execute(delete(models.School).where(models.School.id == school_id))
+        db.commit()
+        db.close()
+
+    print(f"1 worker, concurrency {args.concurrency}, {args.duration:.0f}s per mode")
+    print(f"{'mode':<16}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<16}{r['req_per_s']:>10.1f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+bench_attendance_matrix.py
+Compares the NumPy course report (app/reports.py) with the same statistics
+computed by looping over attendance objects in Python, the way a report built
+on crud.get_attendance_for_lecturer would.
+
+Runs in memory on synthetic data (no database): N students x M sessions, each
+mark present with probability --rate. Both paths get the same rows and their
+results are checked against each other before timing. Query time is not
+included; the column-only query also transfers two ints per row where the ORM
+path loads whole attendance objects.
+
+Usage (from the backend folder):
+    python -m benchmarks.bench_attendance_matrix --students 2000 --sessions 200
+"""
+
+import argparse
+import random
+import statistics
+import time
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+from types import SimpleNamespace
+
+from app.reports import AttendanceMatrix
+
+
+def synthetic(n_students: int, n_sessions: int, rate: float):
+    rng = random.Random(7)
+    students = [(uuid.uuid4(), f"Student {i:05d}") for i in range(n_students)]
+    start = date(2026, 1, 5)
+    sessions = [(uuid.uuid4(), start + timedelta(days=j // 3 * 7 + (j % 3) * 2)) for j in range(n_sessions)]
+    session_date = dict(sessions)
+    records = [
+        SimpleNamespace(student_id=st[0], student_name=st[1], session_id=se[0], date=session_date[se[0]])
+        for st in students
+        for se in sessions
+        if rng.random() < rate
+    ]
+    return students, sessions, records
+
+
+def python_report(students, sessions, records):
+    """Dict-and-loop version of AttendanceMatrix.summarize over ORM-style rows."""
+    attended_by = defaultdict(set)
+    turnout = defaultdict(int)
+    for rec in records:
+        attended_by[rec.student_id].add(rec.session_id)
+        turnout[rec.session_id] += 1
+
+    order = [s[0] for s in sessions]
+    out_students = []
+    for sid, name in students:
+        seen = attended_by[sid]
+        longest = run = 0
+        for session_id in order:
+            run = run + 1 if session_id in seen else 0
+            longest = max(longest, run)
+        out_students.append({
+            "student_id": sid,
+            "attended": len(seen),
+            "rate": round(100 * len(seen) / len(order), 1),
+            "current_streak": run,
+            "longest_streak": longest,
+            "attendance": "".join("1" if s in seen else "0" for s in order),
+        })
+
+    weekday_sessions, weekday_marks = defaultdict(int), defaultdict(int)
+    for session_id, day in sessions:
+        weekday_sessions[day.weekday()] += 1
+        weekday_marks[day.weekday()] += turnout[session_id]
+
+    return {
+        "sessions": [{"session_id": s, "turnout": turnout[s]} for s in order],
+        "students": out_students,
+        "weekdays": {
+            d: round(100 * weekday_marks[d] / (weekday_sessions[d] * len(students)), 1) for d in weekday_sessions
+        },
+    }
+
+
+def numpy_report(students, sessions, codes):
+    return AttendanceMatrix.build(students, sessions, codes).summarize()
+
+
+def check(expected, actual):
+    for e, a in zip(expected["students"], actual["students"]):
+        for key in ("attended", "rate", "current_streak", "longest_streak", "attendance"):
+            assert e[key] == a[key], (key, e[key], a[key])
+    assert [s["turnout"] for s in expected["sessions"]] == [s["turnout"] for s in actual["sessions"]]
+    weekday_index = {name: i for i, name in enumerate(["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"])}
+    assert expected["weekdays"] == {weekday_index[w["weekday"]]: w["turnout_rate"] for w in actual["weekdays"]}
+
+
+def timed(fn, args, repeat: int):
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(*args)
+        times.append(time.perf_counter() - started)
+    return statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=0.8, help="probability a student attends a session")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    students, sessions, records = synthetic(args.students, args.sessions, args.rate)
+    # Each path gets rows in the shape its query returns: ORM-style objects for the loop,
+    # (student_code, session_code) ints from reports.fetch_course_matrix for the matrix
+    student_code = {s[0]: i for i, s in enumerate(students)}
+    session_code = {s[0]: j for j, s in enumerate(sessions)}
+    codes = [(student_code[rec.student_id], session_code[rec.session_id]) for rec in records]
+    check(python_report(students, sessions, records), numpy_report(students, sessions, codes))
+
+    results = {
+        "python loops over rows": timed(python_report, (students, sessions, records), args.repeat),
+        "numpy build + summarize": timed(numpy_report, (students, sessions, codes), args.repeat),
+        "numpy build only": timed(AttendanceMatrix.build, (students, sessions, codes), args.repeat),
+    }
+
+    print(f"{args.students} students x {args.sessions} sessions, {len(records)} attendance rows (median of {args.repeat})")
+    baseline = results["python loops over rows"]
+    for name, ms in results.items():
+        print(f"{name:<26}{ms:>10.1f} ms{baseline / ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,657 @@
+"""
+bench_crud.py
+Microbenchmarks of every crud.py function and of the response schemas'
+serialization, with JSON baselines and a regression check.
+
+Every case times one call the way a route makes it: a fresh Session per call,
+closed afterwards. Rounds are sized to --round-ms; the result is the median
+(and best) time per call over --rounds rounds. Writes get fresh rows prepared
+outside the timed loop (new sessions to mark, rows to delete, unique emails).
+bcrypt is replaced by a trivial stand-in while the suite runs, so the
+authenticate_*/create_*/change_*_password cases measure their database work;
+bench_password_pool.py measures bcrypt.
+
+Data: by default an in-memory SQLite database seeded by
+benchmarks.synthetic_dataset (--schools/--students/--sessions/--seed), so runs
+are reproducible on any machine. --database uses DATABASE_URL instead, which
+must already hold the dataset of that --seed (python -m benchmarks.synthetic_dataset).
+The subjects (school, lecturer, student, course, date) are the busiest ones of
+the dataset.
+
+Usage (from the backend folder):
+    python -m benchmarks.bench_crud --save baseline.json
+    python -m benchmarks.bench_crud --compare baseline.json --threshold 0.25
+    python -m benchmarks.bench_crud --filter attendance_for_lecturer --rounds 9
+
+--compare exits with status 1 when any case got slower than the baseline by more
+than --threshold (0.25 = 25%), or failed. Baselines only compare with runs on
+the same machine, dialect and dataset; the JSON records all three.
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import joinedload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import crud, models, schemas
+from app.core.password_pool import password_pool
+from app.utils.fast_json import FastJSONResponse, rows_to_dicts
+from benchmarks import synthetic_dataset
+
+SERIALIZATION_SIZES = (10, 100, 1000, 10_000)
+
+# crud functions without a case of their own: statement builders and helpers
+# timed through their callers, and the bcrypt wrappers (bench_password_pool.py)
+INDIRECT = {
+    "keyset_statement", "schema_columns", "keyset_page", "mark_attendance_statement",
+    "attendance_for_lecturer_statement", "attendance_export_statement", "course_sessions_count",
+    "rollup_keys", "rollup_mark_statement", "rollup_unmark_statements", "is_session_expired",
+    "get_password_hash", "verify_password",
+}
+
+
+# ----------------------------
+# Subjects
+# ----------------------------
+class Subjects:
+    """Ids and values the cases run against, picked from the dataset."""
+
+    def __init__(self, db, seed: int, prefix: str):
+        a, st = models.Attendance, models.Student
+
+        schools = select(models.School.id).where(models.School.name.like(f"{prefix} {seed} school %"))
+        school_id = db.execute(
+            select(st.school_id).where(st.school_id.in_(schools))
+            .group_by(st.school_id).order_by(func.count().desc()).limit(1)
+        ).scalar()
+        if school_id is None:
+            raise SystemExit(f"no dataset for seed {seed}: run python -m benchmarks.synthetic_dataset --seed {seed}")
+
+        self.school = db.get(models.School, school_id)
+        self.lecturer = db.get(models.Lecturer, self._busiest(db, a.lecturer_id, a.school_id == school_id))
+        self.student = db.get(models.Student, self._busiest(db, a.student_id, a.school_id == school_id))
+        self.course_code = self._busiest(db, a.course_code, a.lecturer_id == self.lecturer.id)
+        self.date = self._busiest(db, a.date, a.lecturer_id == self.lecturer.id)
+
+        sessions = models.AttendanceSession
+        self.session = db.scalars(
+            select(sessions).where(sessions.lecturer_id == self.lecturer.id)
+            .order_by(sessions.created_at.desc()).limit(1)
+        ).first()
+        self.attendance_id = db.scalars(select(a.id).where(a.student_id == self.student.id).limit(1)).first()
+
+        # Students the write cases mark, and one whose account they flip
+        self.pool = db.execute(
+            select(st.id, st.full_name).where(st.school_id == school_id, st.id != self.student.id).order_by(st.id)
+        ).all()
+        self.scratch_student_id = self.pool[-1][0]
+        db.expunge_all()
+
+    @staticmethod
+    def _busiest(db, column, condition):
+        return db.execute(
+            select(column).where(condition).group_by(column).order_by(func.count().desc(), column).limit(1)
+        ).scalar()
+
+
+# ----------------------------
+# Cases
+# ----------------------------
+class Case:
+    def __init__(self, name: str, call: Callable, prepare: Optional[Callable] = None, max_calls: int = 100_000):
+        self.name = name
+        self.call = call          # call(db, subjects, *args)
+        self.prepare = prepare    # prepare(db, subjects, n) -> up to n [args, ...], untimed
+        self.max_calls = max_calls
+
+
+CASES: Dict[str, Case] = {}
+_counter = itertools.count()
+
+
+def case(name: str, prepare: Optional[Callable] = None, max_calls: int = 100_000):
+    def register(fn):
+        CASES[name] = Case(name, fn, prepare, max_calls)
+        return fn
+    return register
+
+
+def crud_functions() -> set:
+    """Public functions defined in crud.py."""
+    return {
+        name for name, value in vars(crud).items()
+        if callable(value) and getattr(value, "__module__", None) == crud.__name__ and not name.startswith("_")
+    }
+
+
+def covered_functions() -> set:
+    return {name.split(".", 1)[1].split("[")[0] for name in CASES if name.startswith("crud.")}
+
+
+# --- accounts ---
+@case("crud.get_user_by_id")
+def _(db, s):
+    crud.get_user_by_id(db, "student", s.student.id)
+
+
+@case("crud.get_user_for_login")
+def _(db, s):
+    crud.get_user_for_login(db, "student", s.student.email.upper())
+
+
+@case("crud.get_lecturer_by_email")
+def _(db, s):
+    crud.get_lecturer_by_email(db, s.lecturer.email, s.school.id)
+
+
+@case("crud.lecturer_email_exists")
+def _(db, s):
+    crud.lecturer_email_exists(db, s.lecturer.email)
+
+
+@case("crud.get_lecturer")
+def _(db, s):
+    crud.get_lecturer(db, s.lecturer.id, s.school.id)
+
+
+@case("crud.get_student_by_email")
+def _(db, s):
+    crud.get_student_by_email(db, s.student.email, s.school.id)
+
+
+@case("crud.student_email_exists")
+def _(db, s):
+    crud.student_email_exists(db, s.student.email)
+
+
+@case("crud.get_student_by_registration")
+def _(db, s):
+    crud.get_student_by_registration(db, s.student.registration_number)
+
+
+@case("crud.get_student")
+def _(db, s):
+    crud.get_student(db, s.student.id)
+
+
+@case("crud.get_all_students", max_calls=200)
+def _(db, s):
+    crud.get_all_students(db, s.school.id)
+
+
+@case("crud.get_students_page")
+def _(db, s):
+    crud.get_students_page(db, s.school.id, None, 50)
+
+
+@case("crud.get_admin_user_page")
+def _(db, s):
+    crud.get_admin_user_page(db, "student", s.school.id, None, None, None, 50)
+
+
+@case("crud.get_admin_user_page[search]")
+def _(db, s):
+    crud.get_admin_user_page(db, "student", s.school.id, None, s.student.full_name[:3], None, 50)
+
+
+@case("crud.get_admin_by_email")
+def _(db, s):
+    crud.get_admin_by_email(db, "nobody@example.edu")
+
+
+@case("crud.get_school_by_id")
+def _(db, s):
+    crud.get_school_by_id(db, s.school.id)
+
+
+@case("crud.authenticate_student")
+def _(db, s):
+    crud.authenticate_student(db, s.student.email, synthetic_dataset.PASSWORD, s.school.id)
+
+
+@case("crud.authenticate_lecturer")
+def _(db, s):
+    crud.authenticate_lecturer(db, s.lecturer.email, synthetic_dataset.PASSWORD, s.school.id)
+
+
+@case("crud.authenticate_admin")
+def _(db, s):
+    crud.authenticate_admin(db, "nobody@example.edu", synthetic_dataset.PASSWORD)
+
+
+def _alternating(db, s, n):
+    return [(i % 2 == 1,) for i in range(n)]
+
+
+@case("crud.set_account_active", prepare=_alternating)
+def _(db, s, is_active):
+    crud.set_account_active(db, "student", s.scratch_student_id, is_active)
+
+
+def _numbered(db, s, n):
+    return [(next(_counter),) for _ in range(n)]
+
+
+@case("crud.set_profile_image", prepare=_numbered)
+def _(db, s, i):
+    url = f"https://cdn.example.edu/{i}.jpg"
+    crud.set_profile_image(db, "student", s.scratch_student_id, url, {64: url, 256: url})
+
+
+@case("crud.update_lecturer", prepare=_numbered)
+def _(db, s, i):
+    crud.update_lecturer(db, s.lecturer.id, s.school.id, {"course": f"Course {i}"})
+
+
+@case("crud.update_student", prepare=_numbered)
+def _(db, s, i):
+    crud.update_student(db, s.scratch_student_id, s.school.id, {"department": f"Department {i}"})
+
+
+@case("crud.change_lecturer_password", prepare=_numbered)
+def _(db, s, i):
+    crud.change_lecturer_password(db, s.lecturer, synthetic_dataset.PASSWORD, f"password-{i}")
+
+
+@case("crud.change_student_password", prepare=_numbered)
+def _(db, s, i):
+    crud.change_student_password(db, s.student, synthetic_dataset.PASSWORD, f"password-{i}")
+
+
+@case("crud.create_lecturer", prepare=_numbered)
+def _(db, s, i):
+    crud.create_lecturer(db, schemas.LecturerCreate(
+        full_name="Bench Lecturer", email=f"bench-lecturer-{i}-{uuid.uuid4().hex[:6]}@example.edu",
+        password="bench-password", school_name=s.school.name,
+    ))
+
+
+@case("crud.create_student", prepare=_numbered)
+def _(db, s, i):
+    crud.create_student(db, schemas.StudentCreate(
+        full_name="Bench Student", email=f"bench-student-{i}-{uuid.uuid4().hex[:6]}@example.edu",
+        registration_number=f"BENCH-{i}-{uuid.uuid4().hex[:6]}", password="bench-password",
+        school_name=s.school.name,
+    ))
+
+
+# --- attendance reads ---
+@case("crud.get_attendance_by_student_with_filter")
+def _(db, s):
+    crud.get_attendance_by_student_with_filter(db, s.school.id, s.student.id)
+
+
+@case("crud.get_attendance_by_student_with_filter[filters]")
+def _(db, s):
+    crud.get_attendance_by_student_with_filter(db, s.school.id, s.student.id, s.date, s.course_code)
+
+
+@case("crud.get_attendance_for_student_page")
+def _(db, s):
+    crud.get_attendance_for_student_page(db, s.student.id, s.school.id)
+
+
+@case("crud.get_attendance_by_course_and_date")
+def _(db, s):
+    crud.get_attendance_by_course_and_date(db, s.school.id, s.course_code, s.date)
+
+
+@case("crud.get_attendance_by_student")
+def _(db, s):
+    crud.get_attendance_by_student(db, s.student.id, s.school.id)
+
+
+@case("crud.get_attendance_for_lecturer", max_calls=200)
+def _(db, s):
+    crud.get_attendance_for_lecturer(db, s.lecturer.id, s.school.id)
+
+
+@case("crud.get_attendance_for_lecturer[date]")
+def _(db, s):
+    crud.get_attendance_for_lecturer(db, s.lecturer.id, s.school.id, date=s.date)
+
+
+@case("crud.get_attendance_for_lecturer[date,course]")
+def _(db, s):
+    crud.get_attendance_for_lecturer(db, s.lecturer.id, s.school.id, date=s.date, course_code=s.course_code)
+
+
+@case("crud.get_attendance_for_lecturer_page")
+def _(db, s):
+    crud.get_attendance_for_lecturer_page(db, s.lecturer.id, s.school.id)
+
+
+@case("crud.get_attendance_for_lecturer_page[course]")
+def _(db, s):
+    crud.get_attendance_for_lecturer_page(db, s.lecturer.id, s.school.id, course_code=s.course_code)
+
+
+@case("crud.stream_rows", max_calls=200)
+def _(db, s):
+    for _row in crud.stream_rows(db, crud.attendance_export_statement(s.school.id, lecturer_id=s.lecturer.id)):
+        pass
+
+
+@case("crud.get_attendance_by_id")
+def _(db, s):
+    crud.get_attendance_by_id(db, s.attendance_id, s.school.id)
+
+
+@case("crud.get_attendance_for_session")
+def _(db, s):
+    crud.get_attendance_for_session(db, s.session.id, s.school.id)
+
+
+@case("crud.get_attendance_by_student_and_session")
+def _(db, s):
+    crud.get_attendance_by_student_and_session(db, s.student.id, s.session.id, s.school.id)
+
+
+@case("crud.get_session_by_code")
+def _(db, s):
+    crud.get_session_by_code(db, s.session.session_code, s.school.id)
+
+
+@case("crud.get_attendance_session_by_id")
+def _(db, s):
+    crud.get_attendance_session_by_id(db, s.session.id, s.school.id)
+
+
+@case("crud.get_sessions_for_lecturer_page")
+def _(db, s):
+    crud.get_sessions_for_lecturer_page(db, s.lecturer.id)
+
+
+@case("crud.get_student_summary")
+def _(db, s):
+    crud.get_student_summary(db, s.student.id, s.school.id)
+
+
+@case("crud.get_course_summary")
+def _(db, s):
+    crud.get_course_summary(db, s.school.id, s.lecturer.id, s.course_code)
+
+
+# --- attendance writes ---
+def _open_session(db, s) -> models.AttendanceSession:
+    """A new active session, loaded and detached so the timed calls can read it."""
+    session = models.AttendanceSession(
+        lecturer_id=s.lecturer.id, lecturer_name=s.lecturer.full_name,
+        course_code=s.course_code, course_title="Benchmarking", date=date.today(),
+        session_code=f"BENCH-{uuid.uuid4().hex[:10].upper()}", school_id=s.school.id, is_active=True,
+    )
+    db.add(session)
+    db.commit()
+    db.refresh(session)
+    db.expunge(session)
+    return session
+
+
+def _marks(db, s, n):
+    """n students who have not marked a new open session yet."""
+    session = _open_session(db, s)
+    return [(student_id, name, session) for student_id, name in s.pool[:n]]
+
+
+@case("crud.create_attendance", prepare=_marks, max_calls=10_000)
+def _(db, s, student_id, student_name, session):
+    crud.create_attendance(
+        db, student_id, student_name, session.lecturer_id, session.lecturer_name, session.id,
+        session.course_code, session.course_title, session.date, session.school_id,
+    )
+
+
+@case("crud.mark_attendance", prepare=_marks, max_calls=10_000)
+def _(db, s, student_id, student_name, session):
+    crud.mark_attendance(db, student_id, student_name, session.id, s.school.id)
+
+
+@case("crud.create_attendance_session")
+def _(db, s):
+    crud.create_attendance_session(
+        db, schemas.AttendanceSessionCreate(course_code=s.course_code, course_title="Benchmarking", date=date.today()),
+        s.lecturer.id, s.lecturer.full_name, s.school.id,
+    )
+
+
+@case("crud.next_session_code")
+def _(db, s):
+    crud.next_session_code(db, s.school.id)  # rolled back when the session closes
+
+
+def _open_sessions(db, s, n):
+    return [(_open_session(db, s).id,) for _ in range(n)]
+
+
+@case("crud.close_attendance_session", prepare=_open_sessions)
+def _(db, s, session_id):
+    # Includes loading the session, as the route does
+    crud.close_attendance_session(db, crud.get_attendance_session_by_id(db, session_id, s.school.id))
+
+
+def _marked(db, s, n):
+    return [
+        (crud.create_attendance(
+            db, student_id, name, session.lecturer_id, session.lecturer_name, session.id,
+            session.course_code, session.course_title, session.date, session.school_id,
+        ).id,)
+        for student_id, name, session in _marks(db, s, n)
+    ]
+
+
+@case("crud.delete_attendance", prepare=_marked, max_calls=10_000)
+def _(db, s, attendance_id):
+    crud.delete_attendance(db, attendance_id, s.school.id)
+
+
+@case("crud.rebuild_attendance_rollups", max_calls=5)
+def _(db, s):
+    crud.rebuild_attendance_rollups(db, s.school.id)
+
+
+# --- serialization ---
+def _register_serialization():
+    """serialize.<Schema>[n]: validate n ORM rows and dump them to JSON, as response_model does."""
+
+    def rows(db, s, model, n, options=()):
+        loaded = db.scalars(
+            select(model).options(*options).where(model.school_id == s.school.id).limit(n)
+        ).unique().all()
+        return (loaded * (n // len(loaded) + 1))[:n]
+
+    for schema, model, options in (
+        (schemas.AttendanceOut, models.Attendance, ()),
+        (schemas.StudentOut, models.Student, (joinedload(models.Student.school),)),
+        (schemas.AttendanceSessionOut, models.AttendanceSession, ()),
+    ):
+        adapter = TypeAdapter(List[schema])
+
+        for n in SERIALIZATION_SIZES:
+            def prepare(db, s, calls, model=model, n=n, options=options):
+                loaded = rows(db, s, model, n, options)
+                return [(loaded,)] * calls
+
+            def call(db, s, loaded, adapter=adapter):
+                adapter.dump_json(adapter.validate_python(loaded, from_attributes=True))
+
+            CASES[f"serialize.{schema.__name__}[{n}]"] = Case(
+                f"serialize.{schema.__name__}[{n}]", call, prepare, max_calls=max(10, 100_000 // n)
+            )
+
+    # The list routes' fast path: column tuples straight to orjson (utils/fast_json.page_response)
+    fields = tuple(schemas.AttendanceOut.model_fields)
+    for n in SERIALIZATION_SIZES:
+        def prepare(db, s, calls, n=n):
+            loaded = rows(db, s, models.Attendance, n)
+            tuples = [tuple(getattr(r, f) for f in fields) for r in loaded]
+            return [(tuples,)] * calls
+
+        def call(db, s, tuples):
+            FastJSONResponse({"items": rows_to_dicts(schemas.AttendanceOut, tuples), "next_cursor": None})
+
+        CASES[f"serialize.AttendanceOut.page_response[{n}]"] = Case(
+            f"serialize.AttendanceOut.page_response[{n}]", call, prepare, max_calls=max(10, 100_000 // n)
+        )
+
+
+_register_serialization()
+
+
+# ----------------------------
+# Runner
+# ----------------------------
+def _fake_hash(password: str) -> str:
+    return f"bench${password}"
+
+
+def _fake_verify(plain_password: str, hashed_password: str) -> bool:
+    return True
+
+
+def measure(case: Case, session_factory, subjects: Subjects, rounds: int, round_s: float) -> dict:
+    def prepared(n):
+        if case.prepare is None:
+            return [()] * n
+        with session_factory() as db:
+            return case.prepare(db, subjects, n)
+
+    def timed(calls) -> float:
+        """Seconds per call."""
+        started = time.perf_counter()
+        for args in calls:
+            with session_factory() as db:
+                case.call(db, subjects, *args)
+        return (time.perf_counter() - started) / len(calls)
+
+    first = timed(prepared(1))  # also the warm-up
+    n = max(1, min(case.max_calls, int(round_s / max(first, 1e-7))))
+
+    total, per_call = 0, []
+    for _ in range(rounds):
+        calls = prepared(n)
+        per_call.append(timed(calls))
+        total += len(calls)
+    return {
+        "median_us": round(statistics.median(per_call) * 1e6, 2),
+        "min_us": round(min(per_call) * 1e6, 2),
+        "calls": total,
+    }
+
+
+def run(engine, subjects: Subjects, names: List[str], rounds: int, round_s: float, out=sys.stdout) -> Dict[str, dict]:
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    original = password_pool.hash, password_pool.verify
+    password_pool.hash, password_pool.verify = _fake_hash, _fake_verify
+    results = {}
+    try:
+        for name in names:
+            try:
+                results[name] = measure(CASES[name], session_factory, subjects, rounds, round_s)
+            except Exception as exc:
+                results[name] = {"error": f"{type(exc).__name__}: {exc}"}
+            if out:
+                r = results[name]
+                line = r["error"] if "error" in r else f"{r['median_us']:>12.1f}{r['min_us']:>12.1f}{r['calls']:>8}"
+                print(f"{name:<52}{line}", file=out)
+    finally:
+        password_pool.hash, password_pool.verify = original
+    return results
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> Tuple[List[str], List[str]]:
+    """Print current against baseline; returns (report lines, names of regressed or failed cases)."""
+    lines, regressions = [], []
+    lines.append(f"{'case':<52}{'base us':>12}{'now us':>12}{'change':>9}")
+    for name, now in current.items():
+        base = baseline.get(name)
+        if "error" in now:
+            lines.append(f"{name:<52}{'':>12}{'error':>12}  {now['error']}")
+            regressions.append(name)
+            continue
+        if not base or "error" in base:
+            lines.append(f"{name:<52}{'new':>12}{now['median_us']:>12.1f}")
+            continue
+        change = now["median_us"] / base["median_us"] - 1
+        flag = "  REGRESSION" if change > threshold else ""
+        if flag:
+            regressions.append(name)
+        lines.append(f"{name:<52}{base['median_us']:>12.1f}{now['median_us']:>12.1f}{change:>+9.0%}{flag}")
+    return lines, regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database", action="store_true", help="use DATABASE_URL (already seeded) instead of in-memory SQLite")
+    parser.add_argument("--schools", type=int, default=10)
+    parser.add_argument("--students", type=int, default=3000)
+    parser.add_argument("--sessions", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--prefix", default="synth")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--round-ms", type=float, default=100.0)
+    parser.add_argument("--filter", help="only cases whose name contains this")
+    parser.add_argument("--save", help="write the results to this baseline file")
+    parser.add_argument("--compare", help="compare with this baseline file")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before a case is flagged")
+    args = parser.parse_args()
+
+    dataset = {"schools": args.schools, "students": args.students, "sessions": args.sessions, "seed": args.seed}
+    if args.database:
+        from app.database import get_engine
+
+        engine = get_engine()
+        dataset = {"seed": args.seed, "prefix": args.prefix}
+    else:
+        engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+        models.Base.metadata.create_all(engine)
+        synthetic_dataset.generate(
+            engine, args.schools, args.students, args.sessions, args.seed, date(2025, 1, 6), args.prefix
+        )
+
+    with sessionmaker(bind=engine)() as db:
+        subjects = Subjects(db, args.seed, args.prefix)
+
+    names = [name for name in CASES if not args.filter or args.filter in name]
+    print(f"{'case':<52}{'median us':>12}{'best us':>12}{'calls':>8}")
+    results = run(engine, subjects, names, args.rounds, args.round_ms / 1000)
+
+    meta = {
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "node": platform.node(),
+        "dialect": engine.dialect.name,
+        "dataset": dataset,
+        "rounds": args.rounds,
+    }
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"meta": meta, "results": results}, f, indent=2, sort_keys=True)
+        print(f"baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        for key in ("dialect", "dataset", "node"):
+            if baseline["meta"].get(key) != meta[key]:
+                print(f"warning: baseline {key} {baseline['meta'].get(key)!r} differs from {meta[key]!r}")
+        lines, regressions = compare(results, baseline["results"], args.threshold)
+        print("\n".join(lines))
+        if regressions:
+            print(f"{len(regressions)} case(s) regressed by more than {args.threshold:.0%} or failed")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
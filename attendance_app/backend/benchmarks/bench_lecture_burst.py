@@ -0,0 +1,344 @@
+"""
+bench_lecture_burst.py
+Load test of one lecture's marking burst: how many concurrent markers one
+worker can take.
+
+Seeds a throwaway school with a lecturer, N students and an active session,
+then lets every student do what the student app does when the lecturer shows
+the code:
+
+    POST /auth/login/student
+    POST /students/verify_session_code?session_code=...
+    POST /attendance/mark
+
+with at most --concurrency students in flight. Logins cost a bcrypt verify
+each and dominate the burst; --skip-login issues the tokens up front (with this
+process's SECRET_KEY, so a --url server must share it) to measure the code check
+and the mark on their own. Traffic goes either through an
+in-process ASGI client (default; app.main:app in this process, one event loop
+and its threadpool, like one uvicorn worker) or, with --url, to a running
+server that uses the same database.
+
+Reports throughput, p50/p95/p99 latency per step and for the whole flow, the
+error mix (status codes and exceptions per step), and queries and database time
+per request. The last two come from the server's own /metrics
+(app/core/metrics.py), scraped before and after the burst, so they are exact
+for both targets as long as nothing else hits the server meanwhile.
+
+Database:
+- default: DATABASE_URL (PostgreSQL); the school is deleted afterwards
+  (ON DELETE CASCADE cleans the rest) unless --keep.
+- --sqlite: a throwaway SQLite file with all tables, for quick local runs
+  without PostgreSQL. In-process target only. Numbers are not comparable with
+  PostgreSQL: SQLite serialises writers.
+
+Usage (from the backend folder):
+    python -m benchmarks.bench_lecture_burst --students 300 --concurrency 50
+    python -m benchmarks.bench_lecture_burst --sqlite
+    python -m benchmarks.bench_lecture_burst --url http://127.0.0.1:8000 --metrics-token ...
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import secrets
+import sys
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import date
+from typing import Optional
+
+PASSWORD = "bench-password"
+STEPS = ("login", "verify_session_code", "mark", "flow")
+
+# route template per step, as labelled in /metrics
+ROUTES = {
+    "login": ("POST", "/auth/login/student"),
+    "verify_session_code": ("POST", "/students/verify_session_code"),
+    "mark": ("POST", "/attendance/mark"),
+}
+
+_METRIC_LINE = re.compile(r'^(http_request_db_queries|http_request_db_seconds)_(sum|count)\{(.*)\} (\S+)$')
+_LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+
+def configure_sqlite() -> str:
+    """Point the app at a new SQLite file before anything imports app.database."""
+    path = os.path.join(tempfile.mkdtemp(prefix="lecture-burst-"), "burst.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    return path
+
+
+def prepare_sqlite():
+    from app.database import get_engine
+    from app.models import Base
+
+    Base.metadata.create_all(get_engine())
+
+
+def seed(n_students: int):
+    from app import crud, models, schemas
+    from app.database import SessionLocal
+    from app.utils import security
+
+    db = SessionLocal()
+    try:
+        school = models.School(id=uuid.uuid4(), name=f"bench-{uuid.uuid4().hex[:8]}")
+        db.add(school)
+        db.flush()
+
+        # One bcrypt hash for everybody; logins still verify at full cost.
+        # Logins validate EmailStr, which rejects special-use domains such as .local
+        hashed = crud.get_password_hash(PASSWORD)
+        lecturer = models.Lecturer(
+            id=uuid.uuid4(),
+            full_name="Bench Lecturer",
+            email=f"lecturer-{uuid.uuid4().hex[:8]}@bench.example.com",
+            hashed_password=hashed,
+            school_id=school.id,
+        )
+        students = [
+            models.Student(
+                id=uuid.uuid4(),
+                full_name=f"Bench Student {i}",
+                email=f"student-{i}-{uuid.uuid4().hex[:8]}@bench.example.com",
+                registration_number=f"BENCH-{uuid.uuid4().hex[:10]}",
+                hashed_password=hashed,
+                school_id=school.id,
+            )
+            for i in range(n_students)
+        ]
+        db.add(lecturer)
+        db.add_all(students)
+        db.commit()
+
+        session_in = schemas.AttendanceSessionCreate(course_code="BEN101", course_title="Benchmarking", date=date.today())
+        session = crud.create_attendance_session(db, session_in, lecturer.id, lecturer.full_name, school.id)
+        tokens = [security.issue_token(s, "student")["access_token"] for s in students]
+        return school.id, [s.email for s in students], tokens, session.session_code
+    finally:
+        db.close()
+
+
+def cleanup(school_id):
+    from sqlalchemy import delete
+
+    from app import models
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.execute(delete(models.School).where(models.School.id == school_id))
+        db.commit()
+    finally:
+        db.close()
+
+
+def scrape_db_metrics(text: str):
+    """{(method, route): {"queries": sum, "seconds": sum, "count": n}}, summed over schools if labelled."""
+    totals = defaultdict(lambda: {"queries": 0.0, "seconds": 0.0, "count": 0.0})
+    for line in text.splitlines():
+        match = _METRIC_LINE.match(line)
+        if not match:
+            continue
+        name, kind, labels, value = match.groups()
+        labels = dict(_LABEL.findall(labels))
+        entry = totals[(labels.get("method"), labels.get("route"))]
+        if kind == "count":
+            # Both histograms count the same requests
+            if name == "http_request_db_queries":
+                entry["count"] += float(value)
+        else:
+            entry["queries" if name == "http_request_db_queries" else "seconds"] += float(value)
+    return totals
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # Nearest rank; round() would land one rank low on halves (148.5 -> 148)
+    index = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+
+async def run_student(client, email: str, token: Optional[str], session_code: str, latencies, errors) -> bool:
+    """One student's login (unless token is given), code check and mark. False as soon as a step fails."""
+    flow_started = time.perf_counter()
+
+    async def step(name, method, path, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, path, **kwargs)
+        except Exception as exc:
+            errors[name][type(exc).__name__] += 1
+            return None
+        if response.status_code >= 400:
+            errors[name][str(response.status_code)] += 1
+            return None
+        latencies[name].append(time.perf_counter() - started)
+        return response
+
+    if token is None:
+        response = await step("login", "POST", "/auth/login/student", json={"email": email, "password": PASSWORD})
+        if response is None:
+            return False
+        token = response.json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await step(
+        "verify_session_code", "POST", "/students/verify_session_code",
+        params={"session_code": session_code}, headers=headers,
+    )
+    if response is None:
+        return False
+    session_id = response.json()["id"]
+
+    response = await step("mark", "POST", "/attendance/mark", json={"session_id": session_id}, headers=headers)
+    if response is None:
+        return False
+
+    latencies["flow"].append(time.perf_counter() - flow_started)
+    return True
+
+
+async def burst(client, students, session_code: str, concurrency: int, metrics_headers: dict):
+    latencies = {name: [] for name in STEPS}
+    errors = {name: Counter() for name in STEPS}
+
+    before = (await client.get("/metrics", headers=metrics_headers)).text
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(email, token):
+        async with semaphore:
+            return await run_student(client, email, token, session_code, latencies, errors)
+
+    started = time.perf_counter()
+    completed = sum(await asyncio.gather(*(limited(email, token) for email, token in students)))
+    wall = time.perf_counter() - started
+
+    after = (await client.get("/metrics", headers=metrics_headers))
+    if after.status_code != 200:
+        print(f"/metrics returned {after.status_code}; pass --metrics-token for queries per request", file=sys.stderr)
+        db = {}
+    else:
+        before, after = scrape_db_metrics(before), scrape_db_metrics(after.text)
+        db = {}
+        for step_name, key in ROUTES.items():
+            count = after[key]["count"] - before[key]["count"]
+            db[step_name] = {
+                "queries_per_request": (after[key]["queries"] - before[key]["queries"]) / count if count else 0.0,
+                "db_ms_per_request": (after[key]["seconds"] - before[key]["seconds"]) / count * 1000 if count else 0.0,
+            }
+
+    requests = sum(len(latencies[name]) for name in ROUTES) + sum(sum(errors[name].values()) for name in ROUTES)
+    result = {
+        "students": len(students),
+        "concurrency": concurrency,
+        "wall_s": wall,
+        "completed": completed,
+        "flows_per_s": completed / wall,
+        "requests_per_s": requests / wall,
+        "steps": {},
+    }
+    for name in STEPS:
+        values = sorted(latencies[name])
+        result["steps"][name] = {
+            "ok": len(values),
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+            "errors": dict(errors[name]),
+            **db.get(name, {}),
+        }
+    return result
+
+
+async def drive(args, students, session_code: str):
+    import httpx
+
+    from app.config import settings
+
+    token = args.metrics_token if args.metrics_token is not None else settings.METRICS_TOKEN
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits)
+    else:
+        from app.main import app
+
+        # /metrics is off without a token; in process, give it one for this run
+        if not token:
+            token = settings.METRICS_TOKEN = secrets.token_urlsafe(16)
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://burst", timeout=args.timeout)
+
+    async with client:
+        metrics_headers = {"Authorization": f"Bearer {token}"} if token else {}
+        return await burst(client, students, session_code, args.concurrency, metrics_headers)
+
+
+def print_report(result: dict) -> None:
+    print(
+        f"{result['students']} students, concurrency {result['concurrency']}: "
+        f"{result['completed']} marked in {result['wall_s']:.2f}s, "
+        f"{result['flows_per_s']:.1f} students/s, {result['requests_per_s']:.1f} req/s"
+    )
+    print(f"{'step':<22}{'ok':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'db ms':>8}  errors")
+    for name, step in result["steps"].items():
+        if not step["ok"] and not step["errors"]:
+            continue  # login with --skip-login
+        queries = f"{step['queries_per_request']:.2f}" if "queries_per_request" in step else "-"
+        db_ms = f"{step['db_ms_per_request']:.2f}" if "db_ms_per_request" in step else "-"
+        errors = ", ".join(f"{code} x{count}" for code, count in sorted(step["errors"].items())) or "-"
+        print(
+            f"{name:<22}{step['ok']:>6}{step['p50_ms']:>10.2f}{step['p95_ms']:>10.2f}{step['p99_ms']:>10.2f}"
+            f"{queries:>9}{db_ms:>8}  {errors}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--skip-login", action="store_true", help="start with issued tokens instead of logging in")
+    parser.add_argument("--url", help="drive a running server instead of the in-process app")
+    parser.add_argument("--metrics-token", help="bearer token for /metrics (default: settings.METRICS_TOKEN)")
+    parser.add_argument("--sqlite", action="store_true", help="seed a throwaway SQLite database instead of DATABASE_URL")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--keep", action="store_true", help="do not delete the seeded school")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        if args.url:
+            parser.error("--sqlite only works with the in-process target")
+        sqlite_path = configure_sqlite()
+        prepare_sqlite()
+
+    school_id, emails, tokens, session_code = seed(args.students)
+    students = list(zip(emails, tokens if args.skip_login else [None] * len(emails)))
+    try:
+        result = asyncio.run(drive(args, students, session_code))
+    finally:
+        if args.sqlite:
+            os.remove(sqlite_path)
+        elif not args.keep:
+            cleanup(school_id)
+
+        from app.core.password_pool import password_pool
+        password_pool.shutdown()
+
+    print_report(result)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+bench_mark_attendance.py
+Compares the old four-round-trip mark path with the single-statement
+crud.mark_attendance path.
+
+Seeds a throwaway school, lecturer, N students and two active sessions in the
+database pointed to by DATABASE_URL (PostgreSQL), has every student mark once
+per path, then deletes the school again (ON DELETE CASCADE cleans the rest).
+
+Usage (from the backend folder):
+    python -m benchmarks.bench_mark_attendance --students 400 --concurrency 16
+"""
+
+import argparse
+import math
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from sqlalchemy import delete, event, func
+
+from app import crud, models, schemas
+from app.database import SessionLocal, get_engine
+
+
+engine = get_engine()
+
+_local = threading.local()
+
+
+def _count_queries(conn, cursor, statement, parameters, context, executemany):
+    _local.queries = getattr(_local, "queries", 0) + 1
+
+
+def seed(n_students: int):
+    db = SessionLocal()
+    try:
+        school = models.School(name=f"bench-{uuid.uuid4().hex[:8]}")
+        db.add(school)
+        db.flush()
+
+        lecturer = models.Lecturer(
+            full_name="Bench Lecturer",
+            email=f"lecturer-{uuid.uuid4().hex[:8]}@bench.local",
+            hashed_password="x",
+            school_id=school.id,
+        )
+        db.add(lecturer)
+        db.flush()
+
+        students = [
+            models.Student(
+                full_name=f"Bench Student {i}",
+                email=f"student-{i}-{uuid.uuid4().hex[:8]}@bench.local",
+                registration_number=f"BENCH-{uuid.uuid4().hex[:10]}",
+                hashed_password="x",
+                school_id=school.id,
+            )
+            for i in range(n_students)
+        ]
+        db.add_all(students)
+        db.commit()
+
+        session_in = schemas.AttendanceSessionCreate(course_code="BEN101", course_title="Benchmarking", date=date.today())
+        sessions = [
+            crud.create_attendance_session(db, session_in, lecturer.id, lecturer.full_name, school.id)
+            for _ in range(2)
+        ]
+        return (
+            school.id,
+            [(s.id, s.full_name) for s in students],
+            [s.id for s in sessions],
+        )
+    finally:
+        db.close()
+
+
+def legacy_mark(db, student_id, student_name, session_id, school_id):
+    """The pre-change route body: session lookup, duplicate check, insert, refresh."""
+    session = crud.get_attendance_session_by_id(db, session_id, school_id)
+    if not session or not session.is_active or session.date < date.today():
+        return None
+    if crud.get_attendance_by_student_and_session(db, student_id, session.id, school_id):
+        return None
+    return crud.create_attendance(
+        db=db,
+        student_id=student_id,
+        student_name=student_name,
+        lecturer_id=session.lecturer_id,
+        lecturer_name=session.lecturer_name,
+        session_id=session.id,
+        course_code=session.course_code,
+        course_title=session.course_title,
+        date=session.date,
+        school_id=school_id,
+    )
+
+
+def single_statement_mark(db, student_id, student_name, session_id, school_id):
+    return crud.mark_attendance(db, student_id, student_name, session_id, school_id)
+
+
+def run(mark, students, session_id, school_id, concurrency: int):
+    def one(student):
+        db = SessionLocal()
+        _local.queries = 0
+        started = time.perf_counter()
+        try:
+            mark(db, student[0], student[1], session_id, school_id)
+            error = None
+        except Exception as exc:  # IntegrityError from the unique index when the old path races
+            db.rollback()
+            error = type(exc).__name__
+        finally:
+            db.close()
+        return time.perf_counter() - started, _local.queries, error
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, students))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(r[0] * 1000 for r in results)
+    return {
+        "marks": len(results),
+        "errors": sum(1 for r in results if r[2]),
+        "queries_per_mark": statistics.mean(r[1] for r in results),
+        "p50_ms": statistics.median(latencies),
+        # Nearest rank: the smallest latency at or above 99% of the marks
+        "p99_ms": latencies[math.ceil(len(latencies) * 0.99) - 1],
+        "marks_per_s": len(results) / wall,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, default=16)
+    args = parser.parse_args()
+
+    school_id, students, (legacy_session, new_session) = seed(args.students)
+    event.listen(engine, "before_cursor_execute", _count_queries)
+    try:
+        results = {
+            "before (4 round trips)": run(legacy_mark, students, legacy_session, school_id, args.concurrency),
+            "after (INSERT ... SELECT)": run(single_statement_mark, students, new_session, school_id, args.concurrency),
+        }
+    finally:
+        event.remove(engine, "before_cursor_execute", _count_queries)
+        db = SessionLocal()
+        rows = db.query(func.count(models.Attendance.id)).filter(models.Attendance.school_id == school_id).scalar()
+        db.execute(delete(models.School).where(models.School.id == school_id))
+        db.commit()
+        db.close()
+
+    print(f"{args.students} students, concurrency {args.concurrency}, {rows} attendance rows written")
+    print(f"{'path':<28}{'queries/mark':>14}{'p50 ms':>10}{'p99 ms':>10}{'marks/s':>10}{'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<28}{r['queries_per_mark']:>14.2f}{r['p50_ms']:>10.2f}{r['p99_ms']:>10.2f}{r['marks_per_s']:>10.1f}{r['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
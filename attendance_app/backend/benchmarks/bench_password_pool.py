@@ -0,0 +1,56 @@
+"""
+bench_password_pool.py
+Login (bcrypt verify) throughput inline vs. on the password process pool
+at 1, 2, 4, ... workers up to the number of CPUs.
+
+Needs no database: it verifies one bcrypt hash the way crud.authenticate_*
+does, from as many request threads as Starlette's default threadpool.
+
+Usage (from the backend folder):
+    python -m benchmarks.bench_password_pool --logins 200
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.core.password_pool import PasswordPool, pwd_context
+
+PASSWORD = "bench-password"
+
+
+def measure(verify, logins: int, threads: int) -> float:
+    hashed = pwd_context.hash(PASSWORD)
+    verify(PASSWORD, hashed)  # warm up (spawns the pool processes)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        assert all(pool.map(lambda _: verify(PASSWORD, hashed), range(logins)))
+    return logins / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=40, help="request threads (Starlette default: 40)")
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    print(f"{args.logins} logins from {args.threads} threads, {cpus} CPUs")
+    print(f"{'mode':<16}{'logins/s':>10}")
+    print(f"{'inline':<16}{measure(pwd_context.verify, args.logins, args.threads):>10.1f}")
+
+    workers = 1
+    while workers <= cpus:
+        pool = PasswordPool(workers=workers, max_pending=args.threads)
+        try:
+            rate = measure(pool.verify, args.logins, args.threads)
+        finally:
+            pool.shutdown()
+        print(f"{f'pool x{workers}':<16}{rate:>10.1f}")
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+bench_serialization.py
+Time to serialize a Page[AttendanceOut] of N rows through FastAPI, per response path:
+
+- ORM + response_model: ORM instances validated with from_attributes (the old routes)
+- dicts + response_model: column rows as dicts, still validated (FAST_LIST_RESPONSES=False)
+- tuples + orjson: column rows encoded by utils/fast_json.page_response (the default)
+
+Rows are built in memory up front, so only validation and encoding are timed
+(plus the in-process HTTP round trip, which is the same for every path).
+
+Usage (from the backend folder):
+    python -m benchmarks.bench_serialization --rows 10000 100000
+"""
+
+import argparse
+import statistics
+import time
+import uuid
+from datetime import date, timedelta
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import models, schemas
+from app.config import settings
+from app.utils.fast_json import page_response, rows_to_dicts
+
+
+def make_rows(n: int):
+    lecturer_id, school_id = uuid.uuid4(), uuid.uuid4()
+    sessions = [uuid.uuid4() for _ in range(50)]
+    start = date(2026, 1, 5)
+    tuples = [
+        (uuid.uuid4(), uuid.uuid4(), f"Student {i}", lecturer_id, "Dr Bench", sessions[i % 50],
+         "BEN101", "Benchmarking", start + timedelta(days=i % 120), "present")
+        for i in range(n)
+    ]
+    fields = tuple(schemas.AttendanceOut.model_fields)
+    orm = [models.Attendance(**dict(zip(fields, row)), school_id=school_id) for row in tuples]
+    return orm, tuples
+
+
+def build_app(orm, tuples):
+    app = FastAPI()
+    page = schemas.Page[schemas.AttendanceOut]
+
+    @app.get("/orm", response_model=page)
+    def orm_path():
+        return {"items": orm, "next_cursor": None}
+
+    @app.get("/dicts", response_model=page)
+    def dict_path():
+        return {"items": rows_to_dicts(schemas.AttendanceOut, tuples), "next_cursor": None}
+
+    @app.get("/fast", response_model=page)
+    def fast_path():
+        return page_response(schemas.AttendanceOut, tuples, None)
+
+    return app
+
+
+def measure(client, path: str, repeat: int):
+    times, size = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(path)
+        times.append(time.perf_counter() - started)
+        size = len(response.content)
+    return statistics.median(times) * 1000, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    settings.FAST_LIST_RESPONSES = True
+    print(f"{'rows':>8}  {'path':<26}{'median ms':>10}{'MB':>8}{'speedup':>9}")
+    for n in args.rows:
+        orm, tuples = make_rows(n)
+        client = TestClient(build_app(orm, tuples))
+
+        # Same body on every path
+        assert client.get("/orm").json() == client.get("/dicts").json() == client.get("/fast").json()
+
+        results = {
+            "ORM + response_model": measure(client, "/orm", args.repeat),
+            "dicts + response_model": measure(client, "/dicts", args.repeat),
+            "tuples + orjson": measure(client, "/fast", args.repeat),
+        }
+        baseline = results["ORM + response_model"][0]
+        for name, (ms, size) in results.items():
+            print(f"{n:>8}  {name:<26}{ms:>10.1f}{size / 1e6:>8.2f}{baseline / ms:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+explain_queries.py
+EXPLAIN ANALYZEs the crud queries the composite indexes were chosen for
+(models.py / migration e3b7d05a9f12) and checks each plan uses one of them.
+
+Seeds a throwaway school (lecturers, students, sessions, attendance) in the
+database pointed to by DATABASE_URL (PostgreSQL), runs ANALYZE, then calls the
+real crud functions and re-runs the exact SQL they emitted under
+EXPLAIN (ANALYZE, BUFFERS). The school is deleted again afterwards
+(ON DELETE CASCADE cleans the rest) unless --keep is given.
+
+Exits non-zero when a plan does not use an expected index, so it can gate
+index changes.
+
+Usage (from the backend folder):
+    python -m benchmarks.explain_queries --lecturers 20 --students 2000 --sessions 50 --per-session 100
+    python -m benchmarks.explain_queries --verbose    # print every plan
+"""
+
+import argparse
+import json
+import random
+import sys
+import uuid
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta, timezone
+
+from sqlalchemy import delete, event, insert
+
+from app import crud, models
+from app.database import SessionLocal, get_engine
+
+
+engine = get_engine()
+BATCH = 5000
+
+
+def seed(n_lecturers: int, n_students: int, n_sessions: int, per_session: int):
+    """One school; every lecturer runs n_sessions sessions, each marked by per_session students."""
+    rng = random.Random(42)
+    school_id = uuid.uuid4()
+    tag = school_id.hex[:8]
+    today = date.today()
+
+    lecturers = [
+        {"id": uuid.uuid4(), "full_name": f"Explain Lecturer {i}", "email": f"lecturer-{i}-{tag}@explain.local",
+         "hashed_password": "x", "course": f"EXP{i:03d}", "school_id": school_id, "is_active": True}
+        for i in range(n_lecturers)
+    ]
+    students = [
+        {"id": uuid.uuid4(), "full_name": f"Explain Student {i}", "email": f"student-{i}-{tag}@explain.local",
+         "registration_number": f"EXP-{tag}-{i}", "hashed_password": "x", "school_id": school_id, "is_active": True}
+        for i in range(n_students)
+    ]
+
+    sessions, attendance = [], []
+    for lecturer in lecturers:
+        for s in range(n_sessions):
+            day = today - timedelta(days=rng.randrange(120))
+            opened = datetime.combine(day, time(8), tzinfo=timezone.utc) + timedelta(minutes=rng.randrange(600))
+            session = {
+                "id": uuid.uuid4(), "lecturer_id": lecturer["id"], "lecturer_name": lecturer["full_name"],
+                "course_code": f"{lecturer['course']}-{s % 4}", "course_title": "Explain", "date": day,
+                "session_code": f"{tag}-{lecturer['course']}-{s}", "is_active": False,
+                "school_id": school_id, "created_at": opened,
+            }
+            sessions.append(session)
+            for student in rng.sample(students, min(per_session, n_students)):
+                attendance.append({
+                    "id": uuid.uuid4(), "student_id": student["id"], "student_name": student["full_name"],
+                    "lecturer_id": lecturer["id"], "lecturer_name": lecturer["full_name"],
+                    "session_id": session["id"], "course_code": session["course_code"],
+                    "course_title": session["course_title"], "date": day, "status": "present",
+                    "school_id": school_id, "created_at": opened + timedelta(seconds=rng.randrange(3600)),
+                })
+
+    with engine.begin() as conn:
+        conn.execute(insert(models.School), [{"id": school_id, "name": f"explain-{tag}"}])
+        for table, rows in (
+            (models.Lecturer, lecturers),
+            (models.Student, students),
+            (models.AttendanceSession, sessions),
+            (models.Attendance, attendance),
+        ):
+            for start in range(0, len(rows), BATCH):
+                conn.execute(insert(table), rows[start:start + BATCH])
+
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in ("lecturers", "students", "attendance_sessions", "attendance"):
+            conn.exec_driver_sql(f"ANALYZE {table}")
+
+    # Keys that exist in the data: a (date, course) the sampled lecturer and student share
+    sample = rng.choice(attendance)
+    return {
+        "school_id": school_id,
+        "lecturer_id": sample["lecturer_id"],
+        "student_id": sample["student_id"],
+        "date": sample["date"],
+        "course_code": sample["course_code"],
+        "session_id": sample["session_id"],
+        "session_code": rng.choice(sessions)["session_code"],
+        "rows": len(attendance),
+    }
+
+
+def queries(k):
+    """(label, acceptable indexes, crud call) for every query shape the indexes target."""
+    return [
+        ("get_attendance_for_lecturer",
+         {"ix_attendance_lecturer_school_date_course", "ix_attendance_lecturer_school_created"},
+         lambda db: crud.get_attendance_for_lecturer(db, k["lecturer_id"], k["school_id"])),
+        ("get_attendance_for_lecturer(date)",
+         {"ix_attendance_lecturer_school_date_course"},
+         lambda db: crud.get_attendance_for_lecturer(db, k["lecturer_id"], k["school_id"], date=k["date"])),
+        ("get_attendance_for_lecturer(date, course)",
+         {"ix_attendance_lecturer_school_date_course"},
+         lambda db: crud.get_attendance_for_lecturer(db, k["lecturer_id"], k["school_id"], k["date"], k["course_code"])),
+        ("get_attendance_for_lecturer_page",
+         {"ix_attendance_lecturer_school_created"},
+         lambda db: crud.get_attendance_for_lecturer_page(db, k["lecturer_id"], k["school_id"])),
+        ("get_attendance_by_student",
+         {"ix_attendance_student_school_created"},
+         lambda db: crud.get_attendance_by_student(db, k["student_id"], k["school_id"])),
+        ("get_attendance_by_student_with_filter",
+         {"ix_attendance_student_school_date_course"},
+         lambda db: crud.get_attendance_by_student_with_filter(db, k["school_id"], k["student_id"], k["date"], k["course_code"])),
+        ("get_attendance_for_student_page",
+         {"ix_attendance_student_school_created"},
+         lambda db: crud.get_attendance_for_student_page(db, k["student_id"], k["school_id"])),
+        ("get_attendance_for_session",
+         {"ix_attendance_session_created"},
+         lambda db: crud.get_attendance_for_session(db, k["session_id"], k["school_id"])),
+        ("get_session_by_code",
+         {"uq_attendance_sessions_school_code"},
+         lambda db: crud.get_session_by_code(db, k["session_code"], k["school_id"])),
+        ("get_sessions_for_lecturer_page",
+         {"ix_attendance_sessions_lecturer_created"},
+         lambda db: crud.get_sessions_for_lecturer_page(db, k["lecturer_id"])),
+        ("get_admin_user_page(q)",
+         {"ix_students_name_lower", "ix_students_email_lower"},
+         lambda db: crud.get_admin_user_page(db, "student", q="explain student 12")),
+    ]
+
+
+@contextmanager
+def capture():
+    """Collect (statement, parameters) for everything executed on the engine."""
+    statements = []
+
+    def hook(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", hook)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", hook)
+
+
+def plan_indexes(node, found=None):
+    found = set() if found is None else found
+    if "Index Name" in node:
+        found.add(node["Index Name"])
+    for child in node.get("Plans", []):
+        plan_indexes(child, found)
+    return found
+
+
+def explain(statement, parameters):
+    with engine.connect() as conn:
+        raw = conn.exec_driver_sql("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + statement, parameters).scalar()
+        text_plan = conn.exec_driver_sql("EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters).scalars().all()
+    plan = (json.loads(raw) if isinstance(raw, str) else raw)[0]
+    return plan, "\n".join(text_plan)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lecturers", type=int, default=20)
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--sessions", type=int, default=50, help="sessions per lecturer")
+    parser.add_argument("--per-session", type=int, default=100, help="attendance rows per session")
+    parser.add_argument("--keep", action="store_true", help="leave the seeded school in place")
+    parser.add_argument("--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        sys.exit(f"EXPLAIN ANALYZE needs PostgreSQL; DATABASE_URL points at {engine.dialect.name}")
+
+    keys = seed(args.lecturers, args.students, args.sessions, args.per_session)
+    misses = 0
+    try:
+        print(f"{keys['rows']} attendance rows seeded")
+        print(f"{'query':<44}{'ms':>9}  {'verdict':<6}index")
+        for label, expected, call in queries(keys):
+            db = SessionLocal()
+            try:
+                with capture() as statements:
+                    call(db)
+            finally:
+                db.close()
+
+            statement, parameters = statements[0]
+            plan, text_plan = explain(statement, parameters)
+            used = plan_indexes(plan["Plan"])
+            ok = bool(used & expected)
+            misses += not ok
+
+            print(f"{label:<44}{plan['Execution Time']:>9.3f}  {'ok' if ok else 'MISS':<6}{', '.join(sorted(used)) or plan['Plan']['Node Type']}")
+            if args.verbose or not ok:
+                if not ok:
+                    print(f"    expected one of: {', '.join(sorted(expected))}")
+                print("    " + text_plan.replace("\n", "\n    "))
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.execute(delete(models.School).where(models.School.id == keys["school_id"]))
+
+    sys.exit(1 if misses else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""
+synthetic_dataset.py
+Deterministic multi-school dataset for scale testing (indexes, pagination, reports).
+
+From one --seed it generates, into the database pointed to by DATABASE_URL:
+- --schools schools with Zipf-skewed sizes (a few large ones, a long tail),
+- --students students spread over them, about one lecturer per 35 students,
+  each lecturer teaching one to three courses,
+- enrolments of four to seven courses per student, skewed towards each school's
+  popular courses,
+- --sessions closed attendance sessions, week by week from --start on each
+  course's weekly slots (Tuesday busiest, Friday light, Saturday rare),
+- one attendance row per student who showed up. The chance of that depends on
+  the course, the weekday, the student and the week of term, and most marks
+  land in the first minutes of a session,
+- attendance_rollups rebuilt from those rows (crud.rebuild_attendance_rollups).
+
+Attendance volume is roughly sessions x 55 present students: the defaults give
+about 270k rows, 200k sessions give tens of millions.
+
+Rows are written in --batch-size chunks, with COPY on PostgreSQL (psycopg2) and
+executemany INSERTs elsewhere, parents first, so foreign keys hold at every
+step. Emails, registration numbers, course codes and session codes all carry
+--prefix and the seed, so several datasets can sit side by side (and next to
+real data) without hitting a unique constraint. All ids and timestamps come
+from the seed; only the shared password hash ("synthetic-password") differs
+between runs.
+
+Usage (from the backend folder):
+    python -m benchmarks.synthetic_dataset --schools 300 --students 50000 --sessions 5000 --seed 1
+    python -m benchmarks.synthetic_dataset --seed 1 --drop
+"""
+
+import argparse
+import csv
+import io
+import random
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterable, List
+
+from sqlalchemy import delete, select, text
+
+PASSWORD = "synthetic-password"
+
+FIRST_NAMES = (
+    "Ada", "Chinedu", "Amara", "Tunde", "Ngozi", "Kwame", "Fatima", "Emeka", "Zainab", "Ibrahim",
+    "Grace", "Samuel", "Aisha", "David", "Blessing", "Yusuf", "Esther", "Daniel", "Halima", "Joseph",
+)
+LAST_NAMES = (
+    "Okafor", "Adeyemi", "Mensah", "Balogun", "Nwosu", "Abubakar", "Eze", "Owusu", "Bello", "Okonkwo",
+    "Ibrahim", "Afolabi", "Danjuma", "Obi", "Lawal", "Mohammed", "Chukwu", "Boateng", "Sani", "Ogunleye",
+)
+DEPARTMENTS = {
+    "CSC": "Computer Science", "MTH": "Mathematics", "PHY": "Physics", "CHM": "Chemistry",
+    "BIO": "Biology", "ECO": "Economics", "ENG": "English", "HIS": "History", "ACC": "Accounting", "LAW": "Law",
+}
+
+# Monday .. Saturday: how often a weekly slot falls on the day, and how many students turn up
+WEEKDAY_SLOT_WEIGHTS = (0.22, 0.25, 0.22, 0.20, 0.09, 0.02)
+WEEKDAY_TURNOUT = (0.92, 0.97, 0.95, 0.90, 0.72, 0.60)
+# Session start hours, weighted towards the morning
+START_HOURS = (8, 9, 10, 11, 12, 13, 14, 15, 16)
+START_HOUR_WEIGHTS = (0.14, 0.22, 0.16, 0.12, 0.06, 0.10, 0.09, 0.07, 0.04)
+TERM_WEEKS = 14
+
+
+def _uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def _zipf(n: int, s: float) -> List[float]:
+    return [1 / (rank + 1) ** s for rank in range(n)]
+
+
+def _split(total: int, weights: List[float], minimum: int) -> List[int]:
+    """total split proportionally to weights, at least minimum each (largest remainder)."""
+    spare = total - minimum * len(weights)
+    scale = spare / sum(weights)
+    shares = [w * scale for w in weights]
+    counts = [minimum + int(share) for share in shares]
+    by_remainder = sorted(range(len(weights)), key=lambda i: shares[i] - int(shares[i]), reverse=True)
+    for i in by_remainder[: total - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def _weighted_sample(rng: random.Random, items: list, weights: List[float], k: int) -> list:
+    """k distinct items, each drawn with probability proportional to its weight."""
+    keyed = sorted(zip(items, weights), key=lambda iw: rng.random() ** (1 / iw[1]), reverse=True)
+    return [item for item, _ in keyed[:k]]
+
+
+# ----------------------------
+# Generation
+# ----------------------------
+class Dataset:
+    """The generated parent rows, plus what attendance generation needs to know about them."""
+
+    def __init__(self):
+        self.schools: List[dict] = []
+        self.lecturers: List[dict] = []
+        self.students: List[dict] = []
+        self.courses: List[dict] = []
+        self.sessions: List[dict] = []
+        # course code -> (turnout rate, [(student_id, student_name, diligence)])
+        self.enrolment: Dict[str, tuple] = {}
+
+
+def build(schools: int, students: int, sessions: int, seed: int, start: date, prefix: str, hashed_password: str) -> Dataset:
+    if students < schools * 2:
+        raise ValueError("need at least two students per school")
+
+    rng = random.Random(f"{prefix}-{seed}")
+    data = Dataset()
+    # Everyone was created some weeks before term started
+    created_base = datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc) - timedelta(days=60)
+
+    size_weights = _zipf(schools, 0.8)
+    rng.shuffle(size_weights)
+    school_sizes = _split(students, size_weights, minimum=2)
+
+    # course code -> [weekday, ...] of its weekly meetings
+    slots: Dict[str, List[int]] = {}
+    course_lecturer: Dict[str, dict] = {}
+
+    for s, size in enumerate(school_sizes):
+        slug = f"{prefix}{seed}s{s:04d}"
+        school = {
+            "id": _uuid(rng),
+            "name": f"{prefix} {seed} school {s:04d}",
+            "created_at": created_base - timedelta(days=365),
+        }
+        data.schools.append(school)
+
+        lecturers = []
+        for n in range(max(2, round(size / 35))):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            lecturer = {
+                "id": _uuid(rng),
+                "full_name": f"{first} {last}",
+                "email": f"{first}.{last}.{n}@staff.{slug}.example.edu".lower(),
+                "hashed_password": hashed_password,
+                "course": None,
+                "is_active": True,
+                "school_id": school["id"],
+                "created_at": created_base + timedelta(minutes=rng.randrange(60 * 24 * 30)),
+            }
+            lecturers.append(lecturer)
+        data.lecturers += lecturers
+
+        courses = []
+        for lecturer in lecturers:
+            for _ in range(rng.randint(1, 3)):
+                dept = rng.choice(list(DEPARTMENTS))
+                # Level digit, then the course's index in the school: unique per school by construction
+                number = f"{rng.randint(1, 4)}{len(courses):03d}"
+                course = {
+                    "id": _uuid(rng),
+                    "title": f"{DEPARTMENTS[dept]} {number}",
+                    "code": f"{slug}-{dept}{number}",
+                    "lecturer_id": lecturer["id"],
+                    "school_id": school["id"],
+                }
+                courses.append(course)
+                course_lecturer[course["code"]] = lecturer
+                meetings = rng.choices((1, 2, 3), (0.3, 0.5, 0.2))[0]
+                days = set()
+                while len(days) < meetings:
+                    days.add(rng.choices(range(6), WEEKDAY_SLOT_WEIGHTS)[0])
+                slots[course["code"]] = sorted(days)
+                data.enrolment[course["code"]] = (rng.uniform(0.6, 0.95), [])
+        data.courses += courses
+
+        popularity = _zipf(len(courses), 1.0)
+        rng.shuffle(popularity)
+        for n in range(size):
+            first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+            student = {
+                "id": _uuid(rng),
+                "full_name": f"{first} {last}",
+                "email": f"{first}.{last}.{n}@{slug}.example.edu".lower(),
+                "hashed_password": hashed_password,
+                "registration_number": f"{slug.upper()}-{n:06d}",
+                "department": rng.choice(list(DEPARTMENTS.values())),
+                "is_active": rng.random() > 0.02,
+                "school_id": school["id"],
+                "created_at": created_base + timedelta(minutes=rng.randrange(60 * 24 * 60)),
+            }
+            data.students.append(student)
+            diligence = rng.uniform(0.7, 1.1)
+            for course in _weighted_sample(rng, courses, popularity, min(rng.randint(4, 7), len(courses))):
+                data.enrolment[course["code"]][1].append((student["id"], student["full_name"], diligence))
+
+    # Sessions: every course meets on its slots, week after week, until there are enough
+    by_code = {course["code"]: course for course in data.courses}
+    week = 0
+    while len(data.sessions) < sessions:
+        for code, days in slots.items():
+            for weekday in days:
+                if len(data.sessions) == sessions:
+                    break
+                course, lecturer = by_code[code], course_lecturer[code]
+                day = start + timedelta(weeks=week, days=weekday)
+                started = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc) + timedelta(
+                    hours=rng.choices(START_HOURS, START_HOUR_WEIGHTS)[0]
+                )
+                data.sessions.append({
+                    "id": _uuid(rng),
+                    "lecturer_id": lecturer["id"],
+                    "lecturer_name": lecturer["full_name"],
+                    "course_code": code,
+                    "course_title": course["title"],
+                    "date": day,
+                    "session_code": f"{prefix.upper()}{seed}-{len(data.sessions):07d}",
+                    "is_active": False,
+                    "closed_at": (started + timedelta(hours=1)).replace(tzinfo=None),
+                    "school_id": course["school_id"],
+                    "created_at": started,
+                    "_weekday": weekday,
+                    "_week": week,
+                })
+        week += 1
+
+    return data
+
+
+def attendance_rows(data: Dataset, seed: int, prefix: str) -> Iterable[dict]:
+    """Attendance of every session, generated lazily (this is the big table)."""
+    rng = random.Random(f"{prefix}-{seed}-attendance")
+    for session in data.sessions:
+        rate, enrolled = data.enrolment[session["course_code"]]
+        # Turnout fades over a term, then recovers at the start of the next
+        fade = 1 - 0.015 * (session["_week"] % TERM_WEEKS)
+        turnout = rate * WEEKDAY_TURNOUT[session["_weekday"]] * fade
+        for student_id, student_name, diligence in enrolled:
+            if rng.random() >= min(turnout * diligence, 0.99):
+                continue
+            yield {
+                "id": _uuid(rng),
+                "student_id": student_id,
+                "student_name": student_name,
+                "lecturer_id": session["lecturer_id"],
+                "lecturer_name": session["lecturer_name"],
+                "session_id": session["id"],
+                "course_code": session["course_code"],
+                "course_title": session["course_title"],
+                "date": session["date"],
+                "status": "present",
+                # Most students mark within minutes of the code going up
+                "created_at": session["created_at"] + timedelta(seconds=min(rng.expovariate(1 / 120), 3000)),
+                "school_id": session["school_id"],
+            }
+
+
+# ----------------------------
+# Writing
+# ----------------------------
+def _csv_value(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return value
+
+
+# Columns the generator fills, per table; the rest keep their defaults
+GENERATED_COLUMNS = {
+    "schools": ("id", "name", "created_at"),
+    "lecturers": ("id", "full_name", "email", "hashed_password", "course", "is_active", "school_id", "created_at"),
+    "students": (
+        "id", "full_name", "email", "hashed_password", "registration_number", "department",
+        "is_active", "school_id", "created_at",
+    ),
+    "courses": ("id", "title", "code", "lecturer_id", "school_id"),
+    "attendance_sessions": (
+        "id", "lecturer_id", "lecturer_name", "course_code", "course_title", "date", "session_code",
+        "is_active", "closed_at", "school_id", "created_at",
+    ),
+    "attendance": (
+        "id", "student_id", "student_name", "lecturer_id", "lecturer_name", "session_id", "course_code",
+        "course_title", "date", "status", "created_at", "school_id",
+    ),
+}
+
+
+class Writer:
+    """Chunked COPY (PostgreSQL + psycopg2) or executemany INSERT into one table at a time."""
+
+    def __init__(self, engine, batch_size: int):
+        self.engine = engine
+        self.batch_size = batch_size
+        self.copy = engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+        self.counts: Counter = Counter()
+
+    def write(self, table, rows: Iterable[dict]) -> None:
+        columns = GENERATED_COLUMNS[table.name]
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == self.batch_size:
+                self._flush(table, columns, batch)
+                batch = []
+        if batch:
+            self._flush(table, columns, batch)
+
+    def _flush(self, table, columns, batch: List[dict]) -> None:
+        with self.engine.begin() as conn:
+            if self.copy:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                for row in batch:
+                    writer.writerow([_csv_value(row[c]) for c in columns])
+                buffer.seek(0)
+                cursor = conn.connection.dbapi_connection.cursor()
+                cursor.copy_expert(f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+            else:
+                conn.execute(table.insert(), [{c: row[c] for c in columns} for row in batch])
+        self.counts[table.name] += len(batch)
+
+
+def generate(engine, schools: int, students: int, sessions: int, seed: int, start: date,
+             prefix: str = "synth", batch_size: int = 50_000) -> Counter:
+    """Generate and write one dataset; returns the rows written per table."""
+    from app import crud, models
+    from app.core.password_pool import pwd_context
+    from sqlalchemy.orm import Session
+
+    data = build(schools, students, sessions, seed, start, prefix, pwd_context.hash(PASSWORD))
+
+    writer = Writer(engine, batch_size)
+    writer.write(models.School.__table__, data.schools)
+    writer.write(models.Lecturer.__table__, data.lecturers)
+    writer.write(models.Student.__table__, data.students)
+    writer.write(models.Course.__table__, data.courses)
+    writer.write(models.AttendanceSession.__table__, data.sessions)
+    writer.write(models.Attendance.__table__, attendance_rows(data, seed, prefix))
+
+    with Session(engine) as db:
+        for school in data.schools:
+            writer.counts["attendance_rollups"] += crud.rebuild_attendance_rollups(db, school["id"])
+
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.execute(text("ANALYZE"))
+    return writer.counts
+
+
+def drop(engine, seed: int, prefix: str = "synth") -> int:
+    """Delete a generated dataset. Explicit per table, so it does not depend on ON DELETE CASCADE."""
+    from app import models
+
+    with engine.begin() as conn:
+        school_ids = conn.execute(
+            select(models.School.id).where(models.School.name.like(f"{prefix} {seed} school %"))
+        ).scalars().all()
+        for model in (
+            models.AttendanceRollup, models.Attendance, models.AttendanceSession,
+            models.Course, models.Student, models.Lecturer,
+        ):
+            conn.execute(delete(model).where(model.school_id.in_(school_ids)))
+        conn.execute(delete(models.School).where(models.School.id.in_(school_ids)))
+    return len(school_ids)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schools", type=int, default=300)
+    parser.add_argument("--students", type=int, default=50_000)
+    parser.add_argument("--sessions", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--start", type=date.fromisoformat, default=date(2025, 1, 6), help="first Monday of term")
+    parser.add_argument("--prefix", default="synth", help="marks the generated names, emails and codes")
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    parser.add_argument("--drop", action="store_true", help="delete the dataset of this --seed/--prefix instead")
+    args = parser.parse_args()
+
+    from app.database import get_engine
+
+    engine = get_engine()
+    started = time.perf_counter()
+    if args.drop:
+        print(f"deleted {drop(engine, args.seed, args.prefix)} schools and everything in them")
+        return
+
+    counts = generate(
+        engine, args.schools, args.students, args.sessions, args.seed, args.start, args.prefix, args.batch_size
+    )
+    elapsed = time.perf_counter() - started
+    print(f"seed {args.seed}, {elapsed:.1f}s, {sum(counts.values()) / elapsed:,.0f} rows/s")
+    for table, count in counts.items():
+        print(f"{table:<22}{count:>14,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Shared pytest setup.
+
+app.config.Settings requires these at import time; the tests never touch a
+real database or Supabase project.
+
+Fixtures: every test that asks for `engine` gets its own in-memory SQLite
+database with all tables (models use the portable Uuid type and client-side
+keys), `db` is a session on it and `client` drives main.create_app(engine).
+`school`, `lecturer`, `student` and `open_session` seed the usual rows, and
+auth_headers() issues a bearer token without going through bcrypt.
+"""
+
+import os
+
+os.environ["DATABASE_URL"] = "sqlite://"
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ.setdefault("SUPABASE_URL", "https://example.supabase.co")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "test-key")
+os.environ.setdefault("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
+# Console only: the default LOG_FILE is the tracked app.log
+os.environ["LOG_FILE"] = ""
+
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.core.principal_cache import principals
+from app.core.session_registry import active_sessions
+from app.database import Base, use_engine
+from app.utils import security
+
+
+def auth_headers(user, role: str) -> dict:
+    return {"Authorization": f"Bearer {security.issue_token(user, role)['access_token']}"}
+
+
+@pytest.fixture
+def engine():
+    # StaticPool: one connection, so every session sees the same in-memory database
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(engine):
+    from app.main import create_app
+
+    # Process-wide caches would otherwise carry sessions and users across tests
+    active_sessions.clear()
+    principals.clear()
+    yield TestClient(create_app(engine))
+    use_engine(None)
+
+
+@pytest.fixture
+def school(db):
+    school = models.School(name="Test School")
+    db.add(school)
+    db.commit()
+    return school
+
+
+@pytest.fixture
+def lecturer(db, school):
+    lecturer = models.Lecturer(full_name="Grace", email="grace@school.edu", hashed_password="x", school_id=school.id)
+    db.add(lecturer)
+    db.commit()
+    return lecturer
+
+
+@pytest.fixture
+def student(db, school):
+    student = models.Student(
+        full_name="Ada", email="ada@school.edu", registration_number="REG-1",
+        hashed_password="x", school_id=school.id,
+    )
+    db.add(student)
+    db.commit()
+    return student
+
+
+@pytest.fixture
+def open_session(db, lecturer):
+    session = models.AttendanceSession(
+        lecturer_id=lecturer.id, lecturer_name=lecturer.full_name,
+        course_code="CS101", course_title="Intro", date=date.today(),
+        session_code="S-TEST01", school_id=lecturer.school_id, is_active=True,
+    )
+    db.add(session)
+    db.commit()
+    return session
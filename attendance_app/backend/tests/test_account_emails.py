@@ -0,0 +1,47 @@
+"""
+Account emails are stored normalized, checked case-insensitively on every write,
+and unique on lower(email) in the database (ix_<table>_email_lower).
+"""
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app import crud, models
+from tests.conftest import auth_headers
+
+
+def test_registration_normalizes_and_rejects_case_variants(client, db, school):
+    body = {
+        "full_name": "Ada Two", "email": "Ada.Two@School.EDU", "registration_number": "REG-9",
+        "password": "secret-pass", "school_name": school.name,
+    }
+    response = client.post("/auth/register/student", json=body)
+    assert response.status_code == 200
+    assert response.json()["email"] == "ada.two@school.edu"
+
+    response = client.post("/auth/register/student", json={**body, "email": "ada.two@school.edu", "registration_number": "REG-10"})
+    assert response.status_code == 400
+    assert crud.student_email_exists(db, "ADA.TWO@school.edu")
+
+
+def test_update_normalizes_and_checks_case_variants(client, db, school, lecturer):
+    other = models.Lecturer(full_name="Alan", email="alan@school.edu", hashed_password="x", school_id=school.id)
+    db.add(other)
+    db.commit()
+    headers = auth_headers(lecturer, "lecturer")
+
+    assert client.put("/lecturers/update", json={"full_name": "Grace", "email": "Alan@School.edu"}, headers=headers).status_code == 400
+
+    response = client.put("/lecturers/update", json={"full_name": "Grace", "email": "Grace.Hopper@School.edu"}, headers=headers)
+    assert response.status_code == 200
+    db.expire_all()
+    assert db.get(models.Lecturer, lecturer.id).email == "grace.hopper@school.edu"
+
+
+def test_case_variants_are_unique_in_the_database(db, student):
+    db.add(models.Student(
+        full_name="Ada", email="ADA@school.edu", registration_number="REG-2",
+        hashed_password="x", school_id=student.school_id,
+    ))
+    with pytest.raises(IntegrityError):
+        db.commit()
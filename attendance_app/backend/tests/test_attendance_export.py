@@ -0,0 +1,62 @@
+"""
+GET /attendance/export: CSV and NDJSON bodies, the date range check, and the
+chunking of app/utils/helpers.py that lets an export start before its query ends.
+"""
+
+import csv
+import io
+import json
+
+from app.utils.helpers import iter_ndjson
+from tests.conftest import auth_headers
+
+
+def _mark(client, student, open_session):
+    response = client.post("/attendance/mark", json={"session_id": str(open_session.id)}, headers=auth_headers(student, "student"))
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_csv_export(client, lecturer, student, open_session):
+    mark = _mark(client, student, open_session)
+
+    response = client.get("/attendance/export", headers=auth_headers(lecturer, "lecturer"))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="attendance.csv"'
+
+    header, *rows = csv.reader(io.StringIO(response.text))
+    assert header[:3] == ["id", "date", "course_code"]
+    assert len(rows) == 1
+    row = dict(zip(header, rows[0]))
+    assert (row["id"], row["student_name"], row["course_code"], row["status"]) == (mark["id"], "Ada", "CS101", "present")
+
+
+def test_ndjson_export_and_filters(client, lecturer, student, open_session):
+    _mark(client, student, open_session)
+    headers = auth_headers(lecturer, "lecturer")
+
+    response = client.get("/attendance/export", params={"format": "ndjson"}, headers=headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    records = [json.loads(line) for line in response.text.splitlines()]
+    assert [(r["student_name"], r["session_id"]) for r in records] == [("Ada", str(open_session.id))]
+
+    response = client.get("/attendance/export", params={"format": "ndjson", "course_code": "CS999"}, headers=headers)
+    assert response.text == ""
+
+
+def test_export_rejects_reversed_date_range(client, lecturer):
+    params = {"date_from": "2025-03-07", "date_to": "2025-03-03"}
+    response = client.get("/attendance/export", params=params, headers=auth_headers(lecturer, "lecturer"))
+    assert response.status_code == 400
+
+
+def test_first_row_is_not_held_back():
+    rows = iter((n,) for n in range(5))
+    chunks = iter_ndjson(["n"], rows, chunk_rows=3)
+
+    assert next(chunks) == '{"n": 0}\n'
+    # Nothing read past the row just sent
+    assert next(rows) == (1,)
+    assert list(chunks) == ['{"n": 2}\n{"n": 3}\n{"n": 4}\n']
@@ -0,0 +1,92 @@
+"""
+attendance_rollups (crud) and GET /lecturers/courses/{course_code}/summary: the
+counts kept up by session creation, marks and deletions match a rebuild from
+scratch, expired sessions included, and summaries are the course lecturer's only.
+"""
+
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from app import crud, models
+from app.core.live_feed import live_feed
+from tests.conftest import auth_headers
+
+
+def _rollups(db):
+    db.expire_all()
+    return sorted(
+        (row.student_name, row.attended, row.total_sessions)
+        for row in db.scalars(select(models.AttendanceRollup))
+    )
+
+
+def test_rollups_follow_sessions_and_marks(client, db, school, lecturer, student):
+    bob = models.Student(full_name="Bob", email="bob@school.edu", registration_number="REG-2", hashed_password="x", school_id=school.id)
+    # Registered under Grace, never marks
+    cy = models.Student(
+        full_name="Cy", email="cy@school.edu", registration_number="REG-3",
+        hashed_password="x", school_id=school.id, lecturer_id=lecturer.id,
+    )
+    db.add_all([bob, cy])
+    db.commit()
+    as_grace = auth_headers(lecturer, "lecturer")
+
+    def create(day):
+        body = {"course_code": "CS101", "course_title": "Intro", "date": day.isoformat()}
+        response = client.post("/lecturers/create_session", json=body, headers=as_grace)
+        assert response.status_code == 200
+        return response.json()["id"]
+
+    def mark(who, session_id):
+        response = client.post("/attendance/mark", json={"session_id": session_id}, headers=auth_headers(who, "student"))
+        assert response.status_code == 200
+        return response.json()["id"]
+
+    def summary():
+        response = client.get("/lecturers/courses/CS101/summary", headers=as_grace)
+        assert response.status_code == 200
+        return [(row["student_name"], row["attended"], row["total_sessions"], row["percentage"]) for row in response.json()]
+
+    first = create(date.today())
+    mark(student, first)
+    bobs_mark = mark(bob, first)
+    assert _rollups(db) == [("Ada", 1, 1), ("Bob", 1, 1)]
+
+    # Left to expire: never closed, still counted
+    create(date.today() - timedelta(days=1))
+    assert _rollups(db) == [("Ada", 1, 2), ("Bob", 1, 2)]
+
+    third = create(date.today())
+    mark(student, third)
+    assert client.post(f"/lecturers/sessions/{third}/close", headers=as_grace).status_code == 200
+    assert client.delete(f"/attendance/{bobs_mark}", headers=as_grace).status_code == 204
+    assert _rollups(db) == [("Ada", 2, 3)]
+
+    # Cy never marked, but is registered under Grace
+    assert summary() == [("Ada", 2, 3, 66.7), ("Cy", 0, 3, 0.0)]
+    incremental = _rollups(db)
+    crud.rebuild_attendance_rollups(db)
+    assert _rollups(db) == incremental
+
+
+def test_course_summary_is_the_lecturers_own(client, db, school, lecturer, open_session):
+    other = models.Lecturer(full_name="Alan", email="alan@school.edu", hashed_password="x", school_id=school.id)
+    db.add(other)
+    db.commit()
+
+    assert client.get("/lecturers/courses/CS101/summary", headers=auth_headers(lecturer, "lecturer")).json() == []
+    assert client.get("/lecturers/courses/CS101/summary", headers=auth_headers(other, "lecturer")).status_code == 404
+
+
+def test_closing_twice_closes_once(db, open_session, monkeypatch):
+    published = []
+    monkeypatch.setattr(live_feed, "publish", lambda session_id, kind, payload: published.append(kind))
+
+    crud.close_attendance_session(db, open_session)
+    closed_at = open_session.closed_at
+    crud.close_attendance_session(db, open_session)
+
+    assert open_session.is_active is False
+    assert open_session.closed_at == closed_at
+    assert published == ["closed"]
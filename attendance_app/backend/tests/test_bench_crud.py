@@ -0,0 +1,43 @@
+"""
+benchmarks.bench_crud: every crud function has a case (or is timed through its
+callers), every case runs on the SQLite fixture database, and compare() flags
+slowdowns beyond the threshold.
+"""
+
+from datetime import date
+
+from sqlalchemy.orm import sessionmaker
+
+from benchmarks import bench_crud
+from benchmarks.synthetic_dataset import generate
+
+
+def test_every_crud_function_is_benchmarked():
+    functions = bench_crud.crud_functions()
+    assert functions - bench_crud.covered_functions() - bench_crud.INDIRECT == set()
+    assert bench_crud.covered_functions() | bench_crud.INDIRECT <= functions
+
+
+def test_every_case_runs(engine):
+    generate(engine, schools=2, students=60, sessions=20, seed=5, start=date(2025, 1, 6))
+    with sessionmaker(bind=engine)() as db:
+        subjects = bench_crud.Subjects(db, 5, "synth")
+
+    # The largest serialization sizes take seconds on their own
+    names = [name for name in bench_crud.CASES if not name.endswith("[10000]")]
+    results = bench_crud.run(engine, subjects, names, rounds=1, round_s=0.0, out=None)
+
+    assert {name: r["error"] for name, r in results.items() if "error" in r} == {}
+    assert all(r["calls"] >= 1 for r in results.values())
+
+
+def test_compare_flags_regressions():
+    baseline = {"fast": {"median_us": 100.0}, "slow": {"median_us": 100.0}}
+    current = {
+        "fast": {"median_us": 110.0},
+        "slow": {"median_us": 130.0},
+        "broken": {"error": "OperationalError: no such table"},
+        "new": {"median_us": 5.0},
+    }
+    _, regressions = bench_crud.compare(current, baseline, threshold=0.25)
+    assert regressions == ["slow", "broken"]
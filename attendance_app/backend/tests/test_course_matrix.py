@@ -0,0 +1,105 @@
+"""
+GET /lecturers/courses/{course_code}/matrix (app/reports.py): a known small
+matrix, and each lecturer sees only their own sessions of a course.
+"""
+
+from datetime import date
+
+import pytest
+from sqlalchemy import event
+
+from app import models, reports
+from tests.conftest import auth_headers
+
+
+def _session(db, lecturer, day):
+    session = models.AttendanceSession(
+        lecturer_id=lecturer.id, lecturer_name=lecturer.full_name,
+        course_code="CS101", course_title="Intro", date=day,
+        session_code=f"S-{lecturer.full_name[:2].upper()}{day.day:04d}", school_id=lecturer.school_id, is_active=False,
+    )
+    db.add(session)
+    db.flush()
+    return session
+
+
+def _mark(db, student, session):
+    db.add(models.Attendance(
+        student_id=student.id, student_name=student.full_name,
+        lecturer_id=session.lecturer_id, lecturer_name=session.lecturer_name, session_id=session.id,
+        course_code=session.course_code, course_title=session.course_title, date=session.date,
+        status="present", school_id=session.school_id,
+    ))
+
+
+@pytest.fixture
+def course(db, school, lecturer, student):
+    """Grace's three CS101 sessions: Ada attends the 1st and 3rd, Bob the 2nd and 3rd.
+    Alan runs a CS101 session of his own, attended by Cy."""
+    bob = models.Student(full_name="Bob", email="bob@school.edu", registration_number="REG-2", hashed_password="x", school_id=school.id)
+    cy = models.Student(full_name="Cy", email="cy@school.edu", registration_number="REG-3", hashed_password="x", school_id=school.id)
+    alan = models.Lecturer(full_name="Alan", email="alan@school.edu", hashed_password="x", school_id=school.id)
+    db.add_all([bob, cy, alan])
+    db.flush()
+
+    # Monday, Wednesday, Friday
+    first, second, third = (_session(db, lecturer, date(2025, 3, day)) for day in (3, 5, 7))
+    for attendee, session in ((student, first), (student, third), (bob, second), (bob, third)):
+        _mark(db, attendee, session)
+    _mark(db, cy, _session(db, alan, date(2025, 3, 4)))
+    db.commit()
+    return alan
+
+
+def test_matrix_of_known_course(client, lecturer, course):
+    response = client.get("/lecturers/courses/CS101/matrix", headers=auth_headers(lecturer, "lecturer"))
+    assert response.status_code == 200
+    body = response.json()
+
+    assert (body["students_count"], body["sessions_count"]) == (2, 3)
+    assert [s["date"] for s in body["sessions"]] == ["2025-03-03", "2025-03-05", "2025-03-07"]
+    assert [(s["turnout"], s["turnout_rate"]) for s in body["sessions"]] == [(1, 50.0), (1, 50.0), (2, 100.0)]
+    assert [
+        (s["student_name"], s["attendance"], s["attended"], s["rate"], s["current_streak"], s["longest_streak"])
+        for s in body["students"]
+    ] == [("Ada", "101", 2, 66.7, 1, 1), ("Bob", "011", 2, 66.7, 2, 2)]
+    assert body["weekdays"] == [
+        {"weekday": "Monday", "sessions": 1, "turnout_rate": 50.0},
+        {"weekday": "Wednesday", "sessions": 1, "turnout_rate": 50.0},
+        {"weekday": "Friday", "sessions": 1, "turnout_rate": 100.0},
+    ]
+
+
+def test_matrix_is_scoped_to_the_lecturer(client, db, school, course):
+    alan = course
+    response = client.get("/lecturers/courses/CS101/matrix", headers=auth_headers(alan, "lecturer"))
+    assert response.status_code == 200
+    assert [s["student_name"] for s in response.json()["students"]] == ["Cy"]
+    assert response.json()["sessions_count"] == 1
+
+    stranger = models.Lecturer(full_name="Eve", email="eve@school.edu", hashed_password="x", school_id=school.id)
+    db.add(stranger)
+    db.commit()
+    assert client.get("/lecturers/courses/CS101/matrix", headers=auth_headers(stranger, "lecturer")).status_code == 404
+
+
+def test_matrix_is_read_in_one_statement(db, engine, lecturer, course):
+    # An unattended session is a column of zeros
+    _session(db, lecturer, date(2025, 3, 10))
+    db.commit()
+    school_id, lecturer_id = lecturer.school_id, lecturer.id
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        matrix = reports.fetch_course_matrix(db, school_id, lecturer_id, "CS101")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(statements) == 1
+    assert matrix.student_names == ["Ada", "Bob"]
+    assert matrix.present.astype(int).tolist() == [[1, 0, 1, 0], [0, 1, 1, 0]]
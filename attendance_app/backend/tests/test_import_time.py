@@ -0,0 +1,55 @@
+"""
+Cold-start guard: what `import app.main` loads and how long it takes.
+
+Measured in a fresh interpreter with `python -X importtime`, which reports the
+cumulative microseconds of every import on stderr. The module check is exact;
+the time budget is best-of-N against IMPORT_TIME_BUDGET_MS (default 1500), which
+slow CI machines can raise through the environment.
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", 1500))
+RUNS = 3
+
+# Loaded on first use, never at startup
+DEFERRED_MODULES = {
+    "supabase",                     # app.utils.storage.get_supabase
+    "numpy",                        # app.reports, imported by the matrix route
+    "PIL",                          # app.core.image_pool worker processes
+    "app.routes.debug_attendance",  # settings.ENABLE_DEBUG_ROUTES
+}
+
+
+def import_profile():
+    """{module: cumulative_us} for one `import app.main` in a new interpreter."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR,
+        env={**os.environ, "ENABLE_DEBUG_ROUTES": "false"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        if cumulative.strip().isdigit():
+            profile[module.strip()] = int(cumulative)
+    return profile
+
+
+def test_startup_does_not_import_deferred_modules():
+    imported = set(import_profile())
+    assert not DEFERRED_MODULES & imported
+
+
+def test_import_time_budget():
+    best_ms = min(import_profile()["app.main"] for _ in range(RUNS)) / 1000
+    assert best_ms < BUDGET_MS, f"import app.main took {best_ms:.0f} ms (budget {BUDGET_MS:.0f} ms)"
@@ -0,0 +1,148 @@
+"""
+Live attendance streams (app/core/live_feed.py and GET /lecturers/sessions/{id}/stream):
+committed marks reach open streams with running counts, closing ends them, and a
+stream that falls behind is cut off.
+"""
+
+import asyncio
+import json
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+from app import models
+from app.core.live_feed import LAGGED, LiveFeed, LocalBackend, live_feed
+from app.core.principal_cache import principals
+from app.database import Base, use_engine
+from app.main import create_app
+from app.routes import lecturers
+from tests.conftest import auth_headers
+
+
+def _event(chunk: bytes):
+    """(event, payload) of one SSE message."""
+    fields = dict(line.split(": ", 1) for line in chunk.decode().strip().splitlines())
+    return fields["event"], json.loads(fields["data"])
+
+
+def test_stream_pushes_marks_and_counts(client, lecturer, student, open_session):
+    session_id = open_session.id
+
+    def post(path, **kwargs):
+        # In a thread: the app's sync routes publish from threadpool threads as well
+        return asyncio.get_running_loop().run_in_executor(None, lambda: client.post(path, **kwargs))
+
+    async def scenario():
+        subscription = live_feed.subscribe(session_id)
+        session, records = lecturers._session_snapshot(session_id, lecturer)
+        events = lecturers._session_events(subscription, session, records)
+
+        received = [_event(await events.__anext__())]
+        response = await post("/attendance/mark", json={"session_id": str(session_id)}, headers=auth_headers(student, "student"))
+        assert response.status_code == 200
+        received.append(_event(await asyncio.wait_for(events.__anext__(), 5)))
+
+        response = await post(f"/lecturers/sessions/{session_id}/close", headers=auth_headers(lecturer, "lecturer"))
+        assert response.status_code == 200
+        received.append(_event(await asyncio.wait_for(events.__anext__(), 5)))
+        return received, events
+
+    (snapshot, mark, closed), events = asyncio.run(scenario())
+
+    assert snapshot[0] == "snapshot"
+    assert snapshot[1]["records"] == [] and snapshot[1]["counts"] == {"marked": 0, "by_status": {}}
+    assert mark[0] == "mark"
+    assert mark[1]["record"]["student_name"] == "Ada"
+    assert mark[1]["counts"] == {"marked": 1, "by_status": {"present": 1}}
+    assert closed == ("closed", {"counts": {"marked": 1, "by_status": {"present": 1}}})
+    assert live_feed.stats()["streams"] == 0
+
+
+def test_stream_route(client, db, school, lecturer, open_session):
+    other = models.Lecturer(full_name="Alan", email="alan@school.edu", hashed_password="x", school_id=school.id)
+    db.add(other)
+    db.commit()
+    path = f"/lecturers/sessions/{open_session.id}/stream"
+
+    assert client.get(path, headers=auth_headers(other, "lecturer")).status_code == 404
+
+    # A closed session's stream is finite: the snapshot, then closed
+    client.post(f"/lecturers/sessions/{open_session.id}/close", headers=auth_headers(lecturer, "lecturer"))
+    response = client.get(path, headers=auth_headers(lecturer, "lecturer"))
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = [_event(chunk.encode()) for chunk in response.text.split("\n\n") if chunk]
+    assert [name for name, _ in events] == ["snapshot", "closed"]
+    assert events[0][1]["session"]["session_code"] == "S-TEST01"
+
+
+def test_lagging_stream_is_cut_off():
+    feed = LiveFeed(LocalBackend(), queue_size=2)
+
+    async def scenario():
+        subscription = feed.subscribe("session")
+        for n in range(3):
+            feed.publish("session", "mark", {"n": n})
+        await asyncio.sleep(0)
+        return await subscription.get()
+
+    assert asyncio.run(scenario()) is LAGGED
+    assert feed.stats()["lagged"] == 1 and feed.stats()["streams"] == 0
+
+
+def test_open_stream_holds_no_connection(tmp_path, school, lecturer, open_session):
+    # A real pool on a file database (the fixtures' StaticPool has no checkout count),
+    # seeded from the in-memory fixtures
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=QueuePool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add_all([
+            models.School(id=school.id, name=school.name),
+            models.Lecturer(id=lecturer.id, full_name=lecturer.full_name, email=lecturer.email, hashed_password="x", school_id=school.id),
+        ])
+        db.flush()
+        db.add(models.AttendanceSession(
+            id=open_session.id, lecturer_id=lecturer.id, lecturer_name=lecturer.full_name,
+            course_code="CS101", course_title="Intro", date=open_session.date,
+            session_code=open_session.session_code, school_id=school.id, is_active=True,
+        ))
+        db.commit()
+    principals.clear()
+    app = create_app(engine)
+
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http", "root_path": "",
+        "path": f"/lecturers/sessions/{open_session.id}/stream", "raw_path": b"", "query_string": b"",
+        "headers": [(b"authorization", auth_headers(lecturer, "lecturer")["Authorization"].encode())],
+        "client": ("test", 1), "server": ("test", 80),
+    }
+
+    async def scenario():
+        first_chunk, disconnect = asyncio.Event(), asyncio.Event()
+        checked_out = []
+        requested = False
+
+        async def receive():
+            nonlocal requested
+            if not requested:
+                requested = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body") and not first_chunk.is_set():
+                # The snapshot is out and the stream is waiting for marks
+                checked_out.append(engine.pool.checkedout())
+                first_chunk.set()
+                disconnect.set()
+
+        await asyncio.wait_for(app(scope, receive, send), 5)
+        return checked_out
+
+    try:
+        assert asyncio.run(scenario()) == [0]
+    finally:
+        use_engine(None)
+        engine.dispose()
@@ -0,0 +1,85 @@
+"""
+Query-count guard for the login path.
+
+Every login attempt, successful or not, must cost exactly one SELECT
+(crud.get_user_for_login) before bcrypt runs.
+"""
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.core.password_pool import password_pool, pwd_context
+from app.database import get_db
+from app.utils import security
+
+PASSWORD = "correct-horse"
+
+
+@pytest.fixture
+def db(engine, monkeypatch):
+    session = sessionmaker(bind=engine, autoflush=False)()
+
+    hashed = pwd_context.hash(PASSWORD)
+    school = models.School(name="Test School")
+    session.add(school)
+    session.flush()
+    session.add_all([
+        models.Student(full_name="Ada", email="ada@school.edu", registration_number="REG-1",
+                       hashed_password=hashed, school_id=school.id, is_active=True),
+        models.Lecturer(full_name="Grace", email="grace@school.edu",
+                        hashed_password=hashed, school_id=school.id, is_active=True),
+        models.Admin(full_name="Root", email="root@school.edu", hashed_password=hashed, is_active=True),
+    ])
+    session.commit()
+
+    # Verify inline: the pool's worker processes are not what is being measured
+    monkeypatch.setattr(password_pool, "verify", pwd_context.verify)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    session.statements = statements
+    yield session
+    session.close()
+
+
+@pytest.mark.parametrize("role,email", [
+    ("student", "ada@school.edu"),
+    ("lecturer", "grace@school.edu"),
+    ("admin", "root@school.edu"),
+    ("student", "ADA@School.edu"),
+])
+def test_successful_login_is_one_query(db, role, email):
+    token = security.login(db, role, email, PASSWORD)
+
+    assert token["role"] == role
+    assert len(db.statements) == 1
+
+
+@pytest.mark.parametrize("email,password", [
+    ("ada@school.edu", "wrong-password"),
+    ("nobody@school.edu", PASSWORD),
+])
+def test_failed_login_is_one_query(db, email, password):
+    with pytest.raises(HTTPException) as exc:
+        security.login(db, "student", email, password)
+
+    assert exc.value.status_code == 401
+    assert len(db.statements) == 1
+
+
+def test_login_route_is_one_query(db):
+    from app.main import app
+
+    app.dependency_overrides[get_db] = lambda: db
+    try:
+        response = TestClient(app).post("/auth/login/student", json={"email": "ada@school.edu", "password": PASSWORD})
+    finally:
+        app.dependency_overrides.clear()
+
+    assert response.status_code == 200
+    assert response.json()["expires_in"] == 30 * 60
+    assert len(db.statements) == 1
@@ -0,0 +1,81 @@
+"""
+The student marking path end to end, on the in-memory SQLite fixtures:
+session code check, the single-statement mark, and its rejections.
+"""
+
+import uuid
+from datetime import date, timedelta
+
+from sqlalchemy import event
+
+from app import models
+from app.core.live_feed import live_feed
+from tests.conftest import auth_headers
+
+
+def test_verify_code_then_mark(client, student, open_session):
+    headers = auth_headers(student, "student")
+
+    response = client.post("/students/verify_session_code", params={"session_code": "S-TEST01"}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["id"] == str(open_session.id)
+
+    response = client.post("/attendance/mark", json={"session_id": str(open_session.id)}, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["student_name"] == "Ada"
+    assert response.json()["course_code"] == "CS101"
+
+
+def test_second_mark_is_rejected(client, db, student, open_session):
+    headers = auth_headers(student, "student")
+    body = {"session_id": str(open_session.id)}
+
+    assert client.post("/attendance/mark", json=body, headers=headers).status_code == 200
+    response = client.post("/attendance/mark", json=body, headers=headers)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Attendance already marked for this session"
+    assert db.query(models.Attendance).count() == 1
+
+
+def test_expired_session_is_rejected(client, db, student, open_session):
+    open_session.date = date.today() - timedelta(days=1)
+    db.commit()
+
+    response = client.post(
+        "/attendance/mark", json={"session_id": str(open_session.id)}, headers=auth_headers(student, "student")
+    )
+
+    assert response.status_code == 400
+    assert db.query(models.Attendance).count() == 0
+
+
+def test_mark_queries(client, engine, student, open_session):
+    headers = auth_headers(student, "student")
+    body = {"session_id": str(open_session.id)}
+    # Load the principal first; the cached lookup is what a marking burst sees
+    client.get("/students/me", headers=headers)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    response = client.post("/attendance/mark", json=body, headers=headers)
+
+    assert response.status_code == 200
+    # The attendance insert and the rollup upsert
+    assert len(statements) == 2
+
+
+def test_delete_record(client, db, lecturer, student, open_session, monkeypatch):
+    published = []
+    monkeypatch.setattr(live_feed, "publish", lambda session_id, kind, payload: published.append((kind, payload)))
+    mark = client.post("/attendance/mark", json={"session_id": str(open_session.id)}, headers=auth_headers(student, "student")).json()
+    headers = auth_headers(lecturer, "lecturer")
+
+    assert client.delete(f"/attendance/{mark['id']}", headers=headers).status_code == 204
+    assert db.query(models.Attendance).count() == 0
+    # The same id, of the same type, as the "mark" event carried
+    assert [kind for kind, _ in published] == ["mark", "unmark"]
+    assert published[1][1] == {"id": published[0][1]["id"]} == {"id": uuid.UUID(mark["id"])}
+
+    assert client.delete(f"/attendance/{mark['id']}", headers=headers).status_code == 404
+    assert client.delete("/attendance/not-a-uuid", headers=headers).status_code == 422
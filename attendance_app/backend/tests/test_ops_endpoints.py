@@ -0,0 +1,43 @@
+"""
+Operational endpoints (app/main.py): /health is a bare liveness check, while
+/metrics and the detailed health stats need METRICS_TOKEN and are off without it.
+"""
+
+import pytest
+
+from app.config import Settings, settings
+from app.core.metrics import Metrics, RequestTimer
+
+GUARDED = ("/metrics", "/health/details", "/health/db-pool")
+
+
+def test_health_is_bare(client):
+    response = client.get("/health")
+    assert response.status_code == 200
+    assert set(response.json()) == {"status", "timestamp"}
+
+
+def test_no_token_is_shipped():
+    # Off unless the deployment sets one; never open by default
+    assert Settings.model_fields["METRICS_TOKEN"].default == ""
+
+
+@pytest.mark.parametrize("path", GUARDED)
+def test_guarded_endpoints_are_off_without_a_token(client, monkeypatch, path):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "")
+    assert client.get(path).status_code == 404
+
+
+@pytest.mark.parametrize("path", GUARDED)
+def test_guarded_endpoints_need_the_token(client, monkeypatch, path):
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-me")
+    assert client.get(path).status_code == 401
+    assert client.get(path, headers={"Authorization": "Bearer wrong"}).status_code == 401
+    assert client.get(path, headers={"Authorization": "Bearer scrape-me"}).status_code == 200
+
+
+def test_school_label_is_opt_in():
+    for school_label, labels in ((False, 'method="GET",route="/x"'), (True, 'method="GET",route="/x",school="s1"')):
+        metrics = Metrics(school_label)
+        metrics.observe_request("GET", "/x", 200, "s1", 0.01, RequestTimer())
+        assert f'http_requests_total{{{labels},status="200"}} 1' in metrics.render()
@@ -0,0 +1,47 @@
+"""
+app/core/password_pool.py recovers from a dead worker: the broken executor is
+replaced and the call that hit it is retried once.
+"""
+
+import asyncio
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.core.password_pool import PasswordPool, pwd_context
+
+HASHED = pwd_context.hash("correct-horse")
+
+
+@pytest.fixture
+def pool():
+    pool = PasswordPool(workers=1, max_pending=10)
+    yield pool
+    pool.shutdown()
+
+
+def _kill_worker(pool):
+    executor, future = pool._submit("hash", os._exit, 1)
+    with pytest.raises(BrokenProcessPool):
+        future.result()
+    return executor
+
+
+def test_broken_pool_is_replaced(pool):
+    broken = _kill_worker(pool)
+
+    assert pool.verify("correct-horse", HASHED)
+    assert asyncio.run(pool.verify_async("wrong", HASHED)) is False
+    assert pool._executor is not broken
+    assert pool.stats()["restarts"] == 1
+    assert pool.stats()["queue_depth"] == 0
+
+
+def test_retry_is_once(pool):
+    # A call that kills its worker every time: one retry, then the error
+    with pytest.raises(BrokenProcessPool):
+        pool._call("hash", os._exit, 1)
+
+    assert pool.stats()["restarts"] == 2
+    assert pool.verify("correct-horse", HASHED)
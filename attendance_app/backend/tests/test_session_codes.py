@@ -0,0 +1,56 @@
+"""
+Session codes (app/core/session_codes.py): distinct per school by construction,
+numbered by schools.session_code_seq, and accepted the way students type them.
+"""
+
+import re
+import uuid
+from datetime import date
+
+from app import models
+from app.core import session_codes
+from tests.conftest import auth_headers
+
+CODE = re.compile(r"^[0-9A-HJKMNP-TV-Z]{3}-[0-9A-HJKMNP-TV-Z]{3}$")
+
+
+def test_permutation_never_repeats():
+    key = b"k" * 32
+    values = [session_codes.permute(key, n) for n in range(1 << 16)]
+    assert len(set(values)) == len(values)
+    assert all(0 <= v < session_codes.CAPACITY for v in values)
+
+
+def test_codes_are_short_and_keyed_by_school():
+    school_a, school_b = uuid.uuid4(), uuid.uuid4()
+    codes = [session_codes.session_code(school_a, n) for n in range(1, 1001)]
+    assert all(CODE.match(code) for code in codes)
+    assert len(set(codes)) == 1000
+    assert codes != [session_codes.session_code(school_b, n) for n in range(1, 1001)]
+
+
+def test_normalize_reads_typed_codes():
+    assert session_codes.normalize(" 7kq m2d ") == "7KQ-M2D"
+    assert session_codes.normalize("oil-abc") == "011-ABC"
+    assert session_codes.normalize("s-test01") == "S-TEST01"
+
+
+def test_created_sessions_take_the_next_codes(client, db, school, lecturer, student):
+    headers = auth_headers(lecturer, "lecturer")
+    body = {"course_code": "CS101", "course_title": "Intro", "date": date.today().isoformat()}
+
+    codes = [client.post("/lecturers/create_session", json=body, headers=headers).json()["session_code"] for _ in range(3)]
+    assert codes == [session_codes.session_code(school.id, n) for n in (1, 2, 3)]
+    db.refresh(school)
+    assert school.session_code_seq == 3
+
+    typed = codes[-1].replace("-", "").lower()
+    response = client.post("/students/verify_session_code", params={"session_code": typed}, headers=auth_headers(student, "student"))
+    assert response.status_code == 200
+    assert response.json()["session_code"] == codes[-1]
+
+    # Another school counts from 1 again without clashing
+    other = models.School(name="Other School")
+    db.add(other)
+    db.commit()
+    assert session_codes.session_code(other.id, 1) != codes[0]
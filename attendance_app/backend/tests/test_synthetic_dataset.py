@@ -0,0 +1,51 @@
+"""
+benchmarks.synthetic_dataset on the SQLite fixture database: the same seed gives
+the same rows, and the rows satisfy the models' keys and the rollup invariant.
+"""
+
+from datetime import date
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.pool import StaticPool
+
+from app import models
+from app.database import Base
+from benchmarks.synthetic_dataset import drop, generate
+
+ARGS = dict(schools=4, students=200, sessions=60, seed=3, start=date(2025, 1, 6))
+
+
+def _ids(engine, model):
+    with engine.connect() as conn:
+        return conn.execute(select(model.id).order_by(model.id)).scalars().all()
+
+
+def test_same_seed_same_rows(engine):
+    other = create_engine("sqlite://", poolclass=StaticPool)
+    Base.metadata.create_all(other)
+
+    counts = generate(engine, **ARGS)
+    assert generate(other, **ARGS) == counts
+    assert counts["schools"] == 4 and counts["students"] == 200 and counts["attendance_sessions"] == 60
+    for model in (models.Student, models.AttendanceSession, models.Attendance):
+        assert _ids(engine, model) == _ids(other, model)
+    other.dispose()
+
+
+def test_rows_are_consistent(engine):
+    counts = generate(engine, **ARGS)
+    attendance, student, session = models.Attendance, models.Student, models.AttendanceSession
+
+    with engine.connect() as conn:
+        # Every mark belongs to a student and a session of its own school
+        assert conn.execute(
+            select(func.count())
+            .select_from(attendance)
+            .join(student, student.id == attendance.student_id)
+            .join(session, session.id == attendance.session_id)
+            .where(student.school_id == attendance.school_id, session.school_id == attendance.school_id)
+        ).scalar() == counts["attendance"]
+        assert conn.execute(select(func.sum(models.AttendanceRollup.attended))).scalar() == counts["attendance"]
+
+    assert drop(engine, ARGS["seed"]) == 4
+    assert _ids(engine, models.Attendance) == []
@@ -79,7 +79,6 @@ function loadLecturerDashboard() {
       console.error(err);
     });
 
-  loadLecturerAttendance();
   loadLecturerSessions();
 }
 
@@ -89,45 +88,143 @@ function loadLecturerSessions() {
     headers: getHeaders(),
   })
     .then((res) => res.json())
-    .then((sessions) => {
+    .then((page) => {
+      const sessions = page.items;
       const box = document.getElementById("sessionCodeBox");
       const span = document.getElementById("generatedSessionCode");
 
+      const active = sessions.filter((session) => session.is_active);
       if (sessions.length > 0) {
         box.innerHTML = "";
         box.classList.remove("d-none");
-        sessions
-          .filter((session) => session.is_active)
-          .forEach((session) => renderSession(session));
+        active.forEach((session) => {
+          renderSession(session);
+          watchSession(session.id);
+        });
       }
+
+      // Stop watching sessions that were closed meanwhile
+      Object.keys(liveStreams)
+        .filter((id) => !active.some((session) => session.id === id))
+        .forEach((id) => stopWatching(id));
     });
 }
 
-// Load lecturer attendance
-function loadLecturerAttendance() {
-  fetch(`${API_BASE}/lecturers/me/attendance`, {
+// ===============================
+// LIVE ATTENDANCE (Server-Sent Events)
+// ===============================
+// Each open session streams its marks from /lecturers/sessions/{id}/stream:
+// a snapshot first, then every new mark with the running counts. Read with
+// fetch rather than EventSource, which cannot send the Authorization header.
+const liveStreams = {};
+const liveCounts = {}; // last counts per session, kept across re-renders
+
+function watchSession(sessionId) {
+  if (liveStreams[sessionId]) return;
+  const controller = new AbortController();
+  liveStreams[sessionId] = controller;
+  let closed = false;
+
+  fetch(`${API_BASE}/lecturers/sessions/${sessionId}/stream`, {
     headers: getHeaders(),
+    signal: controller.signal,
   })
-    .then((res) => res.json())
-    .then((attendance) => {
-      const tbody = document
-        .getElementById("lecturerAttendanceTable")
-        .querySelector("tbody");
+    .then(async (res) => {
+      if (!res.ok) {
+        closed = true; // not ours, or gone: do not retry
+        throw new Error(`Live feed unavailable (${res.status})`);
+      }
+      const reader = res.body.pipeThrough(new TextDecoderStream()).getReader();
+      let buffer = "";
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += value;
+        let end;
+        while ((end = buffer.indexOf("\n\n")) >= 0) {
+          const message = buffer.slice(0, end);
+          buffer = buffer.slice(end + 2);
+          if (handleLiveEvent(sessionId, message) === "closed") closed = true;
+        }
+      }
+    })
+    .catch((err) => {
+      if (err.name !== "AbortError") console.error(err);
+    })
+    .finally(() => {
+      if (liveStreams[sessionId] !== controller) return;
+      delete liveStreams[sessionId];
+      // Dropped connection (or a lagging stream cut off by the server): reconnect,
+      // the new snapshot replaces this session's rows
+      if (!closed && !controller.signal.aborted) {
+        setTimeout(() => watchSession(sessionId), 3000);
+      }
+    });
+}
 
-      tbody.innerHTML = "";
+function stopWatching(sessionId) {
+  const controller = liveStreams[sessionId];
+  if (!controller) return;
+  delete liveStreams[sessionId];
+  controller.abort();
+}
 
-      attendance.forEach((rec, idx) => {
-        tbody.innerHTML += `
-          <tr>
-            <td>${idx + 1}</td>
-            <td>${rec.student_name}</td>
-            <td>${rec.course_code || "N/A"}</td>
-            <td>${rec.date}</td>
-            <td>${rec.status}</td>
-          </tr>
-        `;
-      });
-    });
+// Returns the event name
+function handleLiveEvent(sessionId, message) {
+  let event = "message";
+  let data = "";
+  message.split("\n").forEach((line) => {
+    if (line.startsWith("event:")) event = line.slice(6).trim();
+    else if (line.startsWith("data:")) data += line.slice(5).trim();
+  });
+  if (!data) return event; // keep-alive comment
+
+  const payload = JSON.parse(data);
+  if (event === "snapshot") {
+    removeAttendanceRows(sessionId);
+    payload.records.forEach((rec) => addAttendanceRow(rec));
+  } else if (event === "mark") {
+    addAttendanceRow(payload.record);
+  } else if (event === "unmark") {
+    const row = document.getElementById(`attendance-${payload.id}`);
+    if (row) row.remove();
+  }
+  updateMarkedCount(sessionId, payload.counts);
+  renumberAttendanceRows();
+  return event;
+}
+
+function attendanceBody() {
+  return document.getElementById("lecturerAttendanceTable").querySelector("tbody");
+}
+
+function addAttendanceRow(rec) {
+  if (document.getElementById(`attendance-${rec.id}`)) return;
+  const row = attendanceBody().insertRow();
+  row.id = `attendance-${rec.id}`;
+  row.dataset.session = rec.session_id;
+  ["", rec.student_name, rec.course_code || "N/A", rec.date, rec.status].forEach(
+    (value) => (row.insertCell().textContent = value)
+  );
+}
+
+function removeAttendanceRows(sessionId) {
+  attendanceBody()
+    .querySelectorAll(`tr[data-session="${sessionId}"]`)
+    .forEach((row) => row.remove());
+}
+
+function renumberAttendanceRows() {
+  attendanceBody()
+    .querySelectorAll("tr")
+    .forEach((row, idx) => (row.cells[0].textContent = idx + 1));
+}
+
+function updateMarkedCount(sessionId, counts) {
+  if (!counts) return;
+  liveCounts[sessionId] = counts;
+  const badge = document.getElementById(`count-${sessionId}`);
+  if (badge) badge.textContent = `${counts.marked} marked`;
 }
 
 // Bind session form ONCE
@@ -212,7 +309,8 @@ function loadStudentAttendance() {
     headers: getHeaders(),
   })
     .then((res) => res.json())
-    .then((attendance) => {
+    .then((page) => {
+      const attendance = page.items;
       const tbody = document
         .getElementById("studentAttendanceTable")
         .querySelector("tbody");
@@ -351,6 +449,9 @@ function renderSession(session) {
     <strong>${session.course_code}</strong> - ${session.course_title}<br>
     Session Code: <b id="code-${session.id}">${session.session_code}</b>
     <span class="float-end">${session.date}</span>
+    <span class="badge bg-primary ms-2" id="count-${session.id}">${
+      (liveCounts[session.id] || { marked: 0 }).marked
+    } marked</span>
 
     <button
       class="btn btn-outline-secondary btn-sm ms-2"
@@ -17,28 +17,62 @@ function getHeaders() {
   };
 }
 
+// Current listing: role, search text, loaded rows and the cursor of the next page
+let listing = { role: "student", q: "", users: [], nextCursor: null };
+let searchTimer = null;
+
 // =====================
-// LOAD STUDENTS
+// LOAD USERS (one page)
 // =====================
-async function loadStudents() {
-  const res = await fetch(`${API_BASE}/admin/students`, {
+async function loadUsers(append = false) {
+  const params = new URLSearchParams();
+  // The API only searches on 2+ characters
+  if (listing.q.length >= 2) params.set("q", listing.q);
+  if (append && listing.nextCursor) params.set("cursor", listing.nextCursor);
+
+  const res = await fetch(`${API_BASE}/admin/${listing.role}s?${params}`, {
     headers: getHeaders(),
   });
 
   const data = await res.json();
-  renderTable(data, "student");
+  listing.users = append ? listing.users.concat(data.items) : data.items;
+  listing.nextCursor = data.next_cursor;
+
+  renderTable(listing.users, listing.role);
+  document
+    .getElementById("loadMoreBtn")
+    .classList.toggle("d-none", !listing.nextCursor);
+}
+
+function loadMore() {
+  loadUsers(true);
+}
+
+// =====================
+// LOAD STUDENTS
+// =====================
+function loadStudents() {
+  listing.role = "student";
+  loadUsers();
 }
 
 // =====================
 // LOAD LECTURERS
 // =====================
-async function loadLecturers() {
-  const res = await fetch(`${API_BASE}/admin/lecturers`, {
-    headers: getHeaders(),
-  });
+function loadLecturers() {
+  listing.role = "lecturer";
+  loadUsers();
+}
 
-  const data = await res.json();
-  renderTable(data, "lecturer");
+// =====================
+// SEARCH (debounced)
+// =====================
+function searchUsers(value) {
+  clearTimeout(searchTimer);
+  searchTimer = setTimeout(() => {
+    listing.q = value.trim();
+    loadUsers();
+  }, 300);
 }
 
 // =====================
@@ -61,8 +95,8 @@ function renderTable(data, role) {
       }</td>         <td>
           ${
             u.is_active
-              ? `<button class="btn btn-sm btn-danger" onclick="deactivate('${role}', ${u.id})">Deactivate</button>`
-              : `<button class="btn btn-sm btn-success" onclick="reactivate('${role}', ${u.id})">Reactivate</button>`
+              ? `<button class="btn btn-sm btn-danger" onclick="deactivate('${role}', '${u.id}')">Deactivate</button>`
+              : `<button class="btn btn-sm btn-success" onclick="reactivate('${role}', '${u.id}')">Reactivate</button>`
           }         </td>       </tr>
     `
     )
@@ -83,7 +117,7 @@ async function deactivate(role, id) {
     headers: getHeaders(),
   });
 
-  role === "student" ? loadStudents() : loadLecturers();
+  loadUsers();
 }
 
 async function reactivate(role, id) {
@@ -92,7 +126,7 @@ async function reactivate(role, id) {
     headers: getHeaders(),
   });
 
-  role === "student" ? loadStudents() : loadLecturers();
+  loadUsers();
 }
 
 // =====================
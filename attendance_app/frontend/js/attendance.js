@@ -67,7 +67,8 @@ document.addEventListener("DOMContentLoaded", () => {
         throw new Error(err.detail || "Failed to fetch attendance");
       }
 
-      return await res.json();
+      const page = await res.json();
+      return page.items;
     } catch (err) {
       showAlert(err.message, "danger");
       return [];
@@ -116,13 +116,14 @@ document.getElementById("imageInput").addEventListener("change", async (e) => {
   });
 
   if (!res.ok) {
-    alert("Image upload failed");
+    const err = await res.json().catch(() => ({}));
+    alert(err.detail || "Image upload failed");
     return;
   }
 
-  const data = await res.json();
+  // The upload finishes in the background; show the local file until then
   const profileImage = document.getElementById("profileImage");
-  profileImage.src = data.profile_image;
+  profileImage.src = URL.createObjectURL(file);
 });
 
 // ==============================